@@ -0,0 +1,17 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+cd "$ROOT_DIR"
+
+BASELINE="${BENCH_BASELINE:-simulation/bench_baseline.json}"
+THRESHOLD="${BENCH_THRESHOLD:-0.25}"
+
+if [[ "${1:-}" == "--record" ]]; then
+  python3 -m simulation.benchmarks --record "$BASELINE"
+elif [[ ! -f "$BASELINE" ]]; then
+  echo "no benchmark baseline at $BASELINE; record one with: $0 --record" >&2
+  exit 1
+else
+  python3 -m simulation.benchmarks --check "$BASELINE" --threshold "$THRESHOLD"
+fi
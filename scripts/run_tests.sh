@@ -4,5 +4,13 @@ set -euo pipefail
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 cd "$ROOT_DIR"
 
-python3 -m unittest -v simulation.test_thermal_reference simulation.test_basic_mechanics
+# simulation/ is a namespace package, so unittest discovery cannot start there;
+# derive the module names from the test files instead.
+TEST_MODULES=()
+for test_file in simulation/test_*.py; do
+  test_module="${test_file%.py}"
+  TEST_MODULES+=("${test_module//\//.}")
+done
+
+python3 -m unittest -v "${TEST_MODULES[@]}"
 ./scripts/build_apk.sh --dry-run
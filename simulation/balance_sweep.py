@@ -0,0 +1,250 @@
+"""Process-pool balance sweeps over the frozen tuning dataclasses.
+
+A sweep point is a flat mapping of `"<Dataclass>.<field>"` overrides, for
+example `{"ThermalParams.heat_per_shot": 22.0, "CoreRules.base_enemy_hp": 90.0}`.
+Points come from a full grid, uniform random samples or a Latin hypercube;
+`run_sweep` fans them out to worker processes in chunks and appends one JSON
+line per finished point, so long sweeps can be tailed while they run.
+
+Every trial seed is derived from `(base_seed, point index, repeat)`, never from
+scheduling order, so results do not depend on worker count or chunk size.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, fields, replace
+from itertools import product
+from pathlib import Path
+from typing import Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules, TowerStats, tower_hit_damage
+from simulation.enemy_pool import EnemyPool
+from simulation.protein_tower import ProteinTowerConfig
+from simulation.targeting import PathCoverage, PathGeometry, TargetingFrame, select_targets
+from simulation.thermal_reference import ThermalParams, TowerThermalState
+
+
+SWEEPABLE = {cls.__name__: cls for cls in (CoreRules, ThermalParams, ProteinTowerConfig)}
+
+SweepPoint = Mapping[str, float]
+
+
+@dataclass(frozen=True)
+class SweepConfigs:
+    """Concrete configs for one sweep point."""
+
+    rules: CoreRules = CoreRules()
+    thermal: ThermalParams = ThermalParams()
+    protein: ProteinTowerConfig = ProteinTowerConfig()
+
+
+def _split_key(key: str) -> tuple[type, str]:
+    owner, _, name = key.partition(".")
+    cls = SWEEPABLE.get(owner)
+    if cls is None or name not in {f.name for f in fields(cls)}:
+        raise ValueError(f"unknown sweep parameter {key!r}; use '<{'|'.join(SWEEPABLE)}>.<field>'")
+    return cls, name
+
+
+def configs_for(point: SweepPoint) -> SweepConfigs:
+    """Apply a point's overrides to the default configs.
+
+    Values for integer fields (such as `CoreRules.max_towers`) are rounded.
+    """
+
+    overrides: dict[type, dict[str, float]] = {cls: {} for cls in SWEEPABLE.values()}
+    for key, value in point.items():
+        cls, name = _split_key(key)
+        default = getattr(cls(), name)
+        overrides[cls][name] = int(round(value)) if isinstance(default, int) else float(value)
+    return SweepConfigs(
+        rules=replace(CoreRules(), **overrides[CoreRules]),
+        thermal=replace(ThermalParams(), **overrides[ThermalParams]),
+        protein=replace(ProteinTowerConfig(), **overrides[ProteinTowerConfig]),
+    )
+
+
+def grid_points(grid: Mapping[str, Sequence[float]]) -> list[dict[str, float]]:
+    """Cartesian product of per-parameter value lists."""
+
+    for key in grid:
+        _split_key(key)
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in product(*(grid[k] for k in keys))]
+
+
+def random_points(bounds: Mapping[str, tuple[float, float]], count: int, seed: int = 0) -> list[dict[str, float]]:
+    """Uniform samples inside per-parameter `(low, high)` bounds."""
+
+    for key in bounds:
+        _split_key(key)
+    rng = np.random.default_rng(seed)
+    return [{key: float(rng.uniform(low, high)) for key, (low, high) in bounds.items()} for _ in range(count)]
+
+
+def latin_hypercube_points(
+    bounds: Mapping[str, tuple[float, float]], count: int, seed: int = 0
+) -> list[dict[str, float]]:
+    """Latin hypercube samples: each parameter hits every 1/count stratum once."""
+
+    for key in bounds:
+        _split_key(key)
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for key, (low, high) in bounds.items():
+        strata = (rng.permutation(count) + rng.random(count)) / count
+        columns[key] = low + strata * (high - low)
+    return [{key: float(columns[key][i]) for key in bounds} for i in range(count)]
+
+
+def trial_seed(base_seed: int, point_index: int, repeat: int) -> int:
+    """Deterministic 63-bit seed for one trial, independent of scheduling."""
+
+    sequence = np.random.SeedSequence(base_seed, spawn_key=(point_index, repeat))
+    return int(sequence.generate_state(1, dtype=np.uint64)[0] >> np.uint64(1))
+
+
+def lane_trial(
+    configs: SweepConfigs,
+    seed: int,
+    *,
+    waves: int = 3,
+    enemies_per_wave: int = 40,
+    dt: float = 0.05,
+    path_length_px: float = 1400.0,
+    max_ticks_per_wave: int = 2400,
+) -> dict[str, float | None]:
+    """Single-lane level: towers at random path offsets shoot the lead enemy.
+
+    Returns `time_to_overheat_s` (None if no tower overheated),
+    `kill_rate`, `leak_count` and `reward`. The lane has no Protein towers, so
+    a point that overrides `ProteinTowerConfig` is rejected rather than ignored;
+    custom trials receive `configs.protein` as usual.
+    """
+
+    if configs.protein != ProteinTowerConfig():
+        raise ValueError("lane_trial has no Protein towers; ProteinTowerConfig overrides need a custom trial")
+    rng = random.Random(seed)
+    rules, thermal = configs.rules, configs.thermal
+    stats = TowerStats()
+    towers = [rng.uniform(0.1, 0.9) * path_length_px for _ in range(max(0, rules.max_towers))]
+    heat = [TowerThermalState() for _ in towers]
+    # Towers sit on a straight lane, so each covers [offset - range, offset + range]
+    # clipped to the path; negative (not yet entered) progress is never covered.
+    lane = PathGeometry.from_points([(0.0, 0.0), (path_length_px, 0.0)])
+    coverage = PathCoverage.build(lane, [(offset, 0.0) for offset in towers], stats.range_px)
+    pool = EnemyPool(capacity=enemies_per_wave)
+
+    spawned = kills = leaks = reward = 0
+    first_overheat: float | None = None
+    elapsed = 0.0
+    for wave in range(1, waves + 1):
+        slots = pool.spawn(enemies_per_wave, wave, rules)
+        # Negative progress staggers entry; enemies are untargetable until they reach the path.
+        pool.progress[slots] = [-rng.uniform(0.0, 6.0) * pool.speed[slot] for slot in slots]
+        spawned += enemies_per_wave
+        for _ in range(max_ticks_per_wave):
+            if len(pool) == 0:
+                break
+            pool.advance(dt)
+            targets = select_targets(coverage, TargetingFrame.from_pool(pool), mode="first")
+            firing = np.flatnonzero(targets >= 0)
+            if firing.size:
+                damage = [tower_hit_damage(stats, dt, heat[i].overheated) for i in firing.tolist()]
+                pool.apply_damage_at(targets[firing], np.array(damage))
+            for state, target in zip(heat, targets.tolist()):
+                state.step(dt=dt, fired=target >= 0, params=thermal)
+                if state.overheated and first_overheat is None:
+                    first_overheat = elapsed + dt
+            elapsed += dt
+            swept = pool.collect_defeated(wave, rules)
+            kills += swept.count
+            reward += swept.reward
+            leaks += pool.collect_leaked(path_length_px).count
+        # Enemies still alive when the wave times out count as leaks.
+        leaks += pool.collect_leaked(-np.inf).count
+
+    return {
+        "time_to_overheat_s": first_overheat,
+        "kill_rate": kills / max(1, spawned),
+        "leak_count": float(leaks),
+        "reward": float(reward),
+    }
+
+
+Trial = Callable[[SweepConfigs, int], Mapping[str, float | None]]
+
+
+def aggregate_metrics(runs: Sequence[Mapping[str, float | None]]) -> dict[str, float | None]:
+    """Mean of each metric over repeats, ignoring None; adds `<name>_hits` counts."""
+
+    out: dict[str, float | None] = {}
+    for key in runs[0] if runs else ():
+        values = [run[key] for run in runs if run[key] is not None]
+        out[key] = sum(values) / len(values) if values else None
+        if len(values) != len(runs):
+            out[f"{key}_hits"] = float(len(values))
+    return out
+
+
+def _run_chunk(
+    chunk: Sequence[tuple[int, dict[str, float]]], trial: Trial, repeats: int, base_seed: int
+) -> list[dict[str, object]]:
+    records = []
+    for index, point in chunk:
+        configs = configs_for(point)
+        seeds = [trial_seed(base_seed, index, r) for r in range(repeats)]
+        runs = [trial(configs, seed) for seed in seeds]
+        records.append({"index": index, "params": dict(point), "seeds": seeds, "metrics": aggregate_metrics(runs)})
+    return records
+
+
+def run_sweep(
+    points: Iterable[SweepPoint],
+    output_path: str | Path,
+    *,
+    trial: Trial = lane_trial,
+    repeats: int = 4,
+    base_seed: int = 0,
+    max_workers: int | None = None,
+    chunk_size: int = 8,
+) -> int:
+    """Run every point and stream one JSON line per point to `output_path`.
+
+    Lines arrive in completion order; sort by `index` to recover point order.
+    `trial` must be a module-level function so worker processes can import
+    it. `max_workers=1` runs inline without a process pool. Returns the
+    number of records written.
+    """
+
+    if chunk_size <= 0 or repeats <= 0:
+        raise ValueError("chunk_size and repeats must be positive")
+    indexed = list(enumerate(dict(p) for p in points))
+    chunks = [indexed[i : i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+    written = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+
+        def emit(records: list[dict[str, object]]) -> None:
+            nonlocal written
+            for record in records:
+                out.write(json.dumps(record, sort_keys=True) + "\n")
+                written += 1
+            out.flush()
+
+        if max_workers == 1:
+            for chunk in chunks:
+                emit(_run_chunk(chunk, trial, repeats, base_seed))
+            return written
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(_run_chunk, chunk, trial, repeats, base_seed) for chunk in chunks}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+    return written
@@ -0,0 +1,302 @@
+"""Scaling benchmarks and regression gates for simulation hot paths.
+
+Each case times one hot function across growing sizes (ticks, towers or
+grid side), reports throughput in items per second, and fits a scaling
+exponent as the log-log slope of time against size (1.0 is linear, 2.0 is
+quadratic). Results can be recorded as a JSON baseline and later runs
+compared against it:
+
+    python -m simulation.benchmarks --record simulation/bench_baseline.json
+    python -m simulation.benchmarks --check simulation/bench_baseline.json --threshold 0.25
+
+`--check` exits non-zero when any size loses more than `threshold` of its
+baseline throughput, the exponent grows by more than `--exponent-slack`, or a
+case or size has no baseline entry at all; a new case is not gated until the
+baseline is re-recorded. Baselines are machine specific; record them on the
+machine that checks them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import asdict, dataclass
+from math import log
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Sequence
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules
+from simulation.checkpoint import SimulationState
+from simulation.enemy_pool import EnemyPool
+from simulation.protein_batch import ProteinFleetState
+from simulation.protein_tower import (
+    LocalFlowState,
+    ProteinTowerState,
+    TowerPlacement,
+    detect_protein_patterns,
+    step_protein_tower,
+    synthesize_protein_cluster,
+)
+from simulation.session_host import LaneBatch, LaneConfig
+from simulation.thermal_reference import simulate_heat_curve
+from simulation.wave_events import simulate_event_study, spawn_progress
+
+
+Setup = Callable[[int], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """A hot function parameterized by one size axis."""
+
+    name: str
+    axis: str
+    sizes: tuple[int, ...]
+    setup: Setup
+
+
+@dataclass(frozen=True)
+class BenchPoint:
+    size: int
+    seconds: float
+    throughput: float
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    axis: str
+    points: tuple[BenchPoint, ...]
+    exponent: float
+
+
+def _heat_curve(ticks: int) -> Callable[[], object]:
+    rng = random.Random(ticks)
+    timeline = [rng.random() < 0.4 for _ in range(ticks)]
+    return lambda: simulate_heat_curve(timeline, dt=0.05)
+
+
+def _protein_step(towers: int) -> Callable[[], object]:
+    rng = random.Random(towers)
+    flows = [
+        LocalFlowState(
+            creep_density=[[rng.random() for _ in range(8)] for _ in range(8)],
+            flow_speed=[[rng.random() for _ in range(8)] for _ in range(8)],
+            wall_block=[[0.0] * 8 for _ in range(8)],
+        )
+        for _ in range(towers)
+    ]
+    state = ProteinTowerState()
+    return lambda: [step_protein_tower(state, flow, 3, 0.2) for flow in flows]
+
+
+def _random_layout(towers: int) -> list[TowerPlacement]:
+    rng = random.Random(towers)
+    span = max(4, int((towers * 4) ** 0.5))
+    tiles = rng.sample([(x, y) for x in range(span) for y in range(span)], min(towers, span * span))
+    return [TowerPlacement(x, y) for x, y in tiles]
+
+
+def _cluster(towers: int) -> Callable[[], object]:
+    placements = _random_layout(towers)
+    states = [ProteinTowerState(theta=0.1 * (i % 7)) for i in range(len(placements))]
+    return lambda: synthesize_protein_cluster(states, placements)
+
+
+def _patterns(towers: int) -> Callable[[], object]:
+    placements = _random_layout(towers)
+    return lambda: detect_protein_patterns(placements)
+
+
+def _protein_grid(side: int) -> Callable[[], object]:
+    rng = random.Random(side)
+    grid = [[rng.random() for _ in range(side)] for _ in range(side)]
+    flow = LocalFlowState(creep_density=grid, flow_speed=grid, wall_block=grid)
+    state = ProteinTowerState()
+    return lambda: step_protein_tower(state, flow, 3, 0.2)
+
+
+def _lane_batch(sessions: int) -> Callable[[], object]:
+    # Enough waves that no session finishes while it is being timed.
+    batch = LaneBatch(LaneConfig(waves=1_000_000), capacity=sessions)
+    for row in range(sessions):
+        batch.reset(row, (300.0, 700.0))
+    return lambda: batch.step(0, sessions, 0.05)
+
+
+def _checkpoint_write(towers: int) -> Callable[[], object]:
+    pool = EnemyPool(capacity=towers)
+    pool.spawn(towers, wave_index=4, rules=CoreRules())
+    state = SimulationState(
+        tick=0,
+        thermal_heat=np.zeros(towers),
+        thermal_overheated=np.zeros(towers, dtype=bool),
+        protein=ProteinFleetState.from_states([ProteinTowerState(theta=0.4)] * towers),
+        tokens=[],
+        enemies=pool,
+        rng=np.random.default_rng(towers),
+    )
+    return state.to_bytes
+
+
+def _event_study(runs: int) -> Callable[[], object]:
+    progress = spawn_progress(1200, 0.05, creep_count=120)
+    return lambda: simulate_event_study(runs, progress, 0.05, fire_probability=0.5, seed=1)
+
+
+DEFAULT_CASES: tuple[BenchCase, ...] = (
+    BenchCase("simulate_heat_curve", "ticks", (2_000, 8_000, 32_000), _heat_curve),
+    BenchCase("step_protein_tower", "towers", (50, 200, 800), _protein_step),
+    BenchCase("step_protein_tower_grid", "grid_side", (8, 32, 128), _protein_grid),
+    BenchCase("synthesize_protein_cluster", "towers", (50, 100, 200), _cluster),
+    BenchCase("detect_protein_patterns", "towers", (200, 800, 3_200), _patterns),
+    BenchCase("lane_batch_step", "sessions", (1, 16, 256), _lane_batch),
+    BenchCase("checkpoint_write", "towers", (200, 2_000, 20_000), _checkpoint_write),
+    BenchCase("simulate_event_study", "runs", (250, 1_000, 4_000), _event_study),
+)
+
+
+def time_call(fn: Callable[[], object], repeats: int = 5, min_seconds: float = 0.02) -> float:
+    """Best per-call time over `repeats` batches of at least `min_seconds`."""
+
+    calls = 1
+    while True:
+        start = perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = perf_counter() - start
+        if elapsed >= min_seconds or calls >= 1 << 20:
+            break
+        calls *= 2
+    best = elapsed / calls
+    for _ in range(repeats - 1):
+        start = perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (perf_counter() - start) / calls)
+    return best
+
+
+def scaling_exponent(sizes: Sequence[float], seconds: Sequence[float]) -> float:
+    """Least-squares slope of log(seconds) against log(size)."""
+
+    xs = [log(s) for s in sizes]
+    ys = [log(max(t, 1e-12)) for t in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0.0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def run_case(case: BenchCase, repeats: int = 5) -> BenchResult:
+    points = []
+    for size in case.sizes:
+        seconds = time_call(case.setup(size), repeats=repeats)
+        points.append(BenchPoint(size=size, seconds=seconds, throughput=size / seconds))
+    return BenchResult(
+        name=case.name,
+        axis=case.axis,
+        points=tuple(points),
+        exponent=scaling_exponent([p.size for p in points], [p.seconds for p in points]),
+    )
+
+
+def run_suite(cases: Sequence[BenchCase] = DEFAULT_CASES, repeats: int = 5) -> list[BenchResult]:
+    return [run_case(case, repeats) for case in cases]
+
+
+def results_to_json(results: Sequence[BenchResult]) -> dict[str, object]:
+    return {"version": 1, "cases": {r.name: asdict(r) for r in results}}
+
+
+def compare_to_baseline(
+    results: Sequence[BenchResult],
+    baseline: dict[str, object],
+    threshold: float = 0.25,
+    exponent_slack: float = 0.3,
+) -> list[str]:
+    """Regression messages; an empty list means the run passes the gate.
+
+    A case or size missing from the baseline is a failure too, so a new
+    benchmark cannot pass the gate unmeasured; re-record the baseline to
+    admit it.
+    """
+
+    failures = []
+    cases = baseline.get("cases", {})
+    for result in results:
+        recorded = cases.get(result.name)
+        if recorded is None:
+            failures.append(f"{result.name}: not in the baseline; re-record it with --record")
+            continue
+        by_size = {p["size"]: p for p in recorded["points"]}
+        for point in result.points:
+            before = by_size.get(point.size)
+            if before is None:
+                failures.append(
+                    f"{result.name}[{result.axis}={point.size}]: not in the baseline; re-record it with --record"
+                )
+                continue
+            floor = before["throughput"] * (1.0 - threshold)
+            if point.throughput < floor:
+                failures.append(
+                    f"{result.name}[{result.axis}={point.size}]: {point.throughput:,.0f}/s "
+                    f"< {floor:,.0f}/s ({before['throughput']:,.0f}/s baseline, -{threshold:.0%} allowed)"
+                )
+        if result.exponent > recorded["exponent"] + exponent_slack:
+            failures.append(
+                f"{result.name}: scaling exponent {result.exponent:.2f} > baseline {recorded['exponent']:.2f} "
+                f"+ {exponent_slack:.2f}"
+            )
+    return failures
+
+
+def format_results(results: Sequence[BenchResult]) -> str:
+    lines = []
+    for result in results:
+        lines.append(f"{result.name} (exponent {result.exponent:.2f} over {result.axis})")
+        for p in result.points:
+            lines.append(f"  {result.axis}={p.size:>7}  {p.seconds * 1e3:>10.3f} ms  {p.throughput:>14,.0f}/s")
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--record", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--check", type=Path, help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed throughput loss (fraction)")
+    parser.add_argument("--exponent-slack", type=float, default=0.3, help="allowed scaling exponent increase")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="case names to run")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in DEFAULT_CASES if not args.only or c.name in args.only]
+    results = run_suite(cases, repeats=args.repeats)
+    print(format_results(results))
+
+    if args.record:
+        args.record.write_text(json.dumps(results_to_json(results), indent=2) + "\n", encoding="utf-8")
+        print(f"\nbaseline written to {args.record}")
+    if args.check:
+        failures = compare_to_baseline(
+            results,
+            json.loads(args.check.read_text(encoding="utf-8")),
+            threshold=args.threshold,
+            exponent_slack=args.exponent_slack,
+        )
+        if failures:
+            print("\nREGRESSIONS:\n" + "\n".join(f"  {line}" for line in failures))
+            return 1
+        print(f"\nno regressions against {args.check}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Binary checkpoints and deterministic replay for batched simulation state.
+
+Container layout (little-endian, every section 8-byte aligned):
+
+    header     magic "XDXCKPT1", u32 version, u32 section count,
+               u64 meta offset, u64 meta length
+    directory  per section: 24-byte name, 8-byte NumPy dtype string,
+               u64 offset, u64 element count
+    meta       UTF-8 JSON (tick, RNG state, caller metadata)
+    sections   raw 1-D array bytes
+
+Only the header and directory are parsed on open. `CheckpointView` maps the
+file with `np.memmap` and hands out zero-copy read-only section views, so a
+single field can be read from a large checkpoint without loading the rest.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Mapping
+
+import numpy as np
+
+from simulation.enemy_pool import EnemyPool
+from simulation.protein_batch import ProteinFleetState
+from simulation.protein_tower import TokenTowerState
+
+
+MAGIC = b"XDXCKPT1"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+_ENTRY = struct.Struct("<24s8sQQ")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def encode_checkpoint(sections: Mapping[str, np.ndarray], meta: Mapping[str, object]) -> bytes:
+    """Serialize named 1-D arrays plus JSON metadata into one buffer."""
+
+    meta_bytes = json.dumps(meta, sort_keys=True).encode("utf-8")
+    arrays = []
+    for name, values in sections.items():
+        array = np.ascontiguousarray(values)
+        if array.ndim != 1:
+            raise ValueError(f"section {name!r} must be 1-D, got shape {array.shape}")
+        if array.dtype.fields is not None:
+            raise ValueError(f"section {name!r} must use a plain dtype; split structured arrays into columns")
+        if len(name.encode("utf-8")) > 24:
+            raise ValueError(f"section name {name!r} is longer than 24 bytes")
+        arrays.append((name, array.astype(array.dtype.newbyteorder("<"), copy=False)))
+
+    meta_offset = _HEADER.size + _ENTRY.size * len(arrays)
+    offset = _align(meta_offset + len(meta_bytes))
+    directory = []
+    chunks = []
+    for name, array in arrays:
+        directory.append(_ENTRY.pack(name.encode("utf-8"), array.dtype.str.encode("ascii"), offset, array.size))
+        chunks.append((offset, array))
+        offset = _align(offset + array.nbytes)
+
+    out = bytearray(offset)
+    out[: _HEADER.size] = _HEADER.pack(MAGIC, VERSION, len(arrays), meta_offset, len(meta_bytes))
+    out[_HEADER.size : meta_offset] = b"".join(directory)
+    out[meta_offset : meta_offset + len(meta_bytes)] = meta_bytes
+    for start, array in chunks:
+        out[start : start + array.nbytes] = array.view(np.uint8).data
+    return bytes(out)
+
+
+def write_checkpoint(path: str | Path, sections: Mapping[str, np.ndarray], meta: Mapping[str, object]) -> None:
+    Path(path).write_bytes(encode_checkpoint(sections, meta))
+
+
+class CheckpointView:
+    """Lazily parsed checkpoint backed by a buffer or a memory-mapped file."""
+
+    def __init__(self, buffer: np.ndarray | bytes) -> None:
+        self._buffer = np.frombuffer(buffer, dtype=np.uint8) if isinstance(buffer, (bytes, bytearray)) else buffer
+        magic, version, count, meta_offset, meta_length = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} XODEX checkpoint")
+        self._meta_span = (meta_offset, meta_length)
+        self._directory: dict[str, tuple[np.dtype, int, int]] = {}
+        for index in range(count):
+            raw_name, raw_dtype, offset, size = _ENTRY.unpack_from(self._buffer, _HEADER.size + index * _ENTRY.size)
+            name = raw_name.rstrip(b"\0").decode("utf-8")
+            self._directory[name] = (np.dtype(raw_dtype.rstrip(b"\0").decode("ascii")), offset, size)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "CheckpointView":
+        return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    @property
+    def meta(self) -> dict[str, object]:
+        offset, length = self._meta_span
+        return json.loads(bytes(self._buffer[offset : offset + length]).decode("utf-8"))
+
+    def names(self) -> list[str]:
+        return list(self._directory)
+
+    def section(self, name: str) -> np.ndarray:
+        """Zero-copy read-only view of one section."""
+
+        dtype, offset, size = self._directory[name]
+        view = self._buffer[offset : offset + size * dtype.itemsize].view(dtype)
+        view.flags.writeable = False
+        return view
+
+
+FIRE, PLACE, SELL = 1, 2, 3
+INPUT_EVENT = np.dtype([("tick", "<u8"), ("kind", "<u1"), ("a", "<i4"), ("b", "<i4")])
+
+
+class InputLog:
+    """Append-only tick-ordered log of fire and placement inputs.
+
+    `FIRE` stores the tower index in `a`; `PLACE` and `SELL` store the tile
+    in `(a, b)`.
+    """
+
+    def __init__(self, events: np.ndarray | None = None) -> None:
+        self._events = np.zeros(64, dtype=INPUT_EVENT) if events is None else np.array(events, dtype=INPUT_EVENT)
+        self._count = 0 if events is None else len(events)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def events(self) -> np.ndarray:
+        return self._events[: self._count]
+
+    def append(self, tick: int, kind: int, a: int, b: int = 0) -> None:
+        if self._count and tick < self._events[self._count - 1]["tick"]:
+            raise ValueError(f"input log ticks must not go backwards (tick {tick})")
+        if self._count == len(self._events):
+            self._events = np.resize(self._events, max(64, 2 * len(self._events)))
+        self._events[self._count] = (tick, kind, a, b)
+        self._count += 1
+
+    def between(self, start_tick: int, stop_tick: int) -> np.ndarray:
+        """Events with `start_tick <= tick < stop_tick`."""
+
+        ticks = self.events["tick"]
+        lo = np.searchsorted(ticks, start_tick, side="left")
+        hi = np.searchsorted(ticks, stop_tick, side="left")
+        return self.events[lo:hi]
+
+
+@dataclass
+class SimulationState:
+    """Checkpointable batched state for one run."""
+
+    tick: int
+    thermal_heat: np.ndarray
+    thermal_overheated: np.ndarray
+    protein: ProteinFleetState
+    tokens: list[TokenTowerState]
+    enemies: EnemyPool
+    rng: np.random.Generator
+    meta: dict[str, object] = field(default_factory=dict)
+
+    def sections(self) -> dict[str, np.ndarray]:
+        sections = {
+            "thermal.heat": self.thermal_heat,
+            "thermal.overheated": self.thermal_overheated,
+            "protein.theta": self.protein.theta,
+            "protein.heat": self.protein.heat,
+            "protein.collapsed": self.protein.collapsed,
+            "token.bias": np.array([t.path_probability_bias for t in self.tokens], dtype=np.float64),
+            "token.depth": np.array([t.prediction_depth for t in self.tokens], dtype=np.int32),
+        }
+        sections.update({f"enemy.{name}": values for name, values in self.enemies.state_arrays().items()})
+        return sections
+
+    def to_bytes(self, log: InputLog | None = None) -> bytes:
+        sections = self.sections()
+        if log is not None:
+            sections.update({f"input.{column}": log.events[column] for column in INPUT_EVENT.names})
+        meta = {"tick": self.tick, "rng": self.rng.bit_generator.state, "meta": self.meta}
+        return encode_checkpoint(sections, meta)
+
+    @classmethod
+    def from_view(cls, view: CheckpointView) -> "SimulationState":
+        meta = view.meta
+        rng_state = meta["rng"]
+        bit_generator = getattr(np.random, rng_state["bit_generator"])()
+        bit_generator.state = rng_state
+        return cls(
+            tick=int(meta["tick"]),
+            thermal_heat=np.array(view.section("thermal.heat")),
+            thermal_overheated=np.array(view.section("thermal.overheated")),
+            protein=ProteinFleetState(
+                theta=np.array(view.section("protein.theta")),
+                heat=np.array(view.section("protein.heat")),
+                collapsed=np.array(view.section("protein.collapsed")),
+            ),
+            tokens=[
+                TokenTowerState(path_probability_bias=bias, prediction_depth=depth)
+                for bias, depth in zip(view.section("token.bias").tolist(), view.section("token.depth").tolist())
+            ],
+            enemies=EnemyPool.from_state_arrays(
+                {name: view.section(f"enemy.{name}") for name in ("hp", "progress", "speed", "alive", "free")}
+            ),
+            rng=np.random.Generator(bit_generator),
+            meta=dict(meta["meta"]),
+        )
+
+
+def load_input_log(view: CheckpointView) -> InputLog:
+    if "input.tick" not in view.names():
+        return InputLog()
+    events = np.zeros(len(view.section("input.tick")), dtype=INPUT_EVENT)
+    for column in INPUT_EVENT.names:
+        events[column] = view.section(f"input.{column}")
+    return InputLog(events)
+
+
+StepFunction = Callable[[SimulationState, np.ndarray], None]
+
+
+def replay(state: SimulationState, log: InputLog, step: StepFunction, until_tick: int) -> SimulationState:
+    """Advance `state` in place to `until_tick`, feeding each tick its logged inputs.
+
+    `step` must be deterministic given the state (including its RNG) and
+    the tick's events; it advances exactly one tick and must not touch
+    `state.tick`.
+    """
+
+    if until_tick < state.tick:
+        raise ValueError(f"cannot replay backwards from tick {state.tick} to {until_tick}")
+    events = log.between(state.tick, until_tick)
+    ticks = events["tick"]
+    cursor = 0
+    while state.tick < until_tick:
+        end = cursor + int(np.searchsorted(ticks[cursor:], state.tick, side="right"))
+        step(state, events[cursor:end])
+        cursor = end
+        state.tick += 1
+    return state
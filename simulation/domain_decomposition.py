@@ -0,0 +1,470 @@
+"""Multi-process Protein map ticks by spatial domain decomposition.
+
+A map tick steps every Protein tower against its local window of the creep
+density, flow speed and wall rasters, then couples the stepped thetas with
+the `synthesize_protein_cluster` rule. Both reads are spatially local:
+
+- a window reaches `local_sample_size // 2` rows from its tower;
+- coupling reaches `coupling_range_tiles`.
+
+`ParallelProteinMap` therefore splits the map into horizontal bands with
+about the same number of towers each, one band per worker process. Rasters
+and tower state live in shared memory. A tick runs in two phases separated
+by a barrier:
+
+1. Each worker steps the towers it owns. It reads only its own band of the
+   rasters plus the halo rows that its towers' windows reach into.
+2. Each worker gathers the stepped thetas of its own towers plus the halo
+   towers, which are other bands' towers within coupling range of one of its
+   own. It couples its own towers and writes back only their rows.
+
+Phase 1 writes a scratch buffer and phase 2 writes the state, so no worker
+reads a row another worker is writing.
+
+`step_protein_map` is the serial path, and both paths call the same kernels.
+Every tower's arithmetic is one fixed sequence of elementwise operations,
+independent of which towers share its batch. The parallel results are
+therefore bit-identical to the serial ones for any worker count.
+
+Window means are summed directly over each tower's window, in row-major
+order, not read from the prefix sums of `protein_field.ProteinFieldFrame`. A
+prefix sum carries rounding across the whole map, so it cannot be split into
+bands bit-exactly. Map ticks are therefore not bit-exact with
+`step_protein_fleet_on_map`. The means differ in the last bits, and over
+many ticks such a difference can flip a threshold such as collapse. The
+center Laplacians are identical. `step_protein_map` is the reference for
+this module, and the parallel path is tested bit for bit against it, not
+against the field engine.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Barrier
+from typing import Sequence
+
+import numpy as np
+
+from simulation.protein_batch import ProteinFleetState, step_protein_fleet_from_fields
+from simulation.protein_tower import ProteinNeighborIndex, ProteinTowerConfig, ProteinTowerState, TowerPlacement
+
+
+@dataclass(frozen=True)
+class MapLayout:
+    """Tower positions and padded coupling neighbor lists on a (rows, cols) map."""
+
+    map_shape: tuple[int, int]
+    xs: np.ndarray
+    ys: np.ndarray
+    # neighbors[i, :degree[i]] are tower i's neighbors in ascending order; the rest is -1.
+    neighbors: np.ndarray
+    degree: np.ndarray
+    coupling_range_tiles: float
+
+    @classmethod
+    def build(
+        cls, placements: Sequence[TowerPlacement], map_shape: tuple[int, int], coupling_range_tiles: float = 3.0
+    ) -> "MapLayout":
+        rows, cols = map_shape
+        for p in placements:
+            if not (0 <= p.x < cols and 0 <= p.y < rows):
+                raise ValueError(f"placement {p} lies outside the {rows}x{cols} map")
+        index = ProteinNeighborIndex.build(placements, coupling_range_tiles)
+        degree = np.array([len(n) for n in index.neighbors], dtype=np.int64)
+        neighbors = np.full((len(placements), int(degree.max(initial=0))), -1, dtype=np.int64)
+        for i, found in enumerate(index.neighbors):
+            neighbors[i, : len(found)] = found
+        return cls(
+            map_shape=(rows, cols),
+            xs=np.array([p.x for p in placements], dtype=np.int64),
+            ys=np.array([p.y for p in placements], dtype=np.int64),
+            neighbors=neighbors,
+            degree=degree,
+            coupling_range_tiles=coupling_range_tiles,
+        )
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+
+@dataclass(frozen=True)
+class MapTick:
+    state: ProteinFleetState
+    damage: np.ndarray
+
+
+def window_fields(
+    creep_density: np.ndarray,
+    flow_speed: np.ndarray,
+    wall_block: np.ndarray,
+    ys: np.ndarray,
+    xs: np.ndarray,
+    map_shape: tuple[int, int],
+    size: int,
+    row_offset: int = 0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Window means and center Laplacian for towers at `(ys, xs)`.
+
+    The rasters hold map rows `[row_offset, row_offset + len(raster))`, which
+    must cover every window. Cells are summed in window row-major order, with
+    clipped cells adding zero, so each tower's result does not depend on the
+    other towers passed in.
+    """
+
+    rows, cols = map_shape
+    top, left = ys - size // 2, xs - size // 2
+    row_start, row_stop = np.clip(top, 0, rows), np.clip(top + size, 0, rows)
+    col_start, col_stop = np.clip(left, 0, cols), np.clip(left + size, 0, cols)
+
+    sums = [np.zeros(len(ys), dtype=np.float64) for _ in range(3)]
+    for dy in range(size):
+        r = top + dy
+        row_ok = (r >= 0) & (r < rows)
+        local_rows = np.where(row_ok, r - row_offset, 0)
+        for dx in range(size):
+            c = left + dx
+            inside = row_ok & (c >= 0) & (c < cols)
+            local_cols = np.where(inside, c, 0)
+            for total, raster in zip(sums, (creep_density, flow_speed, wall_block)):
+                total += np.where(inside, raster[local_rows, local_cols], 0.0)
+    divisor = np.maximum(1, (row_stop - row_start) * (col_stop - col_start))
+
+    # Same centers and stencil order as `ProteinFieldFrame.center_laplacians`.
+    heights, widths = row_stop - row_start, col_stop - col_start
+    cy, cx = row_start + heights // 2, col_start + widths // 2
+    valid = (heights >= 3) & (widths >= 3) & (cy >= 1) & (cy <= rows - 2) & (cx >= 1) & (cx <= cols - 2)
+    laplacian = np.zeros(len(ys), dtype=np.float64)
+    at = np.flatnonzero(valid)
+    ly, lx, d = cy[at] - row_offset, cx[at], creep_density
+    laplacian[at] = d[ly - 1, lx] + d[ly + 1, lx] + d[ly, lx - 1] + d[ly, lx + 1] - 4.0 * d[ly, lx]
+    return sums[0] / divisor, sums[1] / divisor, sums[2] / divisor, laplacian
+
+
+def couple_thetas(
+    theta: np.ndarray,
+    heat: np.ndarray,
+    neighbor_theta: np.ndarray,
+    neighbors: np.ndarray,
+    degree: np.ndarray,
+    coupling_eta: float,
+    coupling_heat_gain: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """`synthesize_protein_cluster` arithmetic; `neighbors` index `neighbor_theta`."""
+
+    blended = theta.copy()
+    for k in range(neighbors.shape[1]):
+        has = degree > k
+        pulled = blended + coupling_eta * (neighbor_theta[np.where(has, neighbors[:, k], 0)] - theta)
+        np.copyto(blended, pulled, where=has)
+    return np.maximum(0.0, blended), heat + coupling_heat_gain * degree
+
+
+def step_protein_map(
+    state: ProteinFleetState,
+    creep_density: np.ndarray,
+    flow_speed: np.ndarray,
+    wall_block: np.ndarray,
+    layout: MapLayout,
+    wave_index: int,
+    realized_escape_energy: float,
+    config: ProteinTowerConfig = ProteinTowerConfig(),
+    coupling_eta: float = 0.08,
+    coupling_heat_gain: float = 0.15,
+) -> MapTick:
+    """Serial map tick: Protein step on local windows, then cluster coupling.
+
+    This is the reference that `ParallelProteinMap` reproduces bit for bit.
+    """
+
+    if len(state) != len(layout):
+        raise ValueError(f"expected {len(layout)} tower states, got {len(state)}")
+    if state.mode.dtype != np.float64:
+        raise ValueError("map ticks run in float64")
+    fields = window_fields(
+        creep_density, flow_speed, wall_block, layout.ys, layout.xs, layout.map_shape, config.local_sample_size
+    )
+    tick = step_protein_fleet_from_fields(state, *fields, wave_index, realized_escape_energy, config)
+    stepped = tick.state
+    theta, heat = couple_thetas(
+        stepped.theta, stepped.heat, stepped.theta, layout.neighbors, layout.degree, coupling_eta, coupling_heat_gain
+    )
+    return MapTick(state=ProteinFleetState(theta=theta, heat=heat, collapsed=stepped.collapsed), damage=tick.damage)
+
+
+@dataclass(frozen=True)
+class MapBand:
+    """One worker's share: owned towers, halo towers and the raster rows it reads."""
+
+    row_start: int
+    row_stop: int
+    owned: np.ndarray
+    halo: np.ndarray
+    raster_rows: tuple[int, int]
+
+
+def partition_bands(layout: MapLayout, workers: int, sample_size: int) -> list[MapBand]:
+    """Split the map into at most `workers` row bands of roughly equal tower count."""
+
+    if workers <= 0:
+        raise ValueError(f"workers must be positive, got {workers}")
+    rows, _ = layout.map_shape
+    order = np.argsort(layout.ys, kind="stable")
+    cuts = [0]
+    for k in range(1, workers):
+        if len(order) == 0:
+            break
+        cut = int(layout.ys[order[min(len(order) - 1, k * len(order) // workers)]])
+        if cut > cuts[-1]:
+            cuts.append(cut)
+    cuts.append(rows)
+
+    bands = []
+    for start, stop in zip(cuts, cuts[1:]):
+        owned = np.flatnonzero((layout.ys >= start) & (layout.ys < stop))
+        linked = layout.neighbors[owned][layout.neighbors[owned] >= 0]
+        halo = np.setdiff1d(linked, owned)
+        if len(owned):
+            top = layout.ys[owned] - sample_size // 2
+            raster_rows = (int(np.clip(top.min(), 0, rows)), int(np.clip(top.max() + sample_size, 0, rows)))
+        else:
+            raster_rows = (start, start)
+        bands.append(MapBand(row_start=start, row_stop=stop, owned=owned, halo=halo, raster_rows=raster_rows))
+    return bands
+
+
+_SHARED_FIELDS = {
+    "creep_density": ("map", np.float64),
+    "flow_speed": ("map", np.float64),
+    "wall_block": ("map", np.float64),
+    "theta": ("towers", np.float64),
+    "heat": ("towers", np.float64),
+    "collapsed": ("towers", np.bool_),
+    "damage": ("towers", np.float64),
+    "stepped_theta": ("towers", np.float64),
+    "stepped_heat": ("towers", np.float64),
+    "stepped_collapsed": ("towers", np.bool_),
+}
+
+
+def _shared_offsets(map_shape: tuple[int, int], towers: int) -> tuple[dict[str, tuple[int, tuple[int, ...]]], int]:
+    shapes = {"map": map_shape, "towers": (towers,)}
+    offsets, cursor = {}, 0
+    for name, (kind, dtype) in _SHARED_FIELDS.items():
+        shape = shapes[kind]
+        offsets[name] = (cursor, shape)
+        cursor += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 64) * 64
+    return offsets, max(cursor, 64)
+
+
+def _shared_views(shm: SharedMemory, offsets: dict[str, tuple[int, tuple[int, ...]]]) -> dict[str, np.ndarray]:
+    return {
+        name: np.ndarray(shape, dtype=_SHARED_FIELDS[name][1], buffer=shm.buf, offset=offset)
+        for name, (offset, shape) in offsets.items()
+    }
+
+
+def _band_worker(
+    shm: SharedMemory,
+    offsets: dict[str, tuple[int, tuple[int, ...]]],
+    layout: MapLayout,
+    band: MapBand,
+    config: ProteinTowerConfig,
+    coupling_eta: float,
+    coupling_heat_gain: float,
+    barrier: Barrier,
+    conn: Connection,
+) -> None:
+    views = _shared_views(shm, offsets)
+    owned = band.owned
+    r0, r1 = band.raster_rows
+    # Owned towers come first in the gathered halo buffer, then the halo towers.
+    gathered = np.concatenate([owned, band.halo])
+    local = np.full(len(layout), -1, dtype=np.int64)
+    local[gathered] = np.arange(len(gathered))
+    own_neighbors = layout.neighbors[owned]
+    local_neighbors = np.where(own_neighbors >= 0, local[np.maximum(own_neighbors, 0)], -1)
+    degree = layout.degree[owned]
+    ys, xs = layout.ys[owned], layout.xs[owned]
+    try:
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                break
+            _, wave_index, escape = message
+            fields = window_fields(
+                views["creep_density"][r0:r1],
+                views["flow_speed"][r0:r1],
+                views["wall_block"][r0:r1],
+                ys,
+                xs,
+                layout.map_shape,
+                config.local_sample_size,
+                row_offset=r0,
+            )
+            state = ProteinFleetState(
+                theta=views["theta"][owned], heat=views["heat"][owned], collapsed=views["collapsed"][owned]
+            )
+            tick = step_protein_fleet_from_fields(state, *fields, wave_index, escape, config)
+            views["stepped_theta"][owned] = tick.state.theta
+            views["stepped_heat"][owned] = tick.state.heat
+            views["stepped_collapsed"][owned] = tick.state.collapsed
+            views["damage"][owned] = tick.damage
+            barrier.wait()
+
+            halo_theta = views["stepped_theta"][gathered]
+            theta, heat = couple_thetas(
+                halo_theta[: len(owned)],
+                views["stepped_heat"][owned],
+                halo_theta,
+                local_neighbors,
+                degree,
+                coupling_eta,
+                coupling_heat_gain,
+            )
+            views["theta"][owned] = theta
+            views["heat"][owned] = heat
+            views["collapsed"][owned] = views["stepped_collapsed"][owned]
+            conn.send(("done",))
+    except Exception as error:  # surfaced to the parent as RuntimeError
+        barrier.abort()
+        conn.send(("error", repr(error)))
+    finally:
+        del views
+        conn.close()
+
+
+class ParallelProteinMap:
+    """Shared-memory map state stepped by one worker process per row band.
+
+    Write the current rasters into `creep_density`, `flow_speed` and
+    `wall_block` (shape `map_shape`) before each `tick`; `theta`, `heat`,
+    `collapsed` and `damage` are read back from the shared tower columns.
+    Use as a context manager, or call `close` to stop the workers and free
+    the shared block. `start_method` picks the multiprocessing start method
+    (`"fork"`, `"spawn"`, `"forkserver"`); None uses the platform default.
+    """
+
+    def __init__(
+        self,
+        layout: MapLayout,
+        workers: int = 4,
+        states: Sequence[ProteinTowerState] | None = None,
+        config: ProteinTowerConfig = ProteinTowerConfig(),
+        coupling_eta: float = 0.08,
+        coupling_heat_gain: float = 0.15,
+        start_method: str | None = None,
+    ) -> None:
+        states = [ProteinTowerState()] * len(layout) if states is None else list(states)
+        if len(states) != len(layout):
+            raise ValueError(f"expected {len(layout)} tower states, got {len(states)}")
+        self.layout = layout
+        self.bands = partition_bands(layout, workers, config.local_sample_size)
+        offsets, size = _shared_offsets(layout.map_shape, len(layout))
+        self._conns: list[Connection] = []
+        self._workers: list[mp.process.BaseProcess] = []
+        self._barrier: Barrier | None = None
+        self._shm = SharedMemory(create=True, size=size)
+        try:
+            self._views = _shared_views(self._shm, offsets)
+            initial = ProteinFleetState.from_states(states)
+            self._views["theta"][:] = initial.theta
+            self._views["heat"][:] = initial.heat
+            self._views["collapsed"][:] = initial.collapsed
+
+            context = mp.get_context(start_method)
+            # Held for the map's lifetime: spawned workers attach to the barrier's
+            # semaphores after start() returns, so it must outlive the loop.
+            self._barrier = context.Barrier(len(self.bands))
+            for band in self.bands:
+                parent, child = context.Pipe()
+                self._conns.append(parent)
+                worker = context.Process(
+                    target=_band_worker,
+                    args=(
+                        self._shm, offsets, layout, band, config, coupling_eta, coupling_heat_gain, self._barrier, child
+                    ),
+                    daemon=True,
+                )
+                worker.start()
+                child.close()
+                self._workers.append(worker)
+        except BaseException:
+            self.close()
+            raise
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        views = self.__dict__.get("_views")
+        if views is None or name not in views or name.startswith("stepped_"):
+            raise AttributeError(name)
+        return views[name]
+
+    def __enter__(self) -> "ParallelProteinMap":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def state(self) -> ProteinFleetState:
+        """A copy of the current tower state."""
+
+        return ProteinFleetState(theta=self.theta.copy(), heat=self.heat.copy(), collapsed=self.collapsed.copy())
+
+    def tick(self, wave_index: int, realized_escape_energy: float) -> None:
+        """Advance every band one map tick; returns when all workers are done."""
+
+        if not self._workers:
+            raise ValueError("ParallelProteinMap is closed")
+        try:
+            for conn in self._conns:
+                conn.send(("tick", wave_index, float(realized_escape_energy)))
+            replies = self._collect_replies()
+        except (EOFError, OSError) as error:
+            self.close()
+            raise RuntimeError(f"map worker exited mid-tick: {error!r}") from error
+        errors = [reply[1] for reply in replies if reply[0] == "error"]
+        if errors:
+            self.close()
+            raise RuntimeError(f"map worker failed: {errors[0]}")
+
+    def _collect_replies(self) -> list[tuple]:
+        # Also watch the process sentinels: a worker that dies without replying
+        # would otherwise leave recv() (and its peers' barrier) waiting forever.
+        waiting = dict(zip(self._conns, self._workers))
+        replies = []
+        while waiting:
+            ready = wait([*waiting, *(worker.sentinel for worker in waiting.values())])
+            for conn in [conn for conn in waiting if conn in ready]:
+                replies.append(conn.recv())
+                del waiting[conn]
+            for worker in waiting.values():
+                if worker.sentinel in ready:
+                    raise EOFError(f"worker {worker.pid} exited with code {worker.exitcode}")
+        return replies
+
+    def close(self) -> None:
+        """Stop the workers and free the shared block; safe to call repeatedly."""
+
+        if self._barrier is not None:
+            # Releases workers stuck in a phase whose peer has died.
+            self._barrier.abort()
+        for conn in self._conns:
+            try:
+                conn.send(("stop",))
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._workers, self._barrier = [], [], None
+        self.__dict__.pop("_views", None)
+        shm = self.__dict__.pop("_shm", None)
+        if shm is not None:
+            shm.close()
+            shm.unlink()
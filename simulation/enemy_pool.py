@@ -0,0 +1,178 @@
+"""Array-backed enemy pool for batched BURZEN TD wave simulation.
+
+Enemies live in fixed slots of contiguous hp/progress/speed arrays instead of
+one frozen `EnemySnapshot` per frame. Per-frame movement and damage run in
+place through preallocated scratch buffers; spawning reuses freed slots from a
+stack, so a steady-state frame allocates nothing. Wave scaling is read from the
+cached tables in `wave_tables`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules, EnemySnapshot
+from simulation.wave_tables import enemy_hp_at, enemy_speed_at, reward_at
+
+
+@dataclass(frozen=True)
+class PoolSweep:
+    """Outcome of retiring defeated or leaked enemies in one frame."""
+
+    count: int
+    reward: int
+
+
+class EnemyPool:
+    """Contiguous enemy storage with slot recycling.
+
+    `hp`, `progress` and `speed` are float64 arrays indexed by slot and
+    `alive` marks occupied slots. Dead slots keep stale values; always mask
+    reads with `alive`.
+    """
+
+    def __init__(self, capacity: int = 512) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.hp = np.zeros(capacity, dtype=np.float64)
+        self.progress = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._scratch = np.zeros(capacity, dtype=np.float64)
+        self._mask = np.zeros(capacity, dtype=bool)
+        # Free slots are popped from the end, lowest slot first.
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int64)
+        self._free_count = capacity
+
+    @classmethod
+    def from_snapshots(cls, enemies: Sequence[EnemySnapshot], capacity: int | None = None) -> "EnemyPool":
+        pool = cls(max(1, capacity or len(enemies)))
+        slots = pool._claim(len(enemies))
+        pool.hp[slots] = [e.hp for e in enemies]
+        pool.progress[slots] = [e.progress_px for e in enemies]
+        pool.speed[slots] = [e.speed_px_s for e in enemies]
+        return pool
+
+    @classmethod
+    def from_state_arrays(cls, arrays: dict[str, np.ndarray]) -> "EnemyPool":
+        """Rebuild a pool from `state_arrays()` output, free-slot order included."""
+
+        pool = cls(len(arrays["hp"]))
+        for name in ("hp", "progress", "speed", "alive"):
+            getattr(pool, name)[:] = arrays[name]
+        free = arrays["free"]
+        pool._free[: len(free)] = free
+        pool._free_count = len(free)
+        return pool
+
+    def state_arrays(self) -> dict[str, np.ndarray]:
+        """Everything needed to restore this pool exactly, as 1-D arrays."""
+
+        return {
+            "hp": self.hp,
+            "progress": self.progress,
+            "speed": self.speed,
+            "alive": self.alive,
+            "free": self._free[: self._free_count],
+        }
+
+    @property
+    def capacity(self) -> int:
+        return len(self.hp)
+
+    def __len__(self) -> int:
+        return self.capacity - self._free_count
+
+    def snapshot(self, slot: int) -> EnemySnapshot:
+        if not self.alive[slot]:
+            raise ValueError(f"slot {slot} is not occupied")
+        return EnemySnapshot(
+            hp=float(self.hp[slot]), progress_px=float(self.progress[slot]), speed_px_s=float(self.speed[slot])
+        )
+
+    def spawn(self, count: int, wave_index: int, rules: CoreRules, progress_px: float = 0.0) -> np.ndarray:
+        """Spawn `count` wave-scaled enemies and return their slots."""
+
+        slots = self._claim(count)
+        self.hp[slots] = enemy_hp_at(wave_index, rules)
+        self.speed[slots] = enemy_speed_at(wave_index, rules)
+        self.progress[slots] = progress_px
+        return slots
+
+    def advance(self, dt: float) -> None:
+        """Vectorized `step_enemy` for every live slot."""
+
+        np.multiply(self.speed, dt, out=self._scratch)
+        np.add(self.progress, self._scratch, out=self.progress, where=self.alive)
+
+    def apply_damage(self, damage: np.ndarray | float) -> None:
+        """Vectorized `apply_damage` with one damage value per slot (or a scalar)."""
+
+        np.subtract(self.hp, damage, out=self.hp, where=self.alive)
+        np.maximum(self.hp, 0.0, out=self.hp)
+
+    def apply_damage_at(self, slots: np.ndarray, damage: np.ndarray | float) -> None:
+        """Accumulate damage onto specific slots; repeated slots stack."""
+
+        np.subtract.at(self.hp, slots, damage)
+        np.maximum(self.hp, 0.0, out=self.hp)
+
+    def defeated(self) -> np.ndarray:
+        """Mask of live slots with no HP left (`is_enemy_defeated`)."""
+
+        return self._defeated_mask().copy()
+
+    def collect_defeated(self, wave_index: int, rules: CoreRules) -> PoolSweep:
+        """Free defeated slots and total their `reward_for_kill`."""
+
+        kills = self._release(self._defeated_mask())
+        return PoolSweep(count=kills, reward=kills * int(reward_at(wave_index, rules)))
+
+    def collect_leaked(self, path_length_px: float) -> PoolSweep:
+        """Free live slots that reached the end of the path."""
+
+        np.greater_equal(self.progress, path_length_px, out=self._mask)
+        self._mask &= self.alive
+        return PoolSweep(count=self._release(self._mask), reward=0)
+
+    def _defeated_mask(self) -> np.ndarray:
+        # Fills the shared scratch mask; valid until the next pool call.
+        np.less_equal(self.hp, 0.0, out=self._mask)
+        self._mask &= self.alive
+        return self._mask
+
+    def _claim(self, count: int) -> np.ndarray:
+        if count > self._free_count:
+            self._grow(max(self.capacity * 2, len(self) + count))
+        start = self._free_count - count
+        slots = self._free[start : self._free_count][::-1].copy()
+        self._free_count = start
+        self.alive[slots] = True
+        return slots
+
+    def _release(self, mask: np.ndarray) -> int:
+        slots = np.flatnonzero(mask)
+        if slots.size == 0:
+            return 0
+        self.alive[slots] = False
+        # Push highest first so the lowest freed slot is reused first.
+        self._free[self._free_count : self._free_count + slots.size] = slots[::-1]
+        self._free_count += slots.size
+        return int(slots.size)
+
+    def _grow(self, capacity: int) -> None:
+        old = self.capacity
+        for name in ("hp", "progress", "speed", "alive", "_scratch", "_mask"):
+            current = getattr(self, name)
+            grown = np.zeros(capacity, dtype=current.dtype)
+            grown[:old] = current
+            setattr(self, name, grown)
+        free = np.empty(capacity, dtype=np.int64)
+        added = np.arange(capacity - 1, old - 1, -1, dtype=np.int64)
+        free[: added.size] = added
+        free[added.size : added.size + self._free_count] = self._free[: self._free_count]
+        self._free = free
+        self._free_count += added.size
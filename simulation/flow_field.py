@@ -0,0 +1,238 @@
+"""Creep flow-field pathing with incremental repair on tower placement.
+
+The field stores, for every tile, the cheapest traversal cost to reach any
+goal tile moving in four directions. Leaving a tile costs
+`1 + wall_penalty * wall_block`; tiles with `wall_block >= 1` and tiles
+holding a tower are impassable. Creeps follow the field by stepping to the
+neighbor with the lowest distance.
+
+Placing or removing a tower changes one tile's cost. Rather than rerunning
+Dijkstra over the map, the repair works like dynamic shortest-path updates:
+
+- cost increase: collect the tiles whose recorded distance was derived through
+  the changed tile (its shortest-path subtree, ties included), invalidate only
+  those, and re-run Dijkstra seeded from their intact border;
+- cost decrease: lower the changed tile from its neighbors and propagate the
+  improvement outward while it still improves something.
+
+Both touch only the affected region, and both reach the same fixed point
+`dist[u] = cost[u] + min(dist[neighbor])` as a full recompute, so results are
+identical, not just close. Tiles are addressed `(x, y)` like `TowerPlacement`;
+grids are indexed `[y][x]`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from math import inf
+from typing import Iterable, Sequence
+
+
+Grid = Sequence[Sequence[float]]
+Tile = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class PlacementImpact:
+    """What-if outcome of placing a tower on `tile`.
+
+    `feasible` is False when the tile cannot hold a tower (off the map, a
+    goal, a wall or an existing tower); the field is then left as it is, so
+    the distance is unchanged and nothing is touched.
+    """
+
+    tile: Tile
+    blocked: bool
+    spawn_distance: float
+    distance_delta: float
+    tiles_touched: int
+    feasible: bool = True
+
+
+class FlowField:
+    """Distance-to-goal field over a tile grid with incremental repair."""
+
+    def __init__(self, wall_block: Grid, goals: Iterable[Tile], wall_penalty: float = 4.0) -> None:
+        self.height = len(wall_block)
+        self.width = len(wall_block[0]) if self.height else 0
+        self.wall_penalty = wall_penalty
+        self._base_cost = [
+            inf if value >= 1.0 else 1.0 + wall_penalty * value for row in wall_block for value in row
+        ]
+        self.cost = list(self._base_cost)
+        self.goals = frozenset(self._index(x, y) for x, y in goals)
+        if not self.goals:
+            raise ValueError("a flow field needs at least one goal tile")
+        self.towers: set[int] = set()
+        self.dist: list[float] = []
+        self.recompute()
+
+    def _index(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"tile {(x, y)} is outside the {self.width}x{self.height} map")
+        return y * self.width + x
+
+    def _neighbors(self, i: int) -> list[int]:
+        x, y = i % self.width, i // self.width
+        out = []
+        if x > 0:
+            out.append(i - 1)
+        if x + 1 < self.width:
+            out.append(i + 1)
+        if y > 0:
+            out.append(i - self.width)
+        if y + 1 < self.height:
+            out.append(i + self.width)
+        return out
+
+    def distance(self, x: int, y: int) -> float:
+        return self.dist[self._index(x, y)]
+
+    def next_step(self, x: int, y: int) -> Tile | None:
+        """Neighbor a creep on `(x, y)` moves to, or None at a goal or when cut off."""
+
+        i = self._index(x, y)
+        if i in self.goals or self.dist[i] == inf:
+            return None
+        best = min(self._neighbors(i), key=lambda j: (self.dist[j], j))
+        return best % self.width, best // self.width
+
+    def rows(self) -> list[list[float]]:
+        return [self.dist[y * self.width : (y + 1) * self.width] for y in range(self.height)]
+
+    def recompute(self) -> None:
+        """Full multi-source Dijkstra from the goal tiles."""
+
+        self.dist = [inf] * (self.width * self.height)
+        heap = []
+        for goal in self.goals:
+            self.dist[goal] = 0.0
+            heap.append((0.0, goal))
+        heap.sort()
+        self._propagate(heap, None)
+
+    def place_tower(self, x: int, y: int) -> int:
+        """Block `(x, y)` and repair the field; returns the number of tiles touched."""
+
+        i = self._index(x, y)
+        if i in self.goals:
+            raise ValueError(f"cannot place a tower on goal tile {(x, y)}")
+        self.towers.add(i)
+        return self._set_costs({i: inf}, None)
+
+    def remove_tower(self, x: int, y: int) -> int:
+        i = self._index(x, y)
+        if i not in self.towers:
+            raise ValueError(f"no tower at {(x, y)}")
+        self.towers.discard(i)
+        return self._set_costs({i: self._base_cost[i]}, None)
+
+    def what_if(self, candidates: Iterable[Tile], spawns: Sequence[Tile]) -> list[PlacementImpact]:
+        """Evaluate tower placements one at a time without committing them.
+
+        Each candidate is applied with the incremental repair under an undo
+        journal and rolled back by restoring the journaled values, so cost
+        per candidate is proportional to the region it would reroute.
+        `blocked` means the placement would cut every spawn off from the
+        goals. A candidate that cannot hold a tower at all is reported with
+        `feasible=False` rather than failing the batch. When the spawns are
+        already cut off, `distance_delta` is 0.0, not `inf - inf`.
+        """
+
+        spawn_ids = [self._index(x, y) for x, y in spawns]
+        baseline = min((self.dist[s] for s in spawn_ids), default=inf)
+        impacts = []
+        for x, y in candidates:
+            i = y * self.width + x
+            if not (0 <= x < self.width and 0 <= y < self.height) or i in self.goals or self.cost[i] == inf:
+                impacts.append(
+                    PlacementImpact(
+                        tile=(x, y),
+                        blocked=baseline == inf,
+                        spawn_distance=baseline,
+                        distance_delta=0.0,
+                        tiles_touched=0,
+                        feasible=False,
+                    )
+                )
+                continue
+            journal: dict[int, float] = {}
+            old_cost = self.cost[i]
+            touched = self._set_costs({i: inf}, journal)
+            spawn_distance = min((self.dist[s] for s in spawn_ids), default=inf)
+            impacts.append(
+                PlacementImpact(
+                    tile=(x, y),
+                    blocked=spawn_distance == inf,
+                    spawn_distance=spawn_distance,
+                    distance_delta=0.0 if spawn_distance == baseline else spawn_distance - baseline,
+                    tiles_touched=touched,
+                )
+            )
+            self.cost[i] = old_cost
+            for j, value in journal.items():
+                self.dist[j] = value
+        return impacts
+
+    def _set_costs(self, changes: dict[int, float], journal: dict[int, float] | None) -> int:
+        dist, cost = self.dist, self.cost
+        raised = [i for i, value in changes.items() if value > cost[i]]
+        lowered = [i for i, value in changes.items() if value < cost[i]]
+        for i, value in changes.items():
+            cost[i] = value
+
+        # Tiles whose distance was derived through a raised tile, ties included.
+        affected = set(i for i in raised if i not in self.goals)
+        frontier = list(affected)
+        while frontier:
+            s = frontier.pop()
+            if dist[s] == inf:
+                continue
+            for u in self._neighbors(s):
+                if u in affected or u in self.goals or dist[u] == inf:
+                    continue
+                if dist[u] == dist[s] + cost[u]:
+                    affected.add(u)
+                    frontier.append(u)
+
+        touched = set(affected)
+        for i in affected:
+            if journal is not None and i not in journal:
+                journal[i] = dist[i]
+            dist[i] = inf
+        heap = []
+        for u in affected:
+            best = min((dist[w] for w in self._neighbors(u) if w not in affected), default=inf)
+            if best + cost[u] < inf:
+                dist[u] = best + cost[u]
+                heappush(heap, (dist[u], u))
+        for u in lowered:
+            if u in self.goals:
+                continue
+            candidate = cost[u] + min((dist[w] for w in self._neighbors(u)), default=inf)
+            if candidate < dist[u]:
+                if journal is not None and u not in journal:
+                    journal[u] = dist[u]
+                dist[u] = candidate
+                touched.add(u)
+                heappush(heap, (candidate, u))
+        touched.update(self._propagate(heap, journal))
+        return len(touched)
+
+    def _propagate(self, heap: list[tuple[float, int]], journal: dict[int, float] | None) -> set[int]:
+        dist, cost = self.dist, self.cost
+        touched: set[int] = set()
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            for v in self._neighbors(u):
+                candidate = d + cost[v]
+                if candidate < dist[v] and v not in self.goals:
+                    if journal is not None and v not in journal:
+                        journal[v] = dist[v]
+                    dist[v] = candidate
+                    touched.add(v)
+                    heappush(heap, (candidate, v))
+        return touched
@@ -0,0 +1,436 @@
+"""Memory-mapped golden traces for engine parity checks.
+
+A trace holds four per-tower, per-tick columns from a reference run: thermal
+`heat`, thermal `overheated`, Protein `theta` and Protein `damage`. The file
+is a 64-byte header followed by one contiguous column block per field, each
+stored tick-major as a (ticks x towers) little-endian array:
+
+    header   magic "XDXTRACE", u32 version, u32 tower count, u64 tick count,
+             f64 dt, u32 column count, padding to 64 bytes
+    columns  heat <f8, overheated |b1, theta <f8, damage <f8, each starting
+             on a 64-byte boundary in that order
+
+Writers fill the columns through `np.memmap` and readers map them the same
+way, so neither side holds a whole trace in memory. `compare_traces` walks
+two traces in chunks of about `chunk_elements` cells per column and reports
+the first divergence plus per-column error statistics. The engine side only needs to produce the same
+layout to be checked against `write_reference_trace`.
+
+`write_batched_trace` produces the same trace from the batched engines in a
+chosen numeric mode, so float32 or fixed-point drift can be measured against
+the float64 reference before it shows up on device.
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from simulation.numeric_mode import NumericMode, numeric_mode
+from simulation.protein_batch import ProteinFleetState, step_protein_fleet
+from simulation.protein_tower import LocalFlowState, ProteinTowerConfig, ProteinTowerState, step_protein_tower
+from simulation.thermal_batch import ThermalParamArrays, step_thermal_batch
+from simulation.thermal_reference import ThermalParams, TowerThermalState
+
+
+MAGIC = b"XDXTRACE"
+VERSION = 1
+COLUMNS: tuple[tuple[str, np.dtype], ...] = (
+    ("heat", np.dtype("<f8")),
+    ("overheated", np.dtype("|b1")),
+    ("theta", np.dtype("<f8")),
+    ("damage", np.dtype("<f8")),
+)
+_HEADER = struct.Struct("<8sIIQdI")
+_ALIGN = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) & ~(_ALIGN - 1)
+
+
+def _column_offsets(towers: int, ticks: int) -> tuple[list[int], int]:
+    offsets = []
+    offset = _align(_HEADER.size)
+    for _, dtype in COLUMNS:
+        offsets.append(offset)
+        offset = _align(offset + towers * ticks * dtype.itemsize)
+    return offsets, offset
+
+
+def _map_columns(buffer: np.ndarray, towers: int, ticks: int) -> dict[str, np.ndarray]:
+    offsets, _ = _column_offsets(towers, ticks)
+    columns = {}
+    for (name, dtype), offset in zip(COLUMNS, offsets):
+        raw = buffer[offset : offset + towers * ticks * dtype.itemsize]
+        columns[name] = raw.view(dtype).reshape(ticks, towers)
+    return columns
+
+
+class TraceWriter:
+    """Fills a preallocated trace file block by block.
+
+    The tick count is fixed up front because every column's offset depends
+    on it; closing before all ticks are written raises ValueError.
+    """
+
+    def __init__(self, path: str | Path, towers: int, ticks: int, dt: float) -> None:
+        if towers <= 0 or ticks <= 0:
+            raise ValueError(f"a trace needs at least one tower and tick, got {towers} x {ticks}")
+        _, size = _column_offsets(towers, ticks)
+        self.path = Path(path)
+        self.towers = towers
+        self.ticks = ticks
+        self._buffer: np.memmap | None = np.memmap(self.path, dtype=np.uint8, mode="w+", shape=(size,))
+        self._buffer[: _HEADER.size] = np.frombuffer(
+            _HEADER.pack(MAGIC, VERSION, towers, ticks, dt, len(COLUMNS)), dtype=np.uint8
+        )
+        self._columns = _map_columns(self._buffer, towers, ticks)
+        self._cursor = 0
+
+    @property
+    def written(self) -> int:
+        return self._cursor
+
+    def append(self, heat: np.ndarray, overheated: np.ndarray, theta: np.ndarray, damage: np.ndarray) -> None:
+        """Write one tick (shape `(towers,)`) or a block of ticks (`(k, towers)`)."""
+
+        if self._buffer is None:
+            raise ValueError(f"trace {self.path} is already closed")
+        block = {"heat": heat, "overheated": overheated, "theta": theta, "damage": damage}
+        rows = None
+        for name, values in block.items():
+            values = np.asarray(values)
+            values = values.reshape(1, -1) if values.ndim == 1 else values
+            if values.ndim != 2 or values.shape[1] != self.towers:
+                raise ValueError(f"{name} block must have {self.towers} towers per tick, got shape {values.shape}")
+            if rows is None:
+                rows = values.shape[0]
+            elif values.shape[0] != rows:
+                raise ValueError("all columns in one append must cover the same ticks")
+            block[name] = values
+        assert rows is not None
+        if self._cursor + rows > self.ticks:
+            raise ValueError(f"trace holds {self.ticks} ticks; cannot append {rows} after {self._cursor}")
+        for name, values in block.items():
+            self._columns[name][self._cursor : self._cursor + rows] = values
+        self._cursor += rows
+
+    def close(self) -> None:
+        if self._buffer is None:
+            return
+        self._buffer.flush()
+        self._buffer = None
+        self._columns = {}
+        if self._cursor != self.ticks:
+            raise ValueError(f"trace {self.path} closed after {self._cursor} of {self.ticks} ticks")
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._buffer is not None:
+            self._buffer = None
+            self._columns = {}
+
+
+class GoldenTrace:
+    """Read-only memory-mapped view of a trace file."""
+
+    def __init__(self, buffer: np.ndarray) -> None:
+        if len(buffer) < _HEADER.size:
+            raise ValueError("buffer is too short for a trace header")
+        magic, version, towers, ticks, dt, column_count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION or column_count != len(COLUMNS):
+            raise ValueError(f"not a version {VERSION} XODEX golden trace")
+        _, size = _column_offsets(towers, ticks)
+        if len(buffer) < size:
+            raise ValueError(f"trace is truncated: {len(buffer)} bytes, expected {size}")
+        self.towers = towers
+        self.ticks = ticks
+        self.dt = dt
+        self._columns = _map_columns(buffer, towers, ticks)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "GoldenTrace":
+        return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    def column(self, name: str) -> np.ndarray:
+        """(ticks x towers) view; pages load only when sliced."""
+
+        return self._columns[name]
+
+
+def write_reference_trace(
+    path: str | Path,
+    fire_matrix: np.ndarray | Sequence[Sequence[bool]],
+    flows: Sequence[LocalFlowState],
+    dt: float,
+    wave_index: int = 0,
+    realized_escape_energy: float = 0.0,
+    thermal_params: ThermalParams | None = None,
+    config: ProteinTowerConfig = ProteinTowerConfig(),
+    chunk_ticks: int = 4096,
+) -> GoldenTrace:
+    """Run the scalar reference models and write their trace.
+
+    Each tower fires per its `fire_matrix` row (towers x ticks) through
+    `TowerThermalState.step` and steps `step_protein_tower` on its fixed
+    `flows` window every tick. Output is buffered `chunk_ticks` at a time.
+    """
+
+    fires = np.asarray(fire_matrix, dtype=bool)
+    if fires.ndim != 2:
+        raise ValueError(f"fire_matrix must be 2-D (towers, ticks), got shape {fires.shape}")
+    towers, ticks = fires.shape
+    if len(flows) != towers:
+        raise ValueError(f"expected {towers} flow windows, got {len(flows)}")
+    params = thermal_params or ThermalParams()
+    thermal = [TowerThermalState() for _ in range(towers)]
+    protein = [ProteinTowerState() for _ in range(towers)]
+
+    with TraceWriter(path, towers, ticks, dt) as writer:
+        for start in range(0, ticks, chunk_ticks):
+            stop = min(ticks, start + chunk_ticks)
+            heat = np.empty((stop - start, towers), dtype=np.float64)
+            overheated = np.empty((stop - start, towers), dtype=bool)
+            theta = np.empty((stop - start, towers), dtype=np.float64)
+            damage = np.empty((stop - start, towers), dtype=np.float64)
+            block = fires[:, start:stop].T.tolist()
+            for row, fired_row in enumerate(block):
+                for tower, fired in enumerate(fired_row):
+                    state = thermal[tower]
+                    state.step(dt=dt, fired=fired, params=params)
+                    result = step_protein_tower(protein[tower], flows[tower], wave_index, realized_escape_energy, config)
+                    protein[tower] = result.state
+                    heat[row, tower] = state.heat
+                    overheated[row, tower] = state.overheated
+                    theta[row, tower] = result.state.theta
+                    damage[row, tower] = result.damage
+            writer.append(heat, overheated, theta, damage)
+    return GoldenTrace.open(path)
+
+
+def write_batched_trace(
+    path: str | Path,
+    fire_matrix: np.ndarray | Sequence[Sequence[bool]],
+    flows: Sequence[LocalFlowState],
+    dt: float,
+    mode: NumericMode | str,
+    wave_index: int = 0,
+    realized_escape_energy: float = 0.0,
+    thermal_params: ThermalParams | None = None,
+    config: ProteinTowerConfig = ProteinTowerConfig(),
+    chunk_ticks: int = 4096,
+) -> GoldenTrace:
+    """`write_reference_trace` computed by the batched engines in `mode`.
+
+    State stays in the mode's representation for the whole run; values are
+    decoded to float64 only when written.
+    """
+
+    mode = numeric_mode(mode)
+    fires = np.asarray(fire_matrix, dtype=bool)
+    if fires.ndim != 2:
+        raise ValueError(f"fire_matrix must be 2-D (towers, ticks), got shape {fires.shape}")
+    towers, ticks = fires.shape
+    if len(flows) != towers:
+        raise ValueError(f"expected {towers} flow windows, got {len(flows)}")
+    params = ThermalParamArrays.from_params(thermal_params, towers, mode)
+    decay = params.decay(dt)
+    heat = np.zeros(towers, dtype=mode.dtype)
+    overheated = np.zeros(towers, dtype=bool)
+    protein = ProteinFleetState.from_states([ProteinTowerState()] * towers, mode)
+    creep_density = np.array([f.creep_density for f in flows], dtype=np.float64)
+    flow_speed = np.array([f.flow_speed for f in flows], dtype=np.float64)
+    wall_block = np.array([f.wall_block for f in flows], dtype=np.float64)
+    fires_by_tick = np.ascontiguousarray(fires.T)
+
+    with TraceWriter(path, towers, ticks, dt) as writer:
+        for start in range(0, ticks, chunk_ticks):
+            stop = min(ticks, start + chunk_ticks)
+            heat_out = np.empty((stop - start, towers), dtype=mode.dtype)
+            overheated_out = np.empty((stop - start, towers), dtype=bool)
+            theta_out = np.empty((stop - start, towers), dtype=mode.dtype)
+            damage_out = np.empty((stop - start, towers), dtype=mode.dtype)
+            for row in range(stop - start):
+                step_thermal_batch(heat, overheated, fires_by_tick[start + row], decay, params)
+                tick = step_protein_fleet(
+                    protein, creep_density, flow_speed, wall_block, wave_index, realized_escape_energy, config
+                )
+                protein = tick.state
+                heat_out[row] = heat
+                overheated_out[row] = overheated
+                theta_out[row] = protein.theta
+                damage_out[row] = tick.damage
+            writer.append(mode.decode(heat_out), overheated_out, mode.decode(theta_out), mode.decode(damage_out))
+    return GoldenTrace.open(path)
+
+
+@dataclass(frozen=True)
+class TraceDivergence:
+    """First out-of-tolerance value, ordered by tick, then tower, then column."""
+
+    tick: int
+    tower: int
+    column: str
+    expected: float
+    actual: float
+
+
+@dataclass(frozen=True)
+class ColumnStats:
+    name: str
+    mismatches: int
+    max_abs_error: float
+    mean_abs_error: float
+    worst_tick: int
+    worst_tower: int
+
+
+@dataclass(frozen=True)
+class TraceComparison:
+    ticks_compared: int
+    expected_ticks: int
+    actual_ticks: int
+    first_divergence: TraceDivergence | None
+    columns: tuple[ColumnStats, ...]
+
+    @property
+    def matches(self) -> bool:
+        return self.first_divergence is None and self.expected_ticks == self.actual_ticks
+
+
+def compare_traces(
+    expected: GoldenTrace,
+    actual: GoldenTrace,
+    atol: float = 1e-9,
+    rtol: float = 0.0,
+    chunk_elements: int = 1 << 20,
+) -> TraceComparison:
+    """Stream both traces and compare every column within `atol + rtol * |expected|`.
+
+    Boolean columns must match exactly. Only the common tick prefix is
+    compared; a length difference is reported but is not a divergence.
+    Each chunk spans `max(1, chunk_elements // towers)` ticks, so peak
+    working memory is a few float64 arrays of `chunk_elements` cells
+    (about 40 MB at the default) however many towers the trace has.
+    """
+
+    if expected.towers != actual.towers:
+        raise ValueError(f"traces have different tower counts: {expected.towers} vs {actual.towers}")
+    if chunk_elements <= 0:
+        raise ValueError("chunk_elements must be positive")
+    towers = expected.towers
+    chunk_ticks = max(1, chunk_elements // max(1, towers))
+    ticks = min(expected.ticks, actual.ticks)
+    totals = {name: [0, 0.0, 0.0, 0, 0] for name, _ in COLUMNS}
+    first: TraceDivergence | None = None
+
+    for start in range(0, ticks, chunk_ticks):
+        stop = min(ticks, start + chunk_ticks)
+        chunk_first: tuple[int, int, str] | None = None
+        for order, (name, dtype) in enumerate(COLUMNS):
+            want = np.asarray(expected.column(name)[start:stop])
+            got = np.asarray(actual.column(name)[start:stop])
+            if dtype.kind == "b":
+                bad = want != got
+                error = bad.astype(np.float64)
+            else:
+                error = np.abs(got - want)
+                both_nan = np.isnan(want) & np.isnan(got)
+                error[both_nan] = 0.0
+                error[np.isnan(error)] = np.inf
+                bad = error > atol + rtol * np.abs(want)
+            entry = totals[name]
+            entry[0] += int(np.count_nonzero(bad))
+            entry[2] += float(np.sum(error))
+            worst = int(np.argmax(error))
+            if error.flat[worst] > entry[1]:
+                entry[1] = float(error.flat[worst])
+                row, entry[4] = divmod(worst, towers)
+                entry[3] = start + row
+            if first is None and bad.any():
+                key = (int(np.argmax(bad)), order, name)
+                if chunk_first is None or key[:2] < chunk_first[:2]:
+                    chunk_first = key
+        if first is None and chunk_first is not None:
+            flat, _, name = chunk_first
+            row, tower = divmod(flat, towers)
+            first = TraceDivergence(
+                tick=start + row,
+                tower=tower,
+                column=name,
+                expected=float(expected.column(name)[start + row, tower]),
+                actual=float(actual.column(name)[start + row, tower]),
+            )
+
+    cells = max(1, ticks * towers)
+    columns = tuple(
+        ColumnStats(
+            name=name,
+            mismatches=mismatches,
+            max_abs_error=max_error,
+            mean_abs_error=total / cells,
+            worst_tick=worst_tick,
+            worst_tower=worst_tower,
+        )
+        for name, (mismatches, max_error, total, worst_tick, worst_tower) in totals.items()
+    )
+    return TraceComparison(
+        ticks_compared=ticks,
+        expected_ticks=expected.ticks,
+        actual_ticks=actual.ticks,
+        first_divergence=first,
+        columns=columns,
+    )
+
+
+def format_comparison(result: TraceComparison) -> str:
+    lines = [f"compared {result.ticks_compared} ticks ({result.expected_ticks} expected, {result.actual_ticks} actual)"]
+    divergence = result.first_divergence
+    if divergence is None:
+        lines.append("no divergence within tolerance")
+    else:
+        lines.append(
+            f"first divergence: tick {divergence.tick} tower {divergence.tower} {divergence.column} "
+            f"expected {divergence.expected!r} actual {divergence.actual!r}"
+        )
+    for stats in result.columns:
+        lines.append(
+            f"  {stats.name:<10} mismatches={stats.mismatches:<8} max={stats.max_abs_error:.3e} "
+            f"mean={stats.mean_abs_error:.3e} worst=(tick {stats.worst_tick}, tower {stats.worst_tower})"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two golden traces.")
+    parser.add_argument("expected", type=Path)
+    parser.add_argument("actual", type=Path)
+    parser.add_argument("--atol", type=float, default=1e-9)
+    parser.add_argument("--rtol", type=float, default=0.0)
+    parser.add_argument("--chunk-elements", type=int, default=1 << 20)
+    args = parser.parse_args(argv)
+
+    result = compare_traces(
+        GoldenTrace.open(args.expected),
+        GoldenTrace.open(args.actual),
+        atol=args.atol,
+        rtol=args.rtol,
+        chunk_elements=args.chunk_elements,
+    )
+    print(format_comparison(result))
+    return 0 if result.matches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""Opt-in per-stage instrumentation for the thermal and Protein Tower modules.
+
+Nothing in `thermal_reference` or `protein_tower` calls into this module.
+`enable()` swaps the instrumented functions on those modules (and methods on
+their classes) for timing wrappers, and `disable()` puts the originals back,
+so a disabled profiler leaves the hot path untouched: no flag checks, no
+extra frames.
+
+Wrappers are installed as module/class attributes. Calls made through the
+module, including the modules' own internal calls, are seen; a name bound
+earlier with `from simulation.protein_tower import step_protein_tower` keeps
+pointing at the original function.
+
+Allocation counts are the change in `sys.getallocatedblocks()` across a call,
+i.e. net live blocks, which is cheap enough to keep on by default.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+import sys
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Iterator
+
+
+STAGES: dict[str, tuple[tuple[str, str], ...]] = {
+    "thermal": (
+        ("simulation.thermal_reference", "TowerThermalState.step"),
+        ("simulation.thermal_reference", "TowerThermalState.advance_idle"),
+        ("simulation.thermal_reference", "simulate_heat_curve"),
+        ("simulation.thermal_reference", "simulate_heat_events"),
+        ("simulation.thermal_reference", "write_heat_curve"),
+    ),
+    "protein_step": (("simulation.protein_tower", "step_protein_tower"),),
+    "field": (
+        ("simulation.protein_tower", "_compute_disruption_field"),
+        ("simulation.protein_tower", "_center_laplacian"),
+    ),
+    "coupling": (
+        ("simulation.protein_tower", "synthesize_protein_cluster"),
+        ("simulation.protein_tower", "ProteinNeighborIndex.build"),
+        ("simulation.protein_tower", "ProteinClusterTracker.add"),
+        ("simulation.protein_tower", "ProteinClusterTracker.remove"),
+    ),
+    "patterns": (
+        ("simulation.protein_tower", "detect_protein_patterns"),
+        ("simulation.protein_tower", "ProteinPatternIndex.add"),
+        ("simulation.protein_tower", "ProteinPatternIndex.remove"),
+    ),
+}
+
+
+@dataclass
+class CallStats:
+    stage: str
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    alloc_blocks: int = 0
+
+
+class Profiler:
+    """Collects call counters, timers, allocation deltas and a tick histogram.
+
+    Tick durations land in power-of-two microsecond buckets keyed by the
+    bucket's upper bound. Trace events are kept for Chrome's trace viewer
+    (`chrome://tracing`, Perfetto) up to `max_trace_events`.
+    """
+
+    def __init__(self, trace: bool = True, max_trace_events: int = 1_000_000) -> None:
+        self.calls: dict[str, CallStats] = {}
+        self.tick_histogram: dict[int, int] = {}
+        self.ticks = 0
+        self.trace_events: list[dict[str, object]] = []
+        self._trace = trace
+        self._max_trace_events = max_trace_events
+        self._origin_ns = perf_counter_ns()
+
+    def record(self, stage: str, label: str, start_ns: int, end_ns: int, alloc_blocks: int) -> None:
+        stats = self.calls.get(label)
+        if stats is None:
+            stats = self.calls[label] = CallStats(stage=stage)
+        elapsed = end_ns - start_ns
+        stats.calls += 1
+        stats.total_ns += elapsed
+        stats.max_ns = max(stats.max_ns, elapsed)
+        stats.alloc_blocks += alloc_blocks
+        if self._trace and len(self.trace_events) < self._max_trace_events:
+            self.trace_events.append(
+                {
+                    "name": label,
+                    "cat": stage,
+                    "ph": "X",
+                    "ts": (start_ns - self._origin_ns) / 1000.0,
+                    "dur": elapsed / 1000.0,
+                    "pid": 0,
+                    "tid": 0,
+                }
+            )
+
+    @contextmanager
+    def stage(self, name: str, label: str | None = None) -> Iterator[None]:
+        """Time a caller-defined block as its own stage."""
+
+        blocks = sys.getallocatedblocks()
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, label or name, start, perf_counter_ns(), sys.getallocatedblocks() - blocks)
+
+    @contextmanager
+    def tick(self) -> Iterator[None]:
+        """Time one simulation tick into the histogram (and trace, as stage `tick`)."""
+
+        start = perf_counter_ns()
+        try:
+            with self.stage("tick"):
+                yield
+        finally:
+            micros = max(1, (perf_counter_ns() - start) // 1000)
+            bucket = 1 << (micros - 1).bit_length()
+            self.tick_histogram[bucket] = self.tick_histogram.get(bucket, 0) + 1
+            self.ticks += 1
+
+    def stage_totals(self) -> dict[str, dict[str, int]]:
+        """Calls, time and allocations summed per stage (inclusive of nested calls)."""
+
+        totals: dict[str, dict[str, int]] = {}
+        for stats in self.calls.values():
+            entry = totals.setdefault(stats.stage, {"calls": 0, "total_ns": 0, "alloc_blocks": 0})
+            entry["calls"] += stats.calls
+            entry["total_ns"] += stats.total_ns
+            entry["alloc_blocks"] += stats.alloc_blocks
+        return totals
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "stages": self.stage_totals(),
+            "calls": {label: asdict(stats) for label, stats in self.calls.items()},
+            "ticks": self.ticks,
+            "tick_histogram_us": {str(bucket): count for bucket, count in sorted(self.tick_histogram.items())},
+        }
+
+    def to_chrome_trace(self) -> dict[str, object]:
+        return {"traceEvents": list(self.trace_events), "displayTimeUnit": "ms"}
+
+    def write_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+    def write_chrome_trace(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+
+
+_installed: list[tuple[object, str, object]] = []
+_active: Profiler | None = None
+
+
+def _wrap(fn: Callable[..., object], stage: str, label: str, profiler: Profiler) -> Callable[..., object]:
+    record = profiler.record
+    blocks = sys.getallocatedblocks
+
+    @functools.wraps(fn)
+    def instrumented(*args: object, **kwargs: object) -> object:
+        before = blocks()
+        start = perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(stage, label, start, perf_counter_ns(), blocks() - before)
+
+    return instrumented
+
+
+def enable(profiler: Profiler | None = None) -> Profiler:
+    """Install wrappers for every function in `STAGES` and return the profiler.
+
+    If any target cannot be resolved, the wrappers already installed are
+    removed again before the error propagates.
+    """
+
+    global _active
+    if _active is not None:
+        raise RuntimeError("instrumentation is already enabled; call disable() first")
+    profiler = profiler or Profiler()
+    try:
+        for stage, targets in STAGES.items():
+            for module_name, path in targets:
+                owner: object = importlib.import_module(module_name)
+                *parents, name = path.split(".")
+                for parent in parents:
+                    owner = getattr(owner, parent)
+                raw = owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)
+                label = f"{module_name.rsplit('.', 1)[-1]}.{path}"
+                if isinstance(raw, classmethod):
+                    replacement: object = classmethod(_wrap(raw.__func__, stage, label, profiler))
+                else:
+                    replacement = _wrap(raw, stage, label, profiler)
+                setattr(owner, name, replacement)
+                _installed.append((owner, name, raw))
+    except BaseException:
+        _uninstall()
+        raise
+    _active = profiler
+    return profiler
+
+
+def disable() -> Profiler | None:
+    """Restore the original functions; returns the profiler that was active."""
+
+    global _active
+    _uninstall()
+    profiler, _active = _active, None
+    return profiler
+
+
+def _uninstall() -> None:
+    while _installed:
+        owner, name, original = _installed.pop()
+        setattr(owner, name, original)
+
+
+@contextmanager
+def profiling(profiler: Profiler | None = None) -> Iterator[Profiler]:
+    active = enable(profiler)
+    try:
+        yield active
+    finally:
+        disable()
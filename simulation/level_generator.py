@@ -0,0 +1,636 @@
+"""Python port of the seeded level generator in `level_manager.gd`.
+
+`generate_level(seed, level_index)` reproduces `get_level_config()` (minus
+the save-game `progress`): the same `RandomNumberGenerator` draws in the same
+order, so wave counts, board layout, map mutation, layout profile and wave
+definition come out as the game builds them. `GodotRNG` is Godot 4's PCG32
+`RandomNumberGenerator`, including the single-precision `randf`/`randf_range`
+arithmetic, so float outputs are rounded exactly as on device.
+
+One input cannot be reproduced from the seed: `_carve_seed_path` orders its
+lateral moves with `Array.shuffle()`, which draws from the engine's global
+RNG rather than the level RNG, and Godot randomizes that at startup. The
+port takes the global RNG as `shuffle_rng`; by default it is a fresh
+`GodotRNG()` (the engine's unrandomized default seed) per level, which makes
+corpora deterministic and matches the game whenever its global RNG is in
+that state.
+
+`write_level_corpus` generates many levels in worker processes and stores
+them in a compact indexed file; `LevelCorpus` memory-maps it and loads any
+`(seed, level_index)` through an open-addressing hash table in O(1). Corpus
+run seeds must fit in u32, and level indices are clamped to
+`[MIN_LEVEL_INDEX, MAX_LEVEL_INDEX]` exactly as `generate_level` clamps them:
+
+    header  magic "XDXLVLS1", u32 version, u32 level count,
+            u64 table slots, u64 table offset
+    records one per level, see `encode_level`
+    table   per slot u64 key, u64 record offset, u64 record length
+"""
+
+from __future__ import annotations
+
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import ldexp
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+
+BOARD_SIZE = 80
+MIN_LEVEL_INDEX = 0
+MAX_LEVEL_INDEX = 1000
+WALL_MIN_DENSITY = 0.15
+WALL_MAX_DENSITY = 0.35
+
+Tile = tuple[int, int]
+
+_MASK64 = (1 << 64) - 1
+_PCG_MULT = 6364136223846793005
+_PCG_DEFAULT_INC = 1442695040888963407
+_PCG_DEFAULT_SEED = 12047754176567800795
+
+
+class GodotRNG:
+    """Godot 4 `RandomNumberGenerator` (PCG32 `RandomPCG`)."""
+
+    def __init__(self, seed: int = _PCG_DEFAULT_SEED, inc: int = _PCG_DEFAULT_INC) -> None:
+        self._inc_seq = inc
+        self.seed(seed)
+
+    def seed(self, seed: int) -> None:
+        # pcg32_srandom_r
+        self._state = 0
+        self._inc = ((self._inc_seq << 1) | 1) & _MASK64
+        self.rand()
+        self._state = (self._state + seed) & _MASK64
+        self.rand()
+
+    def rand(self) -> int:
+        """One raw 32-bit draw (`pcg32_random_r`)."""
+
+        old = self._state
+        self._state = (old * _PCG_MULT + self._inc) & _MASK64
+        xorshifted = (((old >> 18) ^ old) >> 27) & 0xFFFFFFFF
+        rot = old >> 59
+        return ((xorshifted >> rot) | (xorshifted << ((-rot) & 31))) & 0xFFFFFFFF
+
+    def bounded(self, bound: int) -> int:
+        """`pcg32_boundedrand_r`: unbiased draw in `[0, bound)`."""
+
+        threshold = (-bound & 0xFFFFFFFF) % bound
+        while True:
+            r = self.rand()
+            if r >= threshold:
+                return r % bound
+
+    def randf(self) -> float:
+        """Single-precision draw in [0, 1] (`RandomPCG::randf`)."""
+
+        exponent_source = self.rand()
+        if exponent_source == 0:
+            return 0.0
+        significand = float(np.float32(self.rand() | 0x80000001))
+        return ldexp(significand, -32 - (32 - exponent_source.bit_length()))
+
+    def randf_range(self, low: float, high: float) -> float:
+        """`randf() * (high - low) + low`, evaluated in float32."""
+
+        low32, high32 = np.float32(low), np.float32(high)
+        return float(np.float32(self.randf()) * (high32 - low32) + low32)
+
+    def randi_range(self, low: int, high: int) -> int:
+        if low == high:
+            return low
+        return self.bounded(abs(low - high) + 1) + min(low, high)
+
+
+def hash_seed(seed_label: str) -> int:
+    """`_hash_seed`: 31-bit string hash of a seed label, never 0."""
+
+    value = 0
+    for char in seed_label:
+        value = ((value << 5) - value + ord(char)) & 0x7FFFFFFF
+    return value or 1
+
+
+@dataclass(frozen=True)
+class BoardLayout:
+    wall_density: float
+    spawn_tile: Tile
+    exit_tile: Tile
+    path_tiles: tuple[Tile, ...]
+    walls: tuple[Tile, ...]
+    tower_nodes: tuple[tuple[float, float], ...]
+
+    def wall_grid(self) -> np.ndarray:
+        """`(BOARD_SIZE, BOARD_SIZE)` 0/1 grid indexed `[y, x]`, for `FlowField`."""
+
+        grid = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.float64)
+        if self.walls:
+            xs, ys = zip(*self.walls)
+            grid[list(ys), list(xs)] = 1.0
+        return grid
+
+
+MAP_PRESETS: tuple[dict[str, object], ...] = (
+    {
+        "map_name": "AngelPressureField",
+        "heat_global_multiplier": 1.2,
+        "enemy_scaling_exponent": 1.3,
+        "fog_density": 0.2,
+        "heat_feedback_gain": 0.26,
+        "heat_decay_coefficient": 0.24,
+    },
+    {
+        "map_name": "DotAFlowDenial",
+        "heat_global_multiplier": 1.05,
+        "enemy_scaling_exponent": 1.15,
+        "fog_density": 0.34,
+        "heat_feedback_gain": 0.2,
+        "heat_decay_coefficient": 0.2,
+    },
+    {
+        "map_name": "TwilightRuleRegion",
+        "heat_global_multiplier": 0.95,
+        "enemy_scaling_exponent": 1.2,
+        "fog_density": 0.45,
+        "heat_feedback_gain": 0.16,
+        "heat_decay_coefficient": 0.12,
+    },
+    {
+        "map_name": "MafiaHiddenInvariant",
+        "heat_global_multiplier": 1.1,
+        "enemy_scaling_exponent": 1.25,
+        "fog_density": 0.55,
+        "heat_feedback_gain": 0.22,
+        "heat_decay_coefficient": 0.16,
+    },
+)
+
+
+@dataclass(frozen=True)
+class MapMutation:
+    preset_index: int
+    map_name: str
+    heat_global_multiplier: float
+    enemy_scaling_exponent: float
+    fog_density: float
+    heat_feedback_gain: float
+    heat_decay_coefficient: float
+
+
+@dataclass(frozen=True)
+class LayoutProfile:
+    wall_density: float
+    tower_node_count: int
+    thermal_zone_bias: float
+    vector_flow_bias: float
+    resource_multiplier: float
+
+
+@dataclass(frozen=True)
+class WaveDefinition:
+    creep_count: int
+    spawn_batch: int
+    spawn_interval: float
+    base_hp: float
+    hp_step: float
+    speed_step: float
+
+
+@dataclass(frozen=True)
+class LevelConfig:
+    """`get_level_config()` without the save-game progress."""
+
+    level_index: int
+    seed: int
+    wave_count: int
+    enemies_per_wave: int
+    enemy_speed: float
+    board: BoardLayout
+    map_mutation: MapMutation
+    layout_profile: LayoutProfile
+    wave_definition: WaveDefinition
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def _pick_edge_tile(rng: GodotRNG, is_spawn: bool) -> Tile:
+    if is_spawn:
+        if rng.randf() < 0.5:
+            return 0, rng.randi_range(0, BOARD_SIZE - 1)
+        return rng.randi_range(0, BOARD_SIZE - 1), 0
+    if rng.randf() < 0.5:
+        return BOARD_SIZE - 1, rng.randi_range(0, BOARD_SIZE - 1)
+    return rng.randi_range(0, BOARD_SIZE - 1), BOARD_SIZE - 1
+
+
+_LATERAL_MOVES: tuple[Tile, ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _shuffled(items: Sequence[Tile], shuffle_rng: GodotRNG) -> list[Tile]:
+    """`Array.shuffle()`: Fisher-Yates driven by the global `Math::rand()`."""
+
+    out = list(items)
+    for i in range(len(out) - 1, 0, -1):
+        j = shuffle_rng.rand() % (i + 1)
+        out[i], out[j] = out[j], out[i]
+    return out
+
+
+def carve_seed_path(spawn_tile: Tile, exit_tile: Tile, rng: GodotRNG, shuffle_rng: GodotRNG) -> tuple[Tile, ...]:
+    """`_carve_seed_path`: biased walk toward the exit with occasional lateral steps."""
+
+    path = [spawn_tile]
+    seen = {spawn_tile}
+    x, y = spawn_tile
+    while (x, y) != exit_tile:
+        options = []
+        if x != exit_tile[0]:
+            options.append((x + (1 if exit_tile[0] > x else -1), y))
+        if y != exit_tile[1]:
+            options.append((x, y + (1 if exit_tile[1] > y else -1)))
+        if rng.randf() < 0.25:
+            for dx, dy in _shuffled(_LATERAL_MOVES, shuffle_rng):
+                if 0 <= x + dx < BOARD_SIZE and 0 <= y + dy < BOARD_SIZE:
+                    options.append((x + dx, y + dy))
+                    break
+        if not options:
+            break
+        x, y = options[rng.randi_range(0, len(options) - 1)]
+        if (x, y) not in seen:
+            seen.add((x, y))
+            path.append((x, y))
+    if path[-1] != exit_tile:
+        path.append(exit_tile)
+    return tuple(path)
+
+
+def _build_tower_nodes(path_set: set[Tile], walls: set[Tile], rng: GodotRNG) -> tuple[tuple[float, float], ...]:
+    """`_build_tower_nodes_from_tiles`: sparse 2x2 sites at least 3 tiles apart."""
+
+    blocked = path_set | walls
+    nodes: list[tuple[float, float]] = []
+    centers: set[Tile] = set()
+    # Centers are integer points, so `distance < 3.0` is `dx*dx + dy*dy < 9`.
+    near = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if dx * dx + dy * dy < 9]
+    for y in range(1, BOARD_SIZE - 2):
+        for x in range(1, BOARD_SIZE - 2):
+            if (x, y) in blocked or (x + 1, y) in blocked or (x, y + 1) in blocked or (x + 1, y + 1) in blocked:
+                continue
+            cx, cy = x + 1, y + 1
+            if any((cx + dx, cy + dy) in centers for dx, dy in near):
+                continue
+            if rng.randf() < 0.08:
+                centers.add((cx, cy))
+                nodes.append((float(cx), float(cy)))
+    return tuple(nodes)
+
+
+def build_board_layout(level_index: int, rng: GodotRNG, shuffle_rng: GodotRNG | None = None) -> BoardLayout:
+    """`_build_board_layout`."""
+
+    shuffle_rng = shuffle_rng or GodotRNG()
+    wall_density = _clamp(
+        rng.randf_range(WALL_MIN_DENSITY, WALL_MAX_DENSITY) + float(level_index) * 0.00005,
+        WALL_MIN_DENSITY,
+        WALL_MAX_DENSITY,
+    )
+    spawn_tile = _pick_edge_tile(rng, True)
+    exit_tile = _pick_edge_tile(rng, False)
+    path_tiles = carve_seed_path(spawn_tile, exit_tile, rng, shuffle_rng)
+    path_set = set(path_tiles)
+
+    walls = []
+    for y in range(BOARD_SIZE):
+        for x in range(BOARD_SIZE):
+            tile = (x, y)
+            if tile in path_set or tile == spawn_tile or tile == exit_tile:
+                continue
+            if rng.randf() < wall_density:
+                walls.append(tile)
+
+    tower_nodes = _build_tower_nodes(path_set, set(walls), rng)
+    return BoardLayout(
+        wall_density=wall_density,
+        spawn_tile=spawn_tile,
+        exit_tile=exit_tile,
+        path_tiles=path_tiles,
+        walls=tuple(walls),
+        tower_nodes=tower_nodes,
+    )
+
+
+def build_map_mutation(level_index: int, rng: GodotRNG) -> MapMutation:
+    """`_build_map_mutation`: one of `MAP_PRESETS`, scaled by level."""
+
+    index = rng.randi_range(0, len(MAP_PRESETS) - 1)
+    preset = MAP_PRESETS[index]
+    return MapMutation(
+        preset_index=index,
+        map_name=str(preset["map_name"]),
+        heat_global_multiplier=preset["heat_global_multiplier"] * (1.0 + float(level_index) * 0.01),
+        enemy_scaling_exponent=preset["enemy_scaling_exponent"] * (1.0 + float(level_index) * 0.02),
+        fog_density=preset["fog_density"],
+        heat_feedback_gain=preset["heat_feedback_gain"],
+        heat_decay_coefficient=preset["heat_decay_coefficient"],
+    )
+
+
+def generate_level(seed: int | str, level_index: int = 0, shuffle_rng: GodotRNG | None = None) -> LevelConfig:
+    """`get_level_config()` for a run seed (or seed label) and level index."""
+
+    run_seed = hash_seed(seed) if isinstance(seed, str) else seed
+    level = _clamp(level_index, MIN_LEVEL_INDEX, MAX_LEVEL_INDEX)
+    rng = GodotRNG(run_seed + level * 101)
+
+    wave_count = _clamp(2 + level // 180, 2, 8)
+    enemies_per_wave = _clamp(6 + level // 45 + rng.randi_range(0, 8), 6, 42)
+    enemy_speed = 105.0 + float(level) * 0.55 + rng.randf_range(-8.0, 8.0)
+    board = build_board_layout(level, rng, shuffle_rng)
+    map_mutation = build_map_mutation(level, rng)
+    layout_profile = LayoutProfile(
+        wall_density=board.wall_density,
+        tower_node_count=rng.randi_range(4, 8),
+        thermal_zone_bias=rng.randf_range(0.7, 1.4),
+        vector_flow_bias=rng.randf_range(-1.0, 1.0),
+        resource_multiplier=1.0 + float(level) * 0.001,
+    )
+    baseline = _clamp(100 + int(level * 1.2), 100, 500)
+    wave_definition = WaveDefinition(
+        creep_count=_clamp(baseline + rng.randi_range(-18, 26), 100, 500),
+        spawn_batch=3,
+        spawn_interval=_clamp(0.18 - float(level) * 0.00009, 0.06, 0.18),
+        base_hp=20.0 + float(level) * 0.85,
+        hp_step=1.8,
+        speed_step=4.0,
+    )
+    return LevelConfig(
+        level_index=level,
+        seed=run_seed,
+        wave_count=wave_count,
+        enemies_per_wave=enemies_per_wave,
+        enemy_speed=enemy_speed,
+        board=board,
+        map_mutation=map_mutation,
+        layout_profile=layout_profile,
+        wave_definition=wave_definition,
+    )
+
+
+# Record: fixed scalars, then path tiles and tower nodes as u8 pairs, then a
+# BOARD_SIZE^2 wall bitmap (row-major, LSB first).
+_RECORD = struct.Struct("<IHBBdd4BBdBdddHdddddHH")
+_WALL_BYTES = BOARD_SIZE * BOARD_SIZE // 8
+
+
+def encode_level(level: LevelConfig) -> bytes:
+    _check_corpus_seed(level.seed)
+    board, mutation, profile, wave = level.board, level.map_mutation, level.layout_profile, level.wave_definition
+    head = _RECORD.pack(
+        level.seed,
+        level.level_index,
+        level.wave_count,
+        level.enemies_per_wave,
+        level.enemy_speed,
+        board.wall_density,
+        *board.spawn_tile,
+        *board.exit_tile,
+        mutation.preset_index,
+        mutation.heat_global_multiplier,
+        profile.tower_node_count,
+        profile.thermal_zone_bias,
+        profile.vector_flow_bias,
+        profile.resource_multiplier,
+        wave.creep_count,
+        wave.spawn_interval,
+        wave.base_hp,
+        wave.hp_step,
+        wave.speed_step,
+        mutation.enemy_scaling_exponent,
+        len(board.path_tiles),
+        len(board.tower_nodes),
+    )
+    path = bytes(v for tile in board.path_tiles for v in tile)
+    nodes = bytes(int(v) for node in board.tower_nodes for v in node)
+    walls = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=bool)
+    for x, y in board.walls:
+        walls[y * BOARD_SIZE + x] = True
+    return head + path + nodes + np.packbits(walls, bitorder="little").tobytes()
+
+
+def decode_level(record: bytes | memoryview) -> LevelConfig:
+    (
+        seed,
+        level_index,
+        wave_count,
+        enemies_per_wave,
+        enemy_speed,
+        wall_density,
+        spawn_x,
+        spawn_y,
+        exit_x,
+        exit_y,
+        preset_index,
+        heat_global_multiplier,
+        tower_node_count,
+        thermal_zone_bias,
+        vector_flow_bias,
+        resource_multiplier,
+        creep_count,
+        spawn_interval,
+        base_hp,
+        hp_step,
+        speed_step,
+        enemy_scaling_exponent,
+        path_count,
+        node_count,
+    ) = _RECORD.unpack_from(record, 0)
+    offset = _RECORD.size
+    raw = bytes(record[offset : offset + 2 * (path_count + node_count) + _WALL_BYTES])
+    path = tuple(zip(raw[0 : 2 * path_count : 2], raw[1 : 2 * path_count : 2]))
+    node_bytes = raw[2 * path_count : 2 * (path_count + node_count)]
+    nodes = tuple((float(x), float(y)) for x, y in zip(node_bytes[0::2], node_bytes[1::2]))
+    bits = np.unpackbits(np.frombuffer(raw[2 * (path_count + node_count) :], dtype=np.uint8), bitorder="little")
+    walls = tuple((int(i) % BOARD_SIZE, int(i) // BOARD_SIZE) for i in np.flatnonzero(bits))
+    preset = MAP_PRESETS[preset_index]
+    return LevelConfig(
+        level_index=level_index,
+        seed=seed,
+        wave_count=wave_count,
+        enemies_per_wave=enemies_per_wave,
+        enemy_speed=enemy_speed,
+        board=BoardLayout(
+            wall_density=wall_density,
+            spawn_tile=(spawn_x, spawn_y),
+            exit_tile=(exit_x, exit_y),
+            path_tiles=path,
+            walls=walls,
+            tower_nodes=nodes,
+        ),
+        map_mutation=MapMutation(
+            preset_index=preset_index,
+            map_name=str(preset["map_name"]),
+            heat_global_multiplier=heat_global_multiplier,
+            enemy_scaling_exponent=enemy_scaling_exponent,
+            fog_density=preset["fog_density"],
+            heat_feedback_gain=preset["heat_feedback_gain"],
+            heat_decay_coefficient=preset["heat_decay_coefficient"],
+        ),
+        layout_profile=LayoutProfile(
+            wall_density=wall_density,
+            tower_node_count=tower_node_count,
+            thermal_zone_bias=thermal_zone_bias,
+            vector_flow_bias=vector_flow_bias,
+            resource_multiplier=resource_multiplier,
+        ),
+        wave_definition=WaveDefinition(
+            creep_count=creep_count,
+            spawn_batch=3,
+            spawn_interval=spawn_interval,
+            base_hp=base_hp,
+            hp_step=hp_step,
+            speed_step=speed_step,
+        ),
+    )
+
+
+MAGIC = b"XDXLVLS1"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+
+
+def corpus_key(seed: int, level_index: int) -> int:
+    """Nonzero table key; 0 marks an empty slot."""
+
+    return (seed << 10 | level_index) + 1
+
+
+def _check_corpus_seed(run_seed: int) -> int:
+    if not 0 <= run_seed <= 0xFFFFFFFF:
+        raise ValueError(f"corpus run seeds must fit in u32, got {run_seed}")
+    return run_seed
+
+
+def _corpus_lookup_key(seed: int | str, level_index: int) -> tuple[int, int]:
+    run_seed = hash_seed(seed) if isinstance(seed, str) else seed
+    return _check_corpus_seed(run_seed), _clamp(level_index, MIN_LEVEL_INDEX, MAX_LEVEL_INDEX)
+
+
+def _slot(key: int, bits: int) -> int:
+    return ((key * 0x9E3779B97F4A7C15) & _MASK64) >> (64 - bits)
+
+
+def _generate_chunk(chunk: Sequence[tuple[int | str, int]]) -> list[bytes]:
+    return [encode_level(generate_level(seed, level)) for seed, level in chunk]
+
+
+def write_level_corpus(
+    path: str | Path,
+    seeds: Iterable[int | str],
+    level_indices: Sequence[int] = (0,),
+    *,
+    max_workers: int | None = None,
+    chunk_size: int = 32,
+) -> int:
+    """Generate every `(seed, level_index)` and write an indexed corpus.
+
+    Records are written in input order whatever the worker count, so the
+    file is byte-identical across runs. `max_workers=1` generates inline.
+    Returns the number of levels written; duplicate keys are rejected.
+    """
+
+    jobs = [(seed, level) for seed in seeds for level in level_indices]
+    for seed, level in jobs:
+        _corpus_lookup_key(seed, level)
+    chunks = [jobs[i : i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    if max_workers == 1:
+        encoded = [record for chunk in chunks for record in _generate_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            encoded = [record for records in pool.map(_generate_chunk, chunks) for record in records]
+
+    bits = max(4, (2 * len(encoded) - 1).bit_length())
+    table = np.zeros((1 << bits, 3), dtype="<u8")
+    offset = _HEADER.size
+    body = []
+    for record in encoded:
+        seed, level_index = struct.unpack_from("<IH", record, 0)
+        key = corpus_key(seed, level_index)
+        slot = _slot(key, bits)
+        while table[slot, 0]:
+            if table[slot, 0] == key:
+                raise ValueError(f"duplicate level (seed {seed}, level {level_index}) in corpus")
+            slot = (slot + 1) & ((1 << bits) - 1)
+        table[slot] = (key, offset, len(record))
+        body.append(record)
+        offset += len(record)
+
+    table_offset = (offset + 7) & ~7
+    with open(path, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, len(encoded), 1 << bits, table_offset))
+        handle.writelines(body)
+        handle.write(b"\0" * (table_offset - offset))
+        handle.write(table.tobytes())
+    return len(encoded)
+
+
+class LevelCorpus:
+    """Memory-mapped level corpus with O(1) lookup by seed and level."""
+
+    def __init__(self, buffer: np.ndarray | bytes) -> None:
+        self._buffer = np.frombuffer(buffer, dtype=np.uint8) if isinstance(buffer, (bytes, bytearray)) else buffer
+        magic, version, count, slots, table_offset = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} XODEX level corpus")
+        self._count = count
+        self._bits = slots.bit_length() - 1
+        self._table = self._buffer[table_offset : table_offset + slots * 24].view("<u8").reshape(slots, 3)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "LevelCorpus":
+        return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, tuple):
+            return False
+        try:
+            return self._find(*_corpus_lookup_key(*key)) is not None
+        except ValueError:
+            return False
+
+    def keys(self) -> list[tuple[int, int]]:
+        """`(seed, level_index)` pairs in table order."""
+
+        used = self._table[self._table[:, 0] != 0, 0] - 1
+        return [(int(k) >> 10, int(k) & 0x3FF) for k in used]
+
+    def get(self, seed: int | str, level_index: int = 0) -> LevelConfig:
+        """The stored `generate_level(seed, level_index)`; KeyError if absent."""
+
+        run_seed, level = _corpus_lookup_key(seed, level_index)
+        found = self._find(run_seed, level)
+        if found is None:
+            raise KeyError((run_seed, level))
+        offset, length = found
+        return decode_level(memoryview(self._buffer[offset : offset + length]))
+
+    def _find(self, seed: int, level_index: int) -> tuple[int, int] | None:
+        key = corpus_key(seed, level_index)
+        mask = (1 << self._bits) - 1
+        slot = _slot(key, self._bits)
+        while True:
+            stored = int(self._table[slot, 0])
+            if stored == 0:
+                return None
+            if stored == key:
+                return int(self._table[slot, 1]), int(self._table[slot, 2])
+            slot = (slot + 1) & mask
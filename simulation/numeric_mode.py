@@ -0,0 +1,98 @@
+"""Numeric representations for the batched thermal and Protein engines.
+
+The scalar references compute in Python floats (float64). The batched engines
+can instead hold all state and parameter arrays in one of:
+
+- `FLOAT64`: the default; matches the scalar reference.
+- `FLOAT32`: single precision, as the Godot build runs on device. Half the
+  memory of float64 and twice the values per SIMD lane.
+- `FIXED`: signed Q16.16 fixed point in int32. Addition, subtraction and
+  comparisons are exact; products are taken in int64 and shifted back, which
+  rounds toward negative infinity. Values must stay within +/-32767.
+
+A mode is identified by its storage dtype, so the engines recover it from
+their state arrays with `mode_of` instead of threading it through every call.
+Values are converted at the edges with `encode` (real -> storage) and
+`decode` (storage -> float64).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class NumericMode:
+    name: str
+    dtype: np.dtype
+    fraction_bits: int = 0
+
+    @property
+    def is_fixed(self) -> bool:
+        return self.fraction_bits > 0
+
+    def encode(self, values: object) -> np.ndarray:
+        """Real values to storage; arrays already in this mode's dtype pass through."""
+
+        if isinstance(values, np.ndarray) and values.dtype == self.dtype:
+            return values
+        if not self.is_fixed:
+            return np.asarray(values, dtype=self.dtype)
+        scaled = np.rint(np.asarray(values, dtype=np.float64) * (1 << self.fraction_bits))
+        return scaled.astype(self.dtype)
+
+    def decode(self, values: np.ndarray) -> np.ndarray:
+        if not self.is_fixed:
+            return np.asarray(values, dtype=np.float64)
+        return np.asarray(values, dtype=np.float64) / (1 << self.fraction_bits)
+
+    def const(self, value: float) -> float | np.generic:
+        """A scalar constant that keeps array arithmetic in this mode's dtype.
+
+        Float64 returns the plain Python float so float64 expressions are the
+        same operations the scalar reference performs.
+        """
+
+        if self.dtype == np.float64:
+            return float(value)
+        return self.encode(value)[()]
+
+    def mul(self, a: object, b: object) -> np.ndarray:
+        """Product of two values in this mode's representation."""
+
+        if not self.is_fixed:
+            return np.multiply(a, b)
+        wide = np.multiply(a, b, dtype=np.int64) >> self.fraction_bits
+        return wide.astype(self.dtype)
+
+    def mean(self, values: np.ndarray, axis: tuple[int, ...]) -> np.ndarray:
+        count = max(1, int(np.prod([values.shape[a] for a in axis])))
+        if not self.is_fixed:
+            return values.sum(axis=axis) / count
+        return (values.sum(axis=axis, dtype=np.int64) // count).astype(self.dtype)
+
+
+FLOAT64 = NumericMode("float64", np.dtype(np.float64))
+FLOAT32 = NumericMode("float32", np.dtype(np.float32))
+FIXED = NumericMode("fixed", np.dtype(np.int32), fraction_bits=16)
+NUMERIC_MODES = {mode.name: mode for mode in (FLOAT64, FLOAT32, FIXED)}
+
+
+def numeric_mode(mode: NumericMode | str) -> NumericMode:
+    if isinstance(mode, NumericMode):
+        return mode
+    try:
+        return NUMERIC_MODES[mode]
+    except KeyError:
+        raise ValueError(f"unknown numeric mode {mode!r}; expected one of {sorted(NUMERIC_MODES)}") from None
+
+
+def mode_of(values: np.ndarray) -> NumericMode:
+    """The mode whose storage dtype `values` uses."""
+
+    for mode in NUMERIC_MODES.values():
+        if values.dtype == mode.dtype:
+            return mode
+    raise ValueError(f"no numeric mode stores values as {values.dtype}")
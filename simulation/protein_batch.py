@@ -0,0 +1,183 @@
+"""Batched XODEX.PROTEIN_TOWER stepping for whole tower fleets.
+
+State is kept as struct-of-arrays (one float/bool column per field) and local
+flow windows as stacked (N, H, W) arrays, so a fleet tick is a handful of
+NumPy passes instead of N calls to `step_protein_tower`.
+
+The fleet state may be held in any `simulation.numeric_mode` mode; a tick
+runs in the mode of `state.theta`, and float64 inputs (window means, escape
+energy) are encoded into it on entry.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from simulation.numeric_mode import FLOAT64, NumericMode, mode_of, numeric_mode
+from simulation.protein_tower import ProteinTowerConfig, ProteinTowerState
+from simulation.wave_tables import adaptation_rate_at, alpha_at
+
+
+@dataclass(frozen=True)
+class ProteinFleetState:
+    """Struct-of-arrays counterpart of a list of `ProteinTowerState`."""
+
+    theta: np.ndarray
+    heat: np.ndarray
+    collapsed: np.ndarray
+
+    @classmethod
+    def from_states(
+        cls, states: Sequence[ProteinTowerState], mode: NumericMode | str = FLOAT64
+    ) -> "ProteinFleetState":
+        mode = numeric_mode(mode)
+        return cls(
+            theta=mode.encode([s.theta for s in states]),
+            heat=mode.encode([s.heat for s in states]),
+            collapsed=np.array([s.collapsed for s in states], dtype=bool),
+        )
+
+    def to_states(self) -> list[ProteinTowerState]:
+        mode = self.mode
+        theta = mode.decode(self.theta).tolist()
+        heat = mode.decode(self.heat).tolist()
+        return [
+            ProteinTowerState(theta=t, heat=h, collapsed=collapsed)
+            for t, h, collapsed in zip(theta, heat, self.collapsed.tolist())
+        ]
+
+    def __len__(self) -> int:
+        return len(self.theta)
+
+    @property
+    def mode(self) -> NumericMode:
+        return mode_of(self.theta)
+
+
+@dataclass(frozen=True)
+class ProteinFleetTick:
+    """Per-tower arrays mirroring the fields of `ProteinTickResult`."""
+
+    state: ProteinFleetState
+    disruption_field: np.ndarray
+    curvature: np.ndarray
+    damage: np.ndarray
+
+
+def alpha_for_waves(wave_index: int | np.ndarray, config: ProteinTowerConfig) -> np.ndarray:
+    """Vectorized `alpha_for_wave`, read from the cached wave table."""
+
+    return alpha_at(wave_index, config)
+
+
+def adaptation_rate_for_waves(wave_index: int | np.ndarray, config: ProteinTowerConfig) -> np.ndarray:
+    """Vectorized `adaptation_rate_for_wave`, read from the cached wave table."""
+
+    return adaptation_rate_at(wave_index, config)
+
+
+def center_laplacians(grids: np.ndarray) -> np.ndarray:
+    """`_center_laplacian` for each (H, W) window of an (N, H, W) stack."""
+
+    _, rows, cols = grids.shape
+    if rows < 3 or cols < 3:
+        return np.zeros(grids.shape[0], dtype=grids.dtype)
+    cx = rows // 2
+    cy = cols // 2
+    return (
+        grids[:, cx - 1, cy]
+        + grids[:, cx + 1, cy]
+        + grids[:, cx, cy - 1]
+        + grids[:, cx, cy + 1]
+        - 4 * grids[:, cx, cy]
+    )
+
+
+def step_protein_fleet_from_fields(
+    state: ProteinFleetState,
+    density_mean: np.ndarray,
+    speed_mean: np.ndarray,
+    wall_mean: np.ndarray,
+    center_laplacian: np.ndarray,
+    wave_index: int | np.ndarray,
+    realized_escape_energy: float | np.ndarray,
+    config: ProteinTowerConfig = ProteinTowerConfig(),
+) -> ProteinFleetTick:
+    """Fleet tick from precomputed window statistics.
+
+    This is the shared core of `step_protein_fleet`; callers that already
+    hold windowed means and center curvature (for example from a map-level
+    field engine) can skip the (N, H, W) window stack entirely.
+    """
+
+    mode = state.mode
+    mul, const = mode.mul, mode.const
+    density_mean, speed_mean, wall_mean, center_laplacian, escape = (
+        mode.encode(values) for values in (density_mean, speed_mean, wall_mean, center_laplacian, realized_escape_energy)
+    )
+    alpha = mode.encode(alpha_for_waves(wave_index, config))
+    adaptation_rate = mode.encode(adaptation_rate_for_waves(wave_index, config))
+    heat_decay = const(config.heat_decay_per_tick)
+    active = ~state.collapsed
+
+    drive = mul(const(1.5), density_mean) + mul(const(0.6), speed_mean) + mul(const(0.4), wall_mean)
+    disruption = mul(state.theta, drive)
+    curvature = np.abs(center_laplacian)
+    damage = mul(mul(alpha, curvature), disruption)
+
+    error = disruption - escape
+    next_theta = np.maximum(0, state.theta + mul(adaptation_rate, error))
+    next_heat = np.maximum(0, state.heat + mul(const(config.heat_per_tick), disruption) - heat_decay)
+    now_collapsed = next_heat > const(config.instability_threshold)
+
+    # Collapsed towers only cool; they recover once under half the threshold.
+    cooled = np.maximum(0, state.heat - heat_decay)
+    still_collapsed = ~(cooled < const(config.instability_threshold * 0.5))
+
+    next_state = ProteinFleetState(
+        theta=np.where(active, next_theta, state.theta),
+        heat=np.where(active, next_heat, cooled),
+        collapsed=np.where(active, now_collapsed, still_collapsed),
+    )
+    return ProteinFleetTick(
+        state=next_state,
+        disruption_field=np.where(active, disruption, 0),
+        curvature=np.where(active, curvature, 0),
+        damage=np.where(active & ~now_collapsed, damage, 0),
+    )
+
+
+def step_protein_fleet(
+    state: ProteinFleetState,
+    creep_density: np.ndarray,
+    flow_speed: np.ndarray,
+    wall_block: np.ndarray,
+    wave_index: int | np.ndarray,
+    realized_escape_energy: float | np.ndarray,
+    config: ProteinTowerConfig = ProteinTowerConfig(),
+) -> ProteinFleetTick:
+    """Vectorized `step_protein_tower` over stacked (N, H, W) local windows."""
+
+    mode = state.mode
+    creep_density = mode.encode(np.asarray(creep_density, dtype=np.float64))
+    flow_speed = mode.encode(np.asarray(flow_speed, dtype=np.float64))
+    wall_block = mode.encode(np.asarray(wall_block, dtype=np.float64))
+    expected = (len(state),)
+    for name, grids in (("creep_density", creep_density), ("flow_speed", flow_speed), ("wall_block", wall_block)):
+        if grids.ndim != 3 or grids.shape[:1] != expected:
+            raise ValueError(f"{name} must be shaped ({len(state)}, H, W), got {grids.shape}")
+
+    return step_protein_fleet_from_fields(
+        state,
+        density_mean=mode.mean(creep_density, axis=(1, 2)),
+        speed_mean=mode.mean(flow_speed, axis=(1, 2)),
+        wall_mean=mode.mean(wall_block, axis=(1, 2)),
+        center_laplacian=center_laplacians(creep_density),
+        wave_index=wave_index,
+        realized_escape_energy=realized_escape_energy,
+        config=config,
+    )
+
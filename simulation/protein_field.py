@@ -0,0 +1,176 @@
+"""Map-level field precomputation for XODEX.PROTEIN_TOWER fleets.
+
+Instead of copying a `LocalFlowState` window per tower, one full-map raster of
+creep density, flow speed and wall blocking is summarized per tick into
+summed-area tables plus a map-wide Laplacian stencil. Any tower window's means
+and center curvature are then O(1) lookups, so per-tick cost scales with map
+size rather than towers x window area.
+
+Rasters are indexed `[y, x]`; a tower window of side `size` centered on a
+`TowerPlacement` covers rows `y - size // 2` onward and is clipped at the map
+edge exactly like slicing the raster would clip it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from simulation.protein_batch import ProteinFleetState, ProteinFleetTick, step_protein_fleet_from_fields
+from simulation.protein_tower import ProteinTowerConfig, TowerPlacement
+
+
+@dataclass(frozen=True)
+class TowerWindows:
+    """Clipped map windows for a fleet, as half-open row/column bounds."""
+
+    row_start: np.ndarray
+    row_stop: np.ndarray
+    col_start: np.ndarray
+    col_stop: np.ndarray
+
+    @classmethod
+    def centered(
+        cls,
+        placements: Sequence[TowerPlacement],
+        map_shape: tuple[int, int],
+        size: int = ProteinTowerConfig().local_sample_size,
+    ) -> "TowerWindows":
+        xs = np.array([p.x for p in placements], dtype=np.int64)
+        ys = np.array([p.y for p in placements], dtype=np.int64)
+        return cls.from_corners(ys - size // 2, xs - size // 2, map_shape, size)
+
+    @classmethod
+    def from_corners(
+        cls, tops: np.ndarray, lefts: np.ndarray, map_shape: tuple[int, int], size: int
+    ) -> "TowerWindows":
+        rows, cols = map_shape
+        tops = np.asarray(tops, dtype=np.int64)
+        lefts = np.asarray(lefts, dtype=np.int64)
+        return cls(
+            row_start=np.clip(tops, 0, rows),
+            row_stop=np.clip(tops + size, 0, rows),
+            col_start=np.clip(lefts, 0, cols),
+            col_stop=np.clip(lefts + size, 0, cols),
+        )
+
+    def __len__(self) -> int:
+        return len(self.row_start)
+
+
+@dataclass(frozen=True)
+class ProteinFieldFrame:
+    """One tick of map-wide field summaries."""
+
+    density_table: np.ndarray
+    speed_table: np.ndarray
+    wall_table: np.ndarray
+    density_laplacian: np.ndarray
+
+    @classmethod
+    def from_rasters(
+        cls, creep_density: np.ndarray, flow_speed: np.ndarray, wall_block: np.ndarray
+    ) -> "ProteinFieldFrame":
+        density = np.asarray(creep_density, dtype=np.float64)
+        speed = np.asarray(flow_speed, dtype=np.float64)
+        wall = np.asarray(wall_block, dtype=np.float64)
+        if density.ndim != 2 or speed.shape != density.shape or wall.shape != density.shape:
+            raise ValueError(
+                f"rasters must share one 2-D shape, got {density.shape}, {speed.shape}, {wall.shape}"
+            )
+        return cls(
+            density_table=summed_area_table(density),
+            speed_table=summed_area_table(speed),
+            wall_table=summed_area_table(wall),
+            density_laplacian=laplacian_stencil(density),
+        )
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        rows, cols = self.density_table.shape
+        return rows - 1, cols - 1
+
+    def window_means(self, windows: TowerWindows) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Mean density, speed and wall blocking over each window."""
+
+        cells = (windows.row_stop - windows.row_start) * (windows.col_stop - windows.col_start)
+        divisor = np.maximum(1, cells)
+        return (
+            _window_sums(self.density_table, windows) / divisor,
+            _window_sums(self.speed_table, windows) / divisor,
+            _window_sums(self.wall_table, windows) / divisor,
+        )
+
+    def center_laplacians(self, windows: TowerWindows) -> np.ndarray:
+        """Density Laplacian at each window center; zero for windows under 3x3."""
+
+        rows, cols = self.shape
+        if rows == 0 or cols == 0:
+            return np.zeros(len(windows), dtype=np.float64)
+        heights = windows.row_stop - windows.row_start
+        widths = windows.col_stop - windows.col_start
+        valid = (heights >= 3) & (widths >= 3)
+        # Clipping only guards empty windows at the map edge; those are masked out.
+        centers_y = np.clip(windows.row_start + heights // 2, 0, rows - 1)
+        centers_x = np.clip(windows.col_start + widths // 2, 0, cols - 1)
+        return np.where(valid, self.density_laplacian[centers_y, centers_x], 0.0)
+
+
+def summed_area_table(raster: np.ndarray) -> np.ndarray:
+    """Zero-padded (H + 1, W + 1) inclusive prefix sums of `raster`."""
+
+    table = np.zeros((raster.shape[0] + 1, raster.shape[1] + 1), dtype=np.float64)
+    np.cumsum(raster, axis=0, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+
+def laplacian_stencil(raster: np.ndarray) -> np.ndarray:
+    """Five-point Laplacian of every interior cell; border cells stay zero.
+
+    Window centers are always interior when the window is at least 3x3, so
+    the border never feeds a tower's curvature.
+    """
+
+    out = np.zeros_like(raster, dtype=np.float64)
+    if raster.shape[0] >= 3 and raster.shape[1] >= 3:
+        out[1:-1, 1:-1] = (
+            raster[:-2, 1:-1] + raster[2:, 1:-1] + raster[1:-1, :-2] + raster[1:-1, 2:] - 4.0 * raster[1:-1, 1:-1]
+        )
+    return out
+
+
+def _window_sums(table: np.ndarray, windows: TowerWindows) -> np.ndarray:
+    return (
+        table[windows.row_stop, windows.col_stop]
+        - table[windows.row_start, windows.col_stop]
+        - table[windows.row_stop, windows.col_start]
+        + table[windows.row_start, windows.col_start]
+    )
+
+
+def step_protein_fleet_on_map(
+    state: ProteinFleetState,
+    frame: ProteinFieldFrame,
+    windows: TowerWindows,
+    wave_index: int | np.ndarray,
+    realized_escape_energy: float | np.ndarray,
+    config: ProteinTowerConfig = ProteinTowerConfig(),
+) -> ProteinFleetTick:
+    """Fleet tick reading every tower's window statistics from one map frame."""
+
+    if len(windows) != len(state):
+        raise ValueError(f"expected {len(state)} tower windows, got {len(windows)}")
+    density_mean, speed_mean, wall_mean = frame.window_means(windows)
+    return step_protein_fleet_from_fields(
+        state,
+        density_mean=density_mean,
+        speed_mean=speed_mean,
+        wall_mean=wall_mean,
+        center_laplacian=frame.center_laplacians(windows),
+        wave_index=wave_index,
+        realized_escape_energy=realized_escape_energy,
+        config=config,
+    )
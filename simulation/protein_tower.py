@@ -9,8 +9,8 @@ This module includes:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from math import dist
-from typing import Iterable, Sequence
+from math import ceil, dist
+from typing import Iterable, Iterator, Sequence
 
 
 Grid = Sequence[Sequence[float]]
@@ -32,14 +32,14 @@ class ProteinTowerConfig:
     instability_threshold: float = 12.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProteinTowerState:
     theta: float = 0.5
     heat: float = 0.0
     collapsed: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TokenTowerState:
     path_probability_bias: float = 0.5
     prediction_depth: int = 3
@@ -60,7 +60,7 @@ class ProteinTickResult:
     damage: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TowerPlacement:
     x: int
     y: int
@@ -196,26 +196,318 @@ def detect_protein_patterns(placements: Sequence[TowerPlacement]) -> ProteinPatt
     )
 
 
+class ProteinPatternIndex:
+    """Incrementally maintained `detect_protein_patterns` summary.
+
+    Each insertion or removal only re-examines the 3x3 chain neighborhood,
+    the four 2x2 lattice anchors and the four ring anchors touching the tile,
+    plus a running count of occupied row pairs at most two rows apart (which
+    is what the sorted-row fiber-bundle scan reduces to). Duplicate
+    placements on one tile are counted like the batch function counts them.
+    """
+
+    def __init__(self, placements: Iterable[TowerPlacement] = ()) -> None:
+        self._tiles: dict[tuple[int, int], int] = {}
+        self._rows: dict[int, int] = {}
+        self._chain_count = 0
+        self._lattice_count = 0
+        self._ring_count = 0
+        self._close_row_pairs = 0
+        for placement in placements:
+            self.add(placement)
+
+    def __len__(self) -> int:
+        return sum(self._tiles.values())
+
+    def __contains__(self, placement: object) -> bool:
+        return isinstance(placement, TowerPlacement) and (placement.x, placement.y) in self._tiles
+
+    @property
+    def summary(self) -> ProteinPatternSummary:
+        return ProteinPatternSummary(
+            chain_count=self._chain_count,
+            lattice_count=self._lattice_count,
+            ring_count=self._ring_count,
+            fiber_bundle_active=self._close_row_pairs > 0 and self._chain_count >= 2,
+        )
+
+    def add(self, placement: TowerPlacement) -> None:
+        self._update(placement.x, placement.y, 1)
+
+    def remove(self, placement: TowerPlacement) -> None:
+        if (placement.x, placement.y) not in self._tiles:
+            raise ValueError(f"no Protein tower at {placement}")
+        self._update(placement.x, placement.y, -1)
+
+    def _update(self, x: int, y: int, delta: int) -> None:
+        count = self._tiles.get((x, y), 0)
+        if count + delta > 0 and count > 0:
+            # Tile stays occupied: only this tile's own chain weight changes.
+            self._tiles[(x, y)] = count + delta
+            if self._is_chain(x, y):
+                self._chain_count += delta
+            self._rows[y] += delta
+            return
+
+        chain_tiles = [(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+        lattice_anchors = [(x - dx, y - dy) for dx in (0, 1) for dy in (0, 1)]
+        ring_anchors = [(x - dx, y - dy) for dx in (0, 2) for dy in (0, 2)]
+
+        self._chain_count -= self._chain_weight(chain_tiles)
+        self._lattice_count -= sum(self._square(ax, ay, 1) for ax, ay in lattice_anchors)
+        self._ring_count -= sum(self._square(ax, ay, 2) for ax, ay in ring_anchors)
+        if delta > 0:
+            self._tiles[(x, y)] = delta
+        else:
+            del self._tiles[(x, y)]
+        self._chain_count += self._chain_weight(chain_tiles)
+        self._lattice_count += sum(self._square(ax, ay, 1) for ax, ay in lattice_anchors)
+        self._ring_count += sum(self._square(ax, ay, 2) for ax, ay in ring_anchors)
+
+        row_count = self._rows.get(y, 0) + delta
+        if row_count > 0:
+            self._rows[y] = row_count
+        else:
+            del self._rows[y]
+        if (row_count > 0) != (row_count - delta > 0):
+            close = sum(1 for offset in (-2, -1, 1, 2) if y + offset in self._rows)
+            self._close_row_pairs += close if row_count > 0 else -close
+
+    def _is_chain(self, x: int, y: int) -> bool:
+        points = self._tiles
+        return (
+            ((x - 1, y) in points and (x + 1, y) in points)
+            or ((x, y - 1) in points and (x, y + 1) in points)
+            or ((x - 1, y - 1) in points and (x + 1, y + 1) in points)
+            or ((x - 1, y + 1) in points and (x + 1, y - 1) in points)
+        )
+
+    def _chain_weight(self, tiles: Iterable[tuple[int, int]]) -> int:
+        return sum(self._tiles[tile] for tile in tiles if tile in self._tiles and self._is_chain(*tile))
+
+    def _square(self, x: int, y: int, step: int) -> int:
+        points = self._tiles
+        return int(
+            (x, y) in points and (x + step, y) in points and (x, y + step) in points and (x + step, y + step) in points
+        )
+
+
+@dataclass(frozen=True)
+class ProteinNeighborIndex:
+    """Coupling-range neighbor lists for one placement layout.
+
+    Built with a uniform grid hash whose cells are `coupling_range_tiles`
+    wide, so each tower only tests the 3x3 block of cells around it. Neighbor
+    lists are kept in ascending tower order to preserve the summation order of
+    the pairwise coupling loop. Rebuild only when the layout changes.
+    """
+
+    placements: tuple[TowerPlacement, ...]
+    coupling_range_tiles: float
+    neighbors: tuple[tuple[int, ...], ...]
+
+    @classmethod
+    def build(cls, placements: Sequence[TowerPlacement], coupling_range_tiles: float = 3.0) -> "ProteinNeighborIndex":
+        layout = tuple(placements)
+        cell = max(1, ceil(coupling_range_tiles))
+        buckets: dict[tuple[int, int], list[int]] = {}
+        for index, p in enumerate(layout):
+            buckets.setdefault((p.x // cell, p.y // cell), []).append(index)
+
+        neighbors: list[tuple[int, ...]] = []
+        for i, p in enumerate(layout):
+            cx, cy = p.x // cell, p.y // cell
+            found = [
+                j
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                for j in buckets.get((cx + dx, cy + dy), ())
+                if j != i and dist((p.x, p.y), (layout[j].x, layout[j].y)) <= coupling_range_tiles
+            ]
+            neighbors.append(tuple(sorted(found)))
+        return cls(placements=layout, coupling_range_tiles=coupling_range_tiles, neighbors=tuple(neighbors))
+
+
+class ProteinClusterTracker:
+    """Connected components of coupled Protein towers with running theta sums.
+
+    Two towers are coupled when they lie within `coupling_range_tiles` of
+    each other (the `ProteinNeighborIndex` rule); a cluster is a connected
+    component of that relation. Components are kept in a union-find forest
+    (union by size, path compression) over a grid hash of tiles, and each
+    root carries its component's theta sum, so `is_collapsed` is a root
+    lookup instead of a rescan. Union-find cannot split, so a removal
+    re-unions only the members of the removed tower's component.
+
+    Theta updates adjust the sums by difference; call `resync` after very
+    long runs if accumulated rounding matters.
+    """
+
+    def __init__(
+        self,
+        placements: Iterable[TowerPlacement] = (),
+        states: Iterable[ProteinTowerState] | None = None,
+        coupling_range_tiles: float = 3.0,
+    ) -> None:
+        self.coupling_range_tiles = coupling_range_tiles
+        self._cell = max(1, ceil(coupling_range_tiles))
+        self._buckets: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self._theta: dict[tuple[int, int], float] = {}
+        self._parent: dict[tuple[int, int], tuple[int, int]] = {}
+        self._members: dict[tuple[int, int], set[tuple[int, int]]] = {}
+        self._sum: dict[tuple[int, int], float] = {}
+        placements = list(placements)
+        thetas = [s.theta for s in states] if states is not None else [ProteinTowerState().theta] * len(placements)
+        if len(thetas) != len(placements):
+            raise ValueError(f"expected {len(placements)} tower states, got {len(thetas)}")
+        for placement, theta in zip(placements, thetas):
+            self.add(placement, theta)
+
+    def __len__(self) -> int:
+        return len(self._theta)
+
+    def __contains__(self, placement: object) -> bool:
+        return isinstance(placement, TowerPlacement) and (placement.x, placement.y) in self._theta
+
+    @property
+    def cluster_count(self) -> int:
+        return len(self._members)
+
+    def add(self, placement: TowerPlacement, theta: float = ProteinTowerState().theta) -> None:
+        tile = (placement.x, placement.y)
+        if tile in self._theta:
+            raise ValueError(f"a Protein tower is already tracked at {placement}")
+        self._buckets.setdefault(self._bucket(tile), []).append(tile)
+        self._theta[tile] = theta
+        self._make_set(tile)
+        for other in self._coupled(tile):
+            self._union(tile, other)
+
+    def remove(self, placement: TowerPlacement) -> None:
+        tile = (placement.x, placement.y)
+        if tile not in self._theta:
+            raise ValueError(f"no Protein tower at {placement}")
+        root = self._find(tile)
+        members = self._members.pop(root)
+        del self._sum[root]
+        members.discard(tile)
+        self._buckets[self._bucket(tile)].remove(tile)
+        del self._theta[tile]
+        del self._parent[tile]
+
+        # Every coupled neighbor of a survivor was in the same component.
+        for member in members:
+            self._make_set(member)
+        for member in members:
+            for other in self._coupled(member):
+                self._union(member, other)
+
+    def set_theta(self, placement: TowerPlacement, theta: float) -> None:
+        tile = (placement.x, placement.y)
+        if tile not in self._theta:
+            raise ValueError(f"no Protein tower at {placement}")
+        self._sum[self._find(tile)] += theta - self._theta[tile]
+        self._theta[tile] = theta
+
+    def update_states(self, placements: Sequence[TowerPlacement], states: Sequence[ProteinTowerState]) -> None:
+        """Record this tick's theta for each tower (e.g. after coupling)."""
+
+        for placement, state in zip(placements, states):
+            self.set_theta(placement, state.theta)
+
+    def resync(self) -> None:
+        """Recompute every running sum from the per-tower thetas."""
+
+        for root, members in self._members.items():
+            self._sum[root] = sum(self._theta[tile] for tile in members)
+
+    def cluster_theta(self, placement: TowerPlacement) -> float:
+        return self._sum[self._find((placement.x, placement.y))]
+
+    def cluster_of(self, placement: TowerPlacement) -> frozenset[TowerPlacement]:
+        members = self._members[self._find((placement.x, placement.y))]
+        return frozenset(TowerPlacement(x, y) for x, y in members)
+
+    def clusters(self) -> list[frozenset[TowerPlacement]]:
+        return [frozenset(TowerPlacement(x, y) for x, y in members) for members in self._members.values()]
+
+    def is_collapsed(self, placement: TowerPlacement, theta_critical: float) -> bool:
+        """`overcoupled_cluster_collapsed` for the cluster containing `placement`."""
+
+        return self.cluster_theta(placement) > theta_critical
+
+    def collapsed_clusters(self, theta_critical: float) -> list[frozenset[TowerPlacement]]:
+        return [
+            frozenset(TowerPlacement(x, y) for x, y in self._members[root])
+            for root, total in self._sum.items()
+            if total > theta_critical
+        ]
+
+    def _bucket(self, tile: tuple[int, int]) -> tuple[int, int]:
+        return tile[0] // self._cell, tile[1] // self._cell
+
+    def _coupled(self, tile: tuple[int, int]) -> Iterator[tuple[int, int]]:
+        cx, cy = self._bucket(tile)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for other in self._buckets.get((cx + dx, cy + dy), ()):
+                    if other != tile and dist(tile, other) <= self.coupling_range_tiles:
+                        yield other
+
+    def _make_set(self, tile: tuple[int, int]) -> None:
+        self._parent[tile] = tile
+        self._members[tile] = {tile}
+        self._sum[tile] = self._theta[tile]
+
+    def _find(self, tile: tuple[int, int]) -> tuple[int, int]:
+        parent = self._parent
+        root = tile
+        while parent[root] != root:
+            root = parent[root]
+        while parent[tile] != root:
+            parent[tile], tile = root, parent[tile]
+        return root
+
+    def _union(self, a: tuple[int, int], b: tuple[int, int]) -> None:
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        if len(self._members[a]) < len(self._members[b]):
+            a, b = b, a
+        self._parent[b] = a
+        self._members[a] |= self._members.pop(b)
+        self._sum[a] += self._sum.pop(b)
+
+
 def synthesize_protein_cluster(
     tower_states: Sequence[ProteinTowerState],
     placements: Sequence[TowerPlacement],
     coupling_eta: float = 0.08,
     coupling_range_tiles: float = 3.0,
     coupling_heat_gain: float = 0.15,
+    neighbor_index: ProteinNeighborIndex | None = None,
 ) -> list[ProteinTowerState]:
-    """Gradient-sharing update: Theta_i <- Theta_i + eta*(Theta_j - Theta_i)."""
+    """Gradient-sharing update: Theta_i <- Theta_i + eta*(Theta_j - Theta_i).
+
+    Pass a prebuilt `neighbor_index` to reuse it across ticks while the
+    placement layout is unchanged.
+    """
+
+    if neighbor_index is None:
+        neighbor_index = ProteinNeighborIndex.build(placements, coupling_range_tiles)
+    elif (
+        neighbor_index.coupling_range_tiles != coupling_range_tiles
+        or neighbor_index.placements != tuple(placements)
+        or len(neighbor_index.neighbors) != len(tower_states)
+    ):
+        raise ValueError("neighbor_index was built for a different layout or coupling range")
 
     next_states: list[ProteinTowerState] = []
-    for i, state_i in enumerate(tower_states):
+    for state_i, neighbors in zip(tower_states, neighbor_index.neighbors):
         blended_theta = state_i.theta
-        neighbors = 0
-        for j, state_j in enumerate(tower_states):
-            if i == j:
-                continue
-            if dist((placements[i].x, placements[i].y), (placements[j].x, placements[j].y)) <= coupling_range_tiles:
-                blended_theta += coupling_eta * (state_j.theta - state_i.theta)
-                neighbors += 1
-        heat_delta = coupling_heat_gain * neighbors
+        for j in neighbors:
+            blended_theta += coupling_eta * (tower_states[j].theta - state_i.theta)
+        heat_delta = coupling_heat_gain * len(neighbors)
         next_states.append(
             ProteinTowerState(
                 theta=max(0.0, blended_theta),
@@ -271,6 +563,10 @@ def synthesis_hub_adjustment(
 
 
 def overcoupled_cluster_collapsed(tower_states: Sequence[ProteinTowerState], theta_critical: float) -> bool:
-    """Resonance instability guard: collapse when sum(Theta) exceeds threshold."""
+    """Resonance instability guard: collapse when sum(Theta) exceeds threshold.
+
+    `tower_states` should be one coupled cluster; `ProteinClusterTracker`
+    maintains those clusters and their sums incrementally.
+    """
 
     return sum(state.theta for state in tower_states) > theta_critical
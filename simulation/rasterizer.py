@@ -0,0 +1,115 @@
+"""Zero-copy rasterization of enemy pools into map-sized flow buffers.
+
+`FlowRasterizer` owns one map-sized `creep_density` (enemies per tile) and
+`flow_speed` (mean enemy speed per tile) buffer and rewrites them in place
+each tick from an `EnemyPool`. Tower windows handed out by `bind_towers` are
+NumPy slices of those buffers, not copies, so they are built once per tower
+layout and always show the latest tick. Every per-tick step writes into
+preallocated scratch arrays.
+
+Enemy positions come from a progress-to-tile lookup table built once per
+path: progress is quantized to `tile_px / resolution` and each bin maps to
+the tile under the bin's start point.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from simulation.enemy_pool import EnemyPool
+from simulation.protein_field import TowerWindows
+from simulation.protein_tower import LocalFlowState
+from simulation.targeting import PathGeometry
+
+
+class FlowRasterizer:
+    """Reusable density/speed rasters for one map and path."""
+
+    def __init__(
+        self,
+        path: PathGeometry,
+        map_shape: tuple[int, int],
+        tile_px: float,
+        wall_block: np.ndarray | None = None,
+        capacity: int = 512,
+        resolution: int = 16,
+    ) -> None:
+        rows, cols = map_shape
+        self.path = path
+        self.tile_px = float(tile_px)
+        self.creep_density = np.zeros(map_shape, dtype=np.float64)
+        self.flow_speed = np.zeros(map_shape, dtype=np.float64)
+        self.wall_block = (
+            np.zeros(map_shape, dtype=np.float64) if wall_block is None else np.array(wall_block, dtype=np.float64)
+        )
+        if self.wall_block.shape != tuple(map_shape):
+            raise ValueError(f"wall_block shape {self.wall_block.shape} does not match map {map_shape}")
+
+        self.bin_px = self.tile_px / resolution
+        bins = int(np.ceil(path.length_px / self.bin_px)) + 1
+        lookup = np.empty(bins, dtype=np.int64)
+        for b in range(bins):
+            x, y = path.point_at(b * self.bin_px)
+            col = min(cols - 1, max(0, int(x // self.tile_px)))
+            row = min(rows - 1, max(0, int(y // self.tile_px)))
+            lookup[b] = row * cols + col
+        self._tile_of_bin = lookup
+
+        self._speed_sum = np.zeros(map_shape, dtype=np.float64)
+        self._occupied = np.zeros(map_shape, dtype=bool)
+        self._allocate_scratch(capacity)
+
+    def _allocate_scratch(self, capacity: int) -> None:
+        self._bin = np.zeros(capacity, dtype=np.float64)
+        self._bin_index = np.zeros(capacity, dtype=np.int64)
+        self._tile = np.zeros(capacity, dtype=np.int64)
+        self._weight = np.zeros(capacity, dtype=np.float64)
+        self._on_path = np.zeros(capacity, dtype=bool)
+        self._before_end = np.zeros(capacity, dtype=bool)
+        self._scratch = np.zeros(capacity, dtype=np.float64)
+
+    def rasterize(self, pool: EnemyPool) -> None:
+        """Overwrite the density and speed buffers from the pool's live enemies."""
+
+        if pool.capacity != len(self._bin):
+            self._allocate_scratch(pool.capacity)
+
+        # Only enemies actually on the path contribute.
+        np.greater_equal(pool.progress, 0.0, out=self._on_path)
+        self._on_path &= pool.alive
+        np.less(pool.progress, self.path.length_px, out=self._before_end)
+        self._on_path &= self._before_end
+        self._weight[:] = self._on_path
+
+        np.divide(pool.progress, self.bin_px, out=self._bin)
+        np.clip(self._bin, 0, len(self._tile_of_bin) - 1, out=self._bin)
+        self._bin_index[:] = self._bin
+        np.take(self._tile_of_bin, self._bin_index, out=self._tile)
+
+        density = self.creep_density.reshape(-1)
+        speed_sum = self._speed_sum.reshape(-1)
+        density.fill(0.0)
+        speed_sum.fill(0.0)
+        np.add.at(density, self._tile, self._weight)
+        np.multiply(pool.speed, self._weight, out=self._scratch)
+        np.add.at(speed_sum, self._tile, self._scratch)
+
+        np.greater(self.creep_density, 0.0, out=self._occupied)
+        self.flow_speed.fill(0.0)
+        np.divide(self._speed_sum, self.creep_density, out=self.flow_speed, where=self._occupied)
+
+    def window(self, windows: TowerWindows, tower: int) -> LocalFlowState:
+        """`LocalFlowState` whose grids are views into the shared buffers."""
+
+        rows = slice(windows.row_start[tower], windows.row_stop[tower])
+        cols = slice(windows.col_start[tower], windows.col_stop[tower])
+        return LocalFlowState(
+            creep_density=self.creep_density[rows, cols],
+            flow_speed=self.flow_speed[rows, cols],
+            wall_block=self.wall_block[rows, cols],
+        )
+
+    def bind_towers(self, windows: TowerWindows) -> list[LocalFlowState]:
+        """Views for every tower; rebuild only when the tower layout changes."""
+
+        return [self.window(windows, tower) for tower in range(len(windows))]
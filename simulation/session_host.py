@@ -0,0 +1,563 @@
+"""Asyncio host that advances many headless lane sessions in lockstep.
+
+Each session is a single-lane level in the style of `balance_sweep.lane_trial`.
+Enemies walk a path of `path_length_px`, towers at path offsets shoot the lead
+enemy in range, and every tower carries both thermal and Protein state. The
+sessions do not get one object each. `LaneBatch` stores every session as a
+row of (sessions, enemies) and (sessions, towers) arrays, and one tick over a
+contiguous block of rows is a fixed number of NumPy calls:
+
+- one enemy advance;
+- one broadcast range test for targeting;
+- one `step_protein_fleet` over every tower's lane window;
+- one `subtract.at` for damage;
+- one `step_thermal_batch` for heat;
+- masked sweeps for kills, leaks and wave turnover.
+
+Per-tick cost therefore grows far slower than the session count.
+
+A tower's Protein window is the lane itself: `local_sample_size` bins of
+`tile_px` centered on the tower. These form the middle row of a 3-row
+`LocalFlowState` whose other rows and `wall_block` are empty. Creep density
+is the enemy count per bin, and flow speed is the mean enemy speed in the bin
+over `base_enemy_speed`. Realized escape energy is the session's leak count on
+the previous tick. The Protein damage adds to the tower's hit on its target.
+Enemies of a wave enter in `level_scene.gd` cadence: `spawn_batch` every
+`spawn_interval_s`.
+
+`SessionHost` runs the rows on a fixed-timestep asyncio loop. Opening and
+closing sessions and placing towers are awaitable commands. They go through a
+bounded queue and are applied between ticks, so producers block (backpressure)
+when they outrun the scheduler. A tick steps the rows in blocks of
+`batch_size` and yields to the event loop between blocks. Each session's tick
+latency is measured from the start of the tick to the end of its block.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import operator
+from dataclasses import dataclass
+from time import perf_counter, perf_counter_ns
+from typing import Sequence
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules, TowerStats
+from simulation.protein_batch import ProteinFleetState, step_protein_fleet
+from simulation.protein_tower import ProteinTowerConfig, ProteinTowerState
+from simulation.thermal_batch import ThermalParamArrays, step_thermal_batch
+from simulation.thermal_reference import ThermalParams
+from simulation.wave_tables import enemy_hp_at, enemy_speed_at, reward_at
+
+
+@dataclass(frozen=True)
+class LaneConfig:
+    """Level shared by every session of a host."""
+
+    rules: CoreRules = CoreRules()
+    tower: TowerStats = TowerStats()
+    thermal: ThermalParams = ThermalParams()
+    protein: ProteinTowerConfig = ProteinTowerConfig()
+    path_length_px: float = 1400.0
+    tile_px: float = 64.0
+    waves: int = 3
+    enemies_per_wave: int = 40
+    spawn_batch: int = 3
+    spawn_interval_s: float = 0.14
+    max_ticks_per_wave: int = 2400
+
+    def entry_delays(self) -> np.ndarray:
+        """Seconds after wave start at which each enemy slot enters the path."""
+
+        return (np.arange(self.enemies_per_wave) // self.spawn_batch) * self.spawn_interval_s
+
+
+@dataclass(frozen=True)
+class SessionSummary:
+    session_id: int
+    wave: int
+    ticks: int
+    kills: int
+    leaks: int
+    reward: int
+    first_overheat_tick: int | None
+    finished: bool
+
+
+@dataclass(frozen=True)
+class SessionMetrics:
+    """Wall-clock latency of one session's ticks and commands, in seconds."""
+
+    ticks: int
+    mean_tick_latency_s: float
+    max_tick_latency_s: float
+    commands: int
+    mean_command_latency_s: float
+
+
+class LaneBatch:
+    """Synchronous struct-of-arrays state for many lane sessions, one per row."""
+
+    def __init__(self, config: LaneConfig = LaneConfig(), capacity: int = 64) -> None:
+        self.config = config
+        self._thermal = ThermalParamArrays.from_params(config.thermal, 1)
+        self._entry_delays = config.entry_delays()
+        self._size = 0
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, rows: int) -> None:
+        enemies, towers = self.config.enemies_per_wave, self.config.rules.max_towers
+        shapes = {
+            "hp": ((enemies,), np.float64),
+            "progress": ((enemies,), np.float64),
+            "speed": ((enemies,), np.float64),
+            "alive": ((enemies,), np.bool_),
+            "tower_active": ((towers,), np.bool_),
+            "tower_offset": ((towers,), np.float64),
+            "heat": ((towers,), np.float64),
+            "overheated": ((towers,), np.bool_),
+            "theta": ((towers,), np.float64),
+            "protein_heat": ((towers,), np.float64),
+            "collapsed": ((towers,), np.bool_),
+            "running": ((), np.bool_),
+            "wave": ((), np.int64),
+            "wave_ticks": ((), np.int64),
+            "ticks": ((), np.int64),
+            "kills": ((), np.int64),
+            "leaks": ((), np.int64),
+            "reward": ((), np.int64),
+            "escaped": ((), np.float64),
+            "first_overheat_tick": ((), np.int64),
+        }
+        for name, (shape, dtype) in shapes.items():
+            grown = np.zeros((rows, *shape), dtype=dtype)
+            current = self.__dict__.get(name)
+            if current is not None:
+                grown[: len(current)] = current
+            setattr(self, name, grown)
+
+    @property
+    def rows(self) -> int:
+        """High-water mark of rows in use; step `[0, rows)` to cover every session."""
+
+        return self._size
+
+    def reset(self, row: int, offsets: Sequence[float] = ()) -> None:
+        """Start a fresh session on `row` (growing storage if needed) at wave 1."""
+
+        if row >= len(self.hp):
+            self._allocate(max(2 * len(self.hp), row + 1))
+        self._size = max(self._size, row + 1)
+        for name in ("tower_active", "tower_offset", "heat", "overheated", "protein_heat", "collapsed"):
+            getattr(self, name)[row] = 0
+        self.theta[row] = ProteinTowerState().theta
+        for name in ("ticks", "kills", "leaks", "reward", "escaped"):
+            getattr(self, name)[row] = 0
+        self.first_overheat_tick[row] = -1
+        self.wave[row] = 1
+        self.running[row] = True
+        self._spawn(np.array([row]))
+        for offset in offsets:
+            self.place(row, offset)
+
+    def release(self, row: int) -> None:
+        self.running[row] = False
+        self.alive[row] = False
+        self.tower_active[row] = False
+
+    def place(self, row: int, offset_px: float) -> int:
+        """Place a tower at `offset_px` along the path and return its tower slot."""
+
+        if not self.running[row]:
+            raise ValueError(f"session row {row} is not running")
+        free = np.flatnonzero(~self.tower_active[row])
+        if free.size == 0:
+            raise ValueError(f"session row {row} already has {self.config.rules.max_towers} towers")
+        if not 0.0 <= offset_px <= self.config.path_length_px:
+            raise ValueError(f"offset_px must lie on the path [0, {self.config.path_length_px}], got {offset_px}")
+        slot = int(free[0])
+        self.tower_active[row, slot] = True
+        self.tower_offset[row, slot] = offset_px
+        self.heat[row, slot] = 0.0
+        self.overheated[row, slot] = False
+        self.theta[row, slot] = ProteinTowerState().theta
+        self.protein_heat[row, slot] = 0.0
+        self.collapsed[row, slot] = False
+        return slot
+
+    def _spawn(self, rows: np.ndarray) -> None:
+        rules = self.config.rules
+        speed = enemy_speed_at(self.wave[rows], rules)
+        self.hp[rows] = enemy_hp_at(self.wave[rows], rules)[:, None]
+        self.speed[rows] = speed[:, None]
+        self.progress[rows] = -self._entry_delays[None, :] * speed[:, None]
+        self.alive[rows] = True
+        self.wave_ticks[rows] = 0
+
+    def step(self, start: int, stop: int, dt: float) -> np.ndarray:
+        """Advance running sessions in rows `[start, stop)` one tick.
+
+        Returns the row indices whose session finished its last wave on this tick.
+        """
+
+        config, rules, stats = self.config, self.config.rules, self.config.tower
+        rows = slice(start, stop)
+        live = self.running[rows]
+        if not live.any():
+            return np.empty(0, dtype=np.int64)
+        hp, progress, speed, alive = self.hp[rows], self.progress[rows], self.speed[rows], self.alive[rows]
+        towers = self.tower_active[rows] & live[:, None]
+        offsets = self.tower_offset[rows]
+
+        np.add(progress, speed * dt, out=progress, where=alive)
+
+        # Targeting: lead enemy (furthest progress) on the path within range of each tower.
+        on_path = alive & (progress >= 0.0)
+        relative = progress[:, None, :] - offsets[:, :, None]
+        in_range = on_path[:, None, :] & towers[:, :, None] & (np.abs(relative) <= stats.range_px)
+        has_target = in_range.any(axis=2)
+        target = np.argmax(np.where(in_range, progress[:, None, :], -np.inf), axis=2)
+
+        protein_damage = self._step_protein(rows, towers, relative, on_path, speed)
+
+        overheated = self.overheated[rows]
+        damage = np.where(overheated, 0.0, stats.damage * stats.fire_rate_per_second * dt) + protein_damage
+        hit_rows, hit_towers = np.nonzero(has_target)
+        np.subtract.at(hp, (hit_rows, target[hit_rows, hit_towers]), damage[hit_rows, hit_towers])
+        np.maximum(hp, 0.0, out=hp)
+
+        heat = self.heat[rows]
+        frozen = heat[~live].copy(), overheated[~live].copy()
+        step_thermal_batch(
+            heat.reshape(-1), overheated.reshape(-1), has_target.reshape(-1), self._thermal.decay(dt), self._thermal
+        )
+        heat[~live], overheated[~live] = frozen
+
+        ticks = self.ticks[rows]
+        ticks += live
+        first = self.first_overheat_tick[rows]
+        newly = live & (first < 0) & overheated.any(axis=1)
+        first[newly] = ticks[newly]
+
+        defeated = alive & (hp <= 0.0)
+        kills = defeated.sum(axis=1)
+        self.kills[rows] += kills
+        self.reward[rows] += kills * reward_at(self.wave[rows], rules)
+        alive &= ~defeated
+        leaked = alive & (progress >= config.path_length_px)
+        escaped = leaked.sum(axis=1)
+        self.leaks[rows] += escaped
+        self.escaped[rows] = escaped
+        alive &= ~leaked
+
+        wave_ticks = self.wave_ticks[rows]
+        wave_ticks += live
+        remaining = alive.sum(axis=1)
+        over = live & ((remaining == 0) | (wave_ticks >= config.max_ticks_per_wave))
+        if not over.any():
+            return np.empty(0, dtype=np.int64)
+        # Enemies still alive when the wave times out count as leaks.
+        self.leaks[rows] += np.where(over, remaining, 0)
+        alive[over] = False
+        self.wave[rows] += over
+        finished = over & (self.wave[rows] > config.waves)
+        self.running[rows] &= ~finished
+        self.tower_active[rows] &= ~finished[:, None]
+        turnover = np.flatnonzero(over & ~finished) + start
+        if turnover.size:
+            self._spawn(turnover)
+        return np.flatnonzero(finished) + start
+
+    def _step_protein(
+        self,
+        rows: slice,
+        towers: np.ndarray,
+        relative: np.ndarray,
+        on_path: np.ndarray,
+        speed: np.ndarray,
+    ) -> np.ndarray:
+        """Protein tick for every placed tower; returns per-tower damage shaped like `towers`."""
+
+        config = self.config
+        size = config.protein.local_sample_size
+        count, tower_slots = towers.shape
+        damage = np.zeros(towers.shape, dtype=np.float64)
+        placed = np.flatnonzero(towers.reshape(-1))
+        if placed.size == 0:
+            return damage
+
+        bins = np.floor(relative / config.tile_px + size / 2)
+        inside = on_path[:, None, :] & towers[:, :, None] & (bins >= 0) & (bins < size)
+        cells = (np.arange(count * tower_slots).reshape(count, tower_slots, 1) * size + bins.astype(np.int64))[inside]
+        speeds = np.broadcast_to(speed[:, None, :], inside.shape)[inside]
+        density = np.bincount(cells, minlength=count * tower_slots * size).reshape(-1, size)[placed]
+        speed_sum = np.bincount(cells, weights=speeds, minlength=count * tower_slots * size).reshape(-1, size)[placed]
+
+        creep_density = np.zeros((placed.size, 3, size), dtype=np.float64)
+        flow_speed = np.zeros((placed.size, 3, size), dtype=np.float64)
+        creep_density[:, 1] = density
+        flow_speed[:, 1] = speed_sum / np.maximum(density, 1) / config.rules.base_enemy_speed
+
+        theta, protein_heat, collapsed = (getattr(self, name)[rows].reshape(-1) for name in ("theta", "protein_heat", "collapsed"))
+        state = ProteinFleetState(theta=theta[placed], heat=protein_heat[placed], collapsed=collapsed[placed])
+        tick = step_protein_fleet(
+            state,
+            creep_density,
+            flow_speed,
+            np.zeros_like(creep_density),
+            np.repeat(self.wave[rows], tower_slots)[placed],
+            np.repeat(self.escaped[rows], tower_slots)[placed],
+            config.protein,
+        )
+        theta[placed] = tick.state.theta
+        protein_heat[placed] = tick.state.heat
+        collapsed[placed] = tick.state.collapsed
+        damage.reshape(-1)[placed] = tick.damage
+        return damage
+
+    def summary(self, row: int, session_id: int) -> SessionSummary:
+        first = int(self.first_overheat_tick[row])
+        return SessionSummary(
+            session_id=session_id,
+            wave=int(self.wave[row]),
+            ticks=int(self.ticks[row]),
+            kills=int(self.kills[row]),
+            leaks=int(self.leaks[row]),
+            reward=int(self.reward[row]),
+            first_overheat_tick=first if first >= 0 else None,
+            finished=bool(self.wave[row] > self.config.waves),
+        )
+
+
+@dataclass
+class _Session:
+    row: int
+    finished: asyncio.Future
+    commands: int = 0
+    command_ns: int = 0
+
+
+class SessionHost:
+    """Fixed-timestep asyncio scheduler over a `LaneBatch`.
+
+    `tick_interval_s=None` runs ticks back to back; otherwise each tick is
+    scheduled `tick_interval_s` after the previous one. A tick that falls more
+    than one interval behind resets the schedule instead of bursting to catch
+    up, and is counted in `overruns`.
+    """
+
+    def __init__(
+        self,
+        config: LaneConfig = LaneConfig(),
+        *,
+        dt: float = 0.05,
+        tick_interval_s: float | None = None,
+        batch_size: int = 256,
+        max_pending_commands: int = 1024,
+        capacity: int = 64,
+    ) -> None:
+        if batch_size <= 0 or max_pending_commands <= 0:
+            raise ValueError("batch_size and max_pending_commands must be positive")
+        self.lanes = LaneBatch(config, capacity)
+        self.dt = dt
+        self.tick_interval_s = tick_interval_s
+        self.batch_size = batch_size
+        self.tick = 0
+        self.overruns = 0
+        self.session_ticks = 0
+        self.busy_s = 0.0
+        self._commands: asyncio.Queue = asyncio.Queue(maxsize=max_pending_commands)
+        self._sessions: dict[int, _Session] = {}
+        self._by_row: dict[int, int] = {}
+        self._free_rows: list[int] = []
+        self._next_id = 0
+        self._stopping = False
+        self._tick_done: asyncio.Event | None = None
+        self._latency_sum = np.zeros(0, dtype=np.int64)
+        self._latency_max = np.zeros(0, dtype=np.int64)
+
+    # Commands -------------------------------------------------------------
+
+    async def _submit(self, kind: str, *args: object) -> object:
+        future = asyncio.get_running_loop().create_future()
+        await self._commands.put((kind, args, future, perf_counter_ns()))
+        return await future
+
+    async def open_session(self, offsets: Sequence[float] = ()) -> int:
+        """Start a session (optionally with towers at `offsets`) and return its id."""
+
+        return await self._submit("open", tuple(float(offset) for offset in offsets))
+
+    async def place_tower(self, session_id: int, offset_px: float) -> int:
+        """Place a tower before the next tick; returns the tower slot or raises ValueError."""
+
+        return await self._submit("place", operator.index(session_id), float(offset_px))
+
+    async def close_session(self, session_id: int) -> SessionSummary:
+        return await self._submit("close", operator.index(session_id))
+
+    @property
+    def pending_commands(self) -> int:
+        return self._commands.qsize()
+
+    def _apply_commands(self) -> None:
+        # Only what is queued now; commands submitted meanwhile wait for the next tick.
+        for _ in range(self._commands.qsize()):
+            kind, args, future, queued_ns = self._commands.get_nowait()
+            try:
+                result = getattr(self, f"_do_{kind}")(*args)
+            except Exception as error:
+                # A failed command fails its own future, never the tick loop.
+                future.set_exception(error)
+                continue
+            future.set_result(result)
+            session = self._sessions.get(result if kind == "open" else args[0])
+            if session is not None:
+                session.commands += 1
+                session.command_ns += perf_counter_ns() - queued_ns
+
+    def _do_open(self, offsets: tuple[float, ...]) -> int:
+        row = self._free_rows.pop() if self._free_rows else self.lanes.rows
+        # Grow latency rows first: a reset that fails after claiming a new row still
+        # raises `lanes.rows`, and the tick loop slices these arrays up to it.
+        if row >= len(self._latency_sum):
+            pad = max(row + 1, 2 * len(self._latency_sum)) - len(self._latency_sum)
+            self._latency_sum = np.concatenate([self._latency_sum, np.zeros(pad, dtype=np.int64)])
+            self._latency_max = np.concatenate([self._latency_max, np.zeros(pad, dtype=np.int64)])
+        self._latency_sum[row] = self._latency_max[row] = 0
+        try:
+            self.lanes.reset(row, offsets)
+        except Exception:
+            self.lanes.release(row)
+            self._free_rows.append(row)
+            raise
+        session_id = self._next_id
+        self._next_id += 1
+        self._sessions[session_id] = _Session(row=row, finished=asyncio.get_running_loop().create_future())
+        self._by_row[row] = session_id
+        return session_id
+
+    def _do_place(self, session_id: int, offset_px: float) -> int:
+        return self.lanes.place(self._session(session_id).row, offset_px)
+
+    def _do_close(self, session_id: int) -> SessionSummary:
+        session = self._session(session_id)
+        summary = self.lanes.summary(session.row, session_id)
+        self.lanes.release(session.row)
+        del self._sessions[session_id], self._by_row[session.row]
+        self._free_rows.append(session.row)
+        if not session.finished.done():
+            session.finished.set_result(summary)
+        return summary
+
+    def _session(self, session_id: int) -> _Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise ValueError(f"unknown session {session_id}")
+        return session
+
+    # Observation ----------------------------------------------------------
+
+    def summary(self, session_id: int) -> SessionSummary:
+        return self.lanes.summary(self._session(session_id).row, session_id)
+
+    async def wait_finished(self, session_id: int) -> SessionSummary:
+        """Resolve with the final summary once the session clears its last wave (or closes)."""
+
+        return await asyncio.shield(self._session(session_id).finished)
+
+    async def wait_tick(self) -> int:
+        """Wait for the current tick to complete and return the new tick count."""
+
+        if self._tick_done is None:
+            self._tick_done = asyncio.Event()
+        await self._tick_done.wait()
+        return self.tick
+
+    def metrics(self, session_id: int) -> SessionMetrics:
+        session = self._session(session_id)
+        ticks = int(self.lanes.ticks[session.row])
+        return SessionMetrics(
+            ticks=ticks,
+            mean_tick_latency_s=float(self._latency_sum[session.row]) / max(1, ticks) * 1e-9,
+            max_tick_latency_s=float(self._latency_max[session.row]) * 1e-9,
+            commands=session.commands,
+            mean_command_latency_s=session.command_ns / max(1, session.commands) * 1e-9,
+        )
+
+    def session_ticks_per_second(self) -> float:
+        """Aggregate session ticks per second of scheduler busy time."""
+
+        return self.session_ticks / self.busy_s if self.busy_s > 0 else 0.0
+
+    # Scheduling -----------------------------------------------------------
+
+    def stop(self) -> None:
+        """Ask `run` to return after the tick in progress."""
+
+        self._stopping = True
+
+    async def run(self, ticks: int | None = None) -> None:
+        """Tick until `ticks` ticks have run or `stop()` is called."""
+
+        loop = asyncio.get_running_loop()
+        self._stopping = False
+        deadline = loop.time()
+        completed = 0
+        while not self._stopping and (ticks is None or completed < ticks):
+            started = perf_counter()
+            tick_start = perf_counter_ns()
+            self._apply_commands()
+            for start in range(0, self.lanes.rows, self.batch_size):
+                stop = min(start + self.batch_size, self.lanes.rows)
+                live = self.lanes.running[start:stop].copy()
+                finished = self.lanes.step(start, stop, self.dt)
+                latency = perf_counter_ns() - tick_start
+                self._latency_sum[start:stop] += np.where(live, latency, 0)
+                np.maximum(self._latency_max[start:stop], np.where(live, latency, 0), out=self._latency_max[start:stop])
+                self.session_ticks += int(live.sum())
+                for row in finished.tolist():
+                    session = self._sessions[self._by_row[row]]
+                    session.finished.set_result(self.lanes.summary(row, self._by_row[row]))
+                if stop < self.lanes.rows:
+                    await asyncio.sleep(0)
+            self.busy_s += perf_counter() - started
+            self.tick += 1
+            completed += 1
+            if self._tick_done is not None:
+                self._tick_done.set()
+                self._tick_done = None
+
+            if self.tick_interval_s is None:
+                await asyncio.sleep(0)
+                continue
+            deadline += self.tick_interval_s
+            delay = deadline - loop.time()
+            if delay < -self.tick_interval_s:
+                self.overruns += 1
+                deadline = loop.time()
+                delay = 0.0
+            await asyncio.sleep(max(0.0, delay))
+
+
+async def _throughput(sessions: int, ticks: int) -> tuple[float, SessionMetrics]:
+    host = SessionHost(capacity=sessions)
+    ids = [host.open_session([200.0, 500.0, 800.0, 1100.0]) for _ in range(sessions)]
+    runner = asyncio.create_task(host.run(ticks))
+    session_ids = await asyncio.gather(*ids)
+    await runner
+    return host.session_ticks_per_second(), host.metrics(session_ids[0])
+
+
+def _demo() -> None:
+    for sessions in (1, 16, 128, 512):
+        rate, metrics = asyncio.run(_throughput(sessions, 400))
+        print(
+            f"sessions={sessions:>4} session-ticks/s={rate:>10.0f} "
+            f"mean tick latency={metrics.mean_tick_latency_s * 1e3:6.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    _demo()
@@ -0,0 +1,278 @@
+"""Bisection search for `apply_wasmutable_shift` factor boundaries.
+
+The question "at which `shift_factor` does this fire cadence start to
+overheat (or stop recovering)?" used to be answered by sweeping a dense
+factor grid and rerunning `simulate_heat_curve` in full at every point. This
+module bisects the factor instead, and each probe stops as soon as its
+outcome is decided:
+
+- `"overheats"`: the tower overheats on some tick. Decided `True` on the
+  first overheated tick, and `False` once the heat left plus every remaining
+  shot can no longer reach `capacity`.
+- `"never_recovers"`: the tower is still overheated on the last tick.
+  Decided `True` once pure cooling over the remaining ticks cannot bring heat
+  down to `recovery_threshold` (an overheated tower ignores its fire input),
+  and `False` once it is cool and can no longer re-overheat.
+
+`find_shift_boundaries` searches many timelines at once. Every timeline
+bisects the same starting bracket, so timelines with the same outcomes so far
+probe bit-identical factors and are evaluated together. Within such a group
+the timelines are visited in sorted order, and each one resumes from a
+checkpoint of the previous one at their first differing tick instead of from
+tick zero. A `"overheats"` decision reached inside the shared prefix is
+reused without stepping at all.
+
+Probes step `TowerThermalState.step` exactly. The early decisions leave a
+small rounding margin, so search outcomes equal those of full
+`simulate_heat_curve` runs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Sequence
+
+from simulation.thermal_reference import ThermalParams, TowerThermalState, apply_wasmutable_shift
+
+
+CRITERIA = ("overheats", "never_recovers")
+
+# Relative allowance per remaining tick for float drift in the early-decision bounds.
+_ROUNDING_SLACK = 1e-12
+
+
+@dataclass(frozen=True)
+class ShiftBoundary:
+    """Outcome flips between `low` and `high`; `high - low <= tolerance`."""
+
+    low: float
+    high: float
+    outcome_at_high: bool
+
+    @property
+    def factor(self) -> float:
+        return 0.5 * (self.low + self.high)
+
+
+@dataclass(frozen=True)
+class ShiftSearch:
+    """Boundaries per input timeline (None if the bracket holds no flip) plus work counters."""
+
+    boundaries: list[ShiftBoundary | None]
+    probes: int
+    simulations: int
+    ticks_simulated: int
+
+
+@dataclass(frozen=True)
+class _Timeline:
+    fires: tuple[bool, ...]
+    # shots_after[t]: fire ticks strictly after tick t (t counts ticks already stepped, from 1).
+    shots_after: tuple[int, ...]
+
+    @classmethod
+    def build(cls, timeline: Sequence[bool]) -> "_Timeline":
+        fires = tuple(bool(f) for f in timeline)
+        total = sum(fires)
+        return cls(fires=fires, shots_after=tuple(total - n for n in accumulate(fires, initial=0)))
+
+
+def _decide(
+    criterion: str, timeline: _Timeline, ticks: int, state: TowerThermalState, params: ThermalParams, decay: float
+) -> bool | None:
+    """The outcome if it no longer depends on the ticks after `ticks`, else None."""
+
+    remaining = len(timeline.fires) - ticks
+    slack = _ROUNDING_SLACK * params.capacity * (1 + remaining)
+    if criterion == "overheats":
+        if state.overheated:
+            return True
+        if remaining == 0 or state.heat + timeline.shots_after[ticks] * params.heat_per_shot < params.capacity - slack:
+            return False
+        return None
+    if state.overheated:
+        if remaining == 0 or state.heat - remaining * decay > params.recovery_threshold + slack:
+            return True
+        return None
+    if remaining == 0 or state.heat + timeline.shots_after[ticks] * params.heat_per_shot < params.capacity - slack:
+        return False
+    return None
+
+
+def _common_prefix(a: tuple[bool, ...], b: tuple[bool, ...]) -> int:
+    n = min(len(a), len(b))
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+    return n
+
+
+@dataclass
+class _Counters:
+    probes: int = 0
+    simulations: int = 0
+    ticks: int = 0
+
+
+def _evaluate_group(
+    members: Sequence[int],
+    timelines: Sequence[_Timeline],
+    prefixes: Sequence[int],
+    factor: float,
+    base: ThermalParams,
+    dt: float,
+    criterion: str,
+    counters: _Counters,
+) -> list[bool]:
+    """Outcomes at `factor` for `members` (indices into sorted `timelines`, ascending).
+
+    `prefixes[i]` is the common prefix length of sorted timelines `i` and
+    `i + 1`; the common prefix of two members is the minimum over the range
+    between them.
+    """
+
+    params = apply_wasmutable_shift(base, shift_factor=factor)
+    decay = params.dissipation_rate * dt
+    counters.probes += 1
+    # (ticks stepped, heat, overheated, outcome decided by this prefix alone)
+    stack: list[tuple[int, float, bool, bool | None]] = [(0, 0.0, False, None)]
+    shared = [min(prefixes[a:b]) for a, b in zip(members, members[1:])] + [0]
+    state = TowerThermalState()
+    outcomes = []
+
+    for position, member in enumerate(members):
+        timeline = timelines[member]
+        if position:
+            branch = shared[position - 1]
+            while stack[-1][0] > branch:
+                stack.pop()
+        ticks, state.heat, state.overheated, decided = stack[-1]
+        if decided is not None:
+            outcomes.append(decided)
+            continue
+
+        # Later members branch off at the running minima of the shared prefixes.
+        checkpoints = []
+        floor = len(timeline.fires) + 1
+        for length in shared[position:]:
+            if length <= ticks:
+                break
+            if length < floor:
+                checkpoints.append(length)
+                floor = length
+        checkpoints.reverse()
+
+        counters.simulations += 1
+        fires = timeline.fires
+        outcome = _decide(criterion, timeline, ticks, state, params, decay)
+        while outcome is None:
+            state.step(dt=dt, fired=fires[ticks], params=params)
+            ticks += 1
+            counters.ticks += 1
+            if criterion == "overheats" and state.overheated:
+                stack.append((ticks, state.heat, True, True))
+                outcome = True
+                break
+            if checkpoints and checkpoints[0] == ticks:
+                stack.append((ticks, state.heat, state.overheated, None))
+                checkpoints.pop(0)
+            outcome = _decide(criterion, timeline, ticks, state, params, decay)
+        if checkpoints and stack[-1][0] < ticks:
+            # Decided inside a shared prefix by this timeline's suffix: later
+            # members resume here and re-decide against their own suffix.
+            stack.append((ticks, state.heat, state.overheated, None))
+        outcomes.append(outcome)
+    return outcomes
+
+
+def find_shift_boundaries(
+    timelines: Sequence[Sequence[bool]],
+    dt: float,
+    params: ThermalParams | None = None,
+    *,
+    criterion: str = "overheats",
+    low: float = 0.1,
+    high: float = 10.0,
+    tolerance: float = 1e-3,
+) -> ShiftSearch:
+    """Bisect `shift_factor` in `[low, high]` for every fire timeline.
+
+    A timeline whose outcome is the same at `low` and `high` gets None.
+    Otherwise its `ShiftBoundary` brackets one outcome flip to within
+    `tolerance`. If the outcome is not monotone in the factor, the flip found
+    is one of several.
+    """
+
+    if criterion not in CRITERIA:
+        raise ValueError(f"unknown criterion {criterion!r}; expected one of {CRITERIA}")
+    if not 0.0 < low < high:
+        raise ValueError(f"need 0 < low < high, got low={low}, high={high}")
+    if tolerance <= 0.0:
+        raise ValueError(f"tolerance must be positive, got {tolerance}")
+
+    base = params or ThermalParams()
+    built = [_Timeline.build(t) for t in timelines]
+    order = sorted(range(len(built)), key=lambda i: built[i].fires)
+    ordered = [built[i] for i in order]
+    prefixes = [_common_prefix(a.fires, b.fires) for a, b in zip(ordered, ordered[1:])]
+    counters = _Counters()
+
+    everyone = list(range(len(ordered)))
+    at_low = _evaluate_group(everyone, ordered, prefixes, low, base, dt, criterion, counters)
+    at_high = _evaluate_group(everyone, ordered, prefixes, high, base, dt, criterion, counters)
+    brackets = {i: (low, high) for i in everyone if at_low[i] != at_high[i]}
+    high_outcome = {i: at_high[i] for i in brackets}
+
+    while True:
+        groups: dict[tuple[float, float], list[int]] = {}
+        for i, (lo, hi) in brackets.items():
+            if hi - lo > tolerance:
+                groups.setdefault((lo, hi), []).append(i)
+        if not groups:
+            break
+        for (lo, hi), members in groups.items():
+            mid = lo + 0.5 * (hi - lo)
+            for i, outcome in zip(members, _evaluate_group(members, ordered, prefixes, mid, base, dt, criterion, counters)):
+                brackets[i] = (lo, mid) if outcome == high_outcome[i] else (mid, hi)
+
+    boundaries: list[ShiftBoundary | None] = [None] * len(built)
+    for i, (lo, hi) in brackets.items():
+        boundaries[order[i]] = ShiftBoundary(low=lo, high=hi, outcome_at_high=high_outcome[i])
+    return ShiftSearch(
+        boundaries=boundaries, probes=counters.probes, simulations=counters.simulations, ticks_simulated=counters.ticks
+    )
+
+
+def find_shift_boundary(
+    fire_timeline: Sequence[bool],
+    dt: float,
+    params: ThermalParams | None = None,
+    *,
+    criterion: str = "overheats",
+    low: float = 0.1,
+    high: float = 10.0,
+    tolerance: float = 1e-3,
+) -> ShiftBoundary | None:
+    """`find_shift_boundaries` for a single timeline."""
+
+    search = find_shift_boundaries(
+        [fire_timeline], dt, params, criterion=criterion, low=low, high=high, tolerance=tolerance
+    )
+    return search.boundaries[0]
+
+
+def shift_outcome(
+    fire_timeline: Sequence[bool],
+    dt: float,
+    shift_factor: float,
+    params: ThermalParams | None = None,
+    *,
+    criterion: str = "overheats",
+) -> bool:
+    """One early-terminating probe: the criterion's outcome at `shift_factor`."""
+
+    if criterion not in CRITERIA:
+        raise ValueError(f"unknown criterion {criterion!r}; expected one of {CRITERIA}")
+    timeline = _Timeline.build(fire_timeline)
+    return _evaluate_group([0], [timeline], [], shift_factor, params or ThermalParams(), dt, criterion, _Counters())[0]
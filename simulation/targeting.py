@@ -0,0 +1,221 @@
+"""Range-query tower targeting along the creep path.
+
+A tower's circular range cuts the path polyline into a few arc-length
+intervals. Those intervals are computed once per tower layout
+(`PathCoverage`); each frame the live enemies are sorted by `progress_px`
+once (`TargetingFrame`), and every tower resolves its candidates with binary
+searches over that order instead of scanning all enemies.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import hypot, sqrt
+from typing import Sequence
+
+import numpy as np
+
+from simulation.enemy_pool import EnemyPool
+
+
+TARGET_MODES = ("first", "last", "strongest")
+
+
+@dataclass(frozen=True)
+class PathGeometry:
+    """Creep path polyline with cumulative arc length at each waypoint."""
+
+    points: tuple[tuple[float, float], ...]
+    distance_px: tuple[float, ...]
+
+    @classmethod
+    def from_points(cls, points: Sequence[tuple[float, float]]) -> "PathGeometry":
+        if len(points) < 2:
+            raise ValueError("a path needs at least two waypoints")
+        distances = [0.0]
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            distances.append(distances[-1] + hypot(x1 - x0, y1 - y0))
+        return cls(points=tuple((float(x), float(y)) for x, y in points), distance_px=tuple(distances))
+
+    @property
+    def length_px(self) -> float:
+        return self.distance_px[-1]
+
+    def point_at(self, progress_px: float) -> tuple[float, float]:
+        """Position after travelling `progress_px`, clamped to the path ends."""
+
+        progress_px = min(max(progress_px, 0.0), self.length_px)
+        for i in range(1, len(self.points)):
+            if progress_px <= self.distance_px[i] or i == len(self.points) - 1:
+                span = self.distance_px[i] - self.distance_px[i - 1]
+                t = 0.0 if span == 0.0 else (progress_px - self.distance_px[i - 1]) / span
+                (x0, y0), (x1, y1) = self.points[i - 1], self.points[i]
+                return x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+        return self.points[-1]
+
+
+@dataclass(frozen=True)
+class PathCoverage:
+    """Arc-length intervals of the path inside each tower's range.
+
+    Intervals are flattened across towers: `tower[k]` owns
+    `[start_px[k], end_px[k]]`, sorted by start within each tower.
+    """
+
+    tower_count: int
+    tower: np.ndarray
+    start_px: np.ndarray
+    end_px: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        path: PathGeometry,
+        tower_positions: Sequence[tuple[float, float]],
+        ranges_px: Sequence[float] | float,
+    ) -> "PathCoverage":
+        if isinstance(ranges_px, (int, float)):
+            ranges_px = [float(ranges_px)] * len(tower_positions)
+        if len(ranges_px) != len(tower_positions):
+            raise ValueError(f"expected {len(tower_positions)} ranges, got {len(ranges_px)}")
+
+        owners: list[int] = []
+        starts: list[float] = []
+        ends: list[float] = []
+        for tower, ((cx, cy), radius) in enumerate(zip(tower_positions, ranges_px)):
+            for start, end in _covered_intervals(path, cx, cy, radius):
+                owners.append(tower)
+                starts.append(start)
+                ends.append(end)
+        return cls(
+            tower_count=len(tower_positions),
+            tower=np.array(owners, dtype=np.int64),
+            start_px=np.array(starts, dtype=np.float64),
+            end_px=np.array(ends, dtype=np.float64),
+        )
+
+
+def _covered_intervals(path: PathGeometry, cx: float, cy: float, radius: float) -> list[tuple[float, float]]:
+    """Circle/segment intersections per segment, merged where they touch."""
+
+    merged: list[tuple[float, float]] = []
+    for i in range(1, len(path.points)):
+        (ax, ay), (bx, by) = path.points[i - 1], path.points[i]
+        length = path.distance_px[i] - path.distance_px[i - 1]
+        if length == 0.0:
+            continue
+        ux, uy = (bx - ax) / length, (by - ay) / length
+        half_b = ux * (ax - cx) + uy * (ay - cy)
+        c = (ax - cx) ** 2 + (ay - cy) ** 2 - radius * radius
+        disc = half_b * half_b - c
+        if disc < 0.0:
+            continue
+        root = sqrt(disc)
+        t0, t1 = max(0.0, -half_b - root), min(length, -half_b + root)
+        if t0 > t1:
+            continue
+        start, end = path.distance_px[i - 1] + t0, path.distance_px[i - 1] + t1
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class TargetingFrame:
+    """Live enemies of one frame ordered by path progress.
+
+    Also builds a sparse table over that order so "strongest in an interval"
+    is an O(1) lookup; ties on HP go to the enemy further along the path.
+    """
+
+    def __init__(self, progress_px: np.ndarray, hp: np.ndarray, slots: np.ndarray) -> None:
+        order = np.argsort(progress_px, kind="stable")
+        self.slots = slots[order]
+        self.progress_px = progress_px[order]
+        self.hp = hp[order]
+        # Level k holds the strongest sorted index of each window [i, i + 2**k).
+        count = len(order)
+        self._strongest = [np.arange(count, dtype=np.int64)]
+        width = 1
+        while width * 2 <= count:
+            previous = self._strongest[-1]
+            windows = count - 2 * width + 1
+            self._strongest.append(self._stronger(previous[:windows], previous[width : width + windows]))
+            width *= 2
+
+    @classmethod
+    def from_pool(cls, pool: EnemyPool) -> "TargetingFrame":
+        slots = np.flatnonzero(pool.alive)
+        return cls(pool.progress[slots], pool.hp[slots], slots)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _stronger(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        hp_a, hp_b = self.hp[a], self.hp[b]
+        take_b = (hp_b > hp_a) | ((hp_b == hp_a) & (b > a))
+        return np.where(take_b, b, a)
+
+    def strongest_between(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """Sorted index of the strongest enemy in each non-empty `[lo, hi)`."""
+
+        span = np.maximum(1, hi - lo)
+        level = np.floor(np.log2(span)).astype(np.int64)
+        out = np.empty(len(lo), dtype=np.int64)
+        for k in np.unique(level):
+            picks = level == k
+            table = self._strongest[k]
+            out[picks] = self._stronger(table[lo[picks]], table[hi[picks] - (1 << k)])
+        return out
+
+
+def select_targets(coverage: PathCoverage, frame: TargetingFrame, mode: str = "first") -> np.ndarray:
+    """Enemy slot each tower should shoot, or -1 when nothing is in range.
+
+    `first` is the enemy furthest along the path, `last` the one furthest
+    behind, `strongest` the one with the most HP.
+    """
+
+    if mode not in TARGET_MODES:
+        raise ValueError(f"unknown targeting mode {mode!r}; expected one of {TARGET_MODES}")
+    chosen = np.full(coverage.tower_count, -1, dtype=np.int64)
+    if len(frame) == 0 or len(coverage.tower) == 0:
+        return chosen
+
+    lo = np.searchsorted(frame.progress_px, coverage.start_px, side="left")
+    hi = np.searchsorted(frame.progress_px, coverage.end_px, side="right")
+    hit = hi > lo
+    owners, lo, hi = coverage.tower[hit], lo[hit], hi[hit]
+    if owners.size == 0:
+        return chosen
+
+    if mode == "first":
+        best = np.full(coverage.tower_count, -1, dtype=np.int64)
+        np.maximum.at(best, owners, hi - 1)
+    elif mode == "last":
+        best = np.full(coverage.tower_count, len(frame), dtype=np.int64)
+        np.minimum.at(best, owners, lo)
+        best[best == len(frame)] = -1
+    else:
+        candidates = frame.strongest_between(lo, hi)
+        # Per tower keep the candidate with max (hp, sorted index).
+        order = np.lexsort((candidates, frame.hp[candidates], owners))
+        last_of_group = np.r_[owners[order][1:] != owners[order][:-1], True]
+        best = np.full(coverage.tower_count, -1, dtype=np.int64)
+        best[owners[order][last_of_group]] = candidates[order][last_of_group]
+
+    found = best >= 0
+    chosen[found] = frame.slots[best[found]]
+    return chosen
+
+
+def enemies_in_range(coverage: PathCoverage, frame: TargetingFrame, tower: int) -> np.ndarray:
+    """Slots of every live enemy inside `tower`'s range, ordered by progress."""
+
+    mine = coverage.tower == tower
+    lo = np.searchsorted(frame.progress_px, coverage.start_px[mine], side="left")
+    hi = np.searchsorted(frame.progress_px, coverage.end_px[mine], side="right")
+    if lo.size == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate([frame.slots[a:b] for a, b in zip(lo, hi)])
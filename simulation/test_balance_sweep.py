@@ -0,0 +1,59 @@
+"""Checks for balance sweep sampling, determinism and streaming output."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from simulation.balance_sweep import (
+    SweepConfigs,
+    configs_for,
+    grid_points,
+    latin_hypercube_points,
+    lane_trial,
+    run_sweep,
+)
+
+
+def short_trial(configs: SweepConfigs, seed: int) -> dict:
+    return lane_trial(configs, seed, waves=1, enemies_per_wave=12, max_ticks_per_wave=600)
+
+
+class BalanceSweepTests(unittest.TestCase):
+    def test_points_map_onto_frozen_configs(self) -> None:
+        points = grid_points({"ThermalParams.heat_per_shot": [12.0, 30.0], "CoreRules.max_towers": [2.6, 4.0]})
+        self.assertEqual(len(points), 4)
+        configs = configs_for(points[1])
+        self.assertEqual(configs.thermal.heat_per_shot, 12.0)
+        self.assertEqual(configs.rules.max_towers, 4)
+        with self.assertRaises(ValueError):
+            grid_points({"ThermalParams.not_a_field": [1.0]})
+        protein = configs_for(grid_points({"ProteinTowerConfig.instability_threshold": [1.0]})[0])
+        self.assertEqual(protein.protein.instability_threshold, 1.0)
+        with self.assertRaises(ValueError):
+            lane_trial(protein, seed=0, waves=1)
+
+    def test_latin_hypercube_covers_every_stratum(self) -> None:
+        points = latin_hypercube_points({"ThermalParams.dissipation_rate": (0.0, 10.0)}, count=10, seed=3)
+        strata = sorted(int(p["ThermalParams.dissipation_rate"]) for p in points)
+        self.assertEqual(strata, list(range(10)))
+
+    def test_pool_results_match_inline_and_stream_to_disk(self) -> None:
+        points = grid_points({"ThermalParams.heat_per_shot": [10.0, 40.0], "CoreRules.base_enemy_hp": [60.0, 160.0]})
+        with tempfile.TemporaryDirectory() as tmp:
+            inline_path = Path(tmp) / "inline.jsonl"
+            pooled_path = Path(tmp) / "pooled.jsonl"
+            self.assertEqual(run_sweep(points, inline_path, trial=short_trial, repeats=2, max_workers=1), 4)
+            run_sweep(points, pooled_path, trial=short_trial, repeats=2, max_workers=2, chunk_size=1)
+
+            inline = sorted((json.loads(line) for line in inline_path.read_text().splitlines()), key=lambda r: r["index"])
+            pooled = sorted((json.loads(line) for line in pooled_path.read_text().splitlines()), key=lambda r: r["index"])
+
+        self.assertEqual(inline, pooled)
+        hot, cool = inline[2]["metrics"], inline[0]["metrics"]
+        self.assertIsNotNone(hot["time_to_overheat_s"])
+        self.assertGreaterEqual(cool["kill_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Checks for benchmark scaling fits and the baseline regression gate."""
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from simulation.benchmarks import (
+    BenchCase,
+    BenchPoint,
+    BenchResult,
+    compare_to_baseline,
+    main,
+    results_to_json,
+    run_case,
+    scaling_exponent,
+)
+
+
+def result(throughputs: list[float], exponent: float = 1.0) -> BenchResult:
+    points = tuple(BenchPoint(size=s, seconds=s / t, throughput=t) for s, t in zip((10, 100), throughputs))
+    return BenchResult(name="case", axis="towers", points=points, exponent=exponent)
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_scaling_exponent_recovers_power_law(self) -> None:
+        sizes = [10, 100, 1000]
+        self.assertAlmostEqual(scaling_exponent(sizes, [s**2 * 1e-9 for s in sizes]), 2.0)
+        self.assertAlmostEqual(scaling_exponent(sizes, [s * 3e-7 for s in sizes]), 1.0)
+
+    def test_gate_flags_throughput_and_exponent_regressions(self) -> None:
+        baseline = results_to_json([result([1000.0, 1000.0])])
+        self.assertEqual(compare_to_baseline([result([900.0, 1100.0])], baseline, threshold=0.25), [])
+        self.assertEqual(len(compare_to_baseline([result([500.0, 1000.0])], baseline, threshold=0.25)), 1)
+        self.assertEqual(len(compare_to_baseline([result([1000.0, 1000.0], exponent=1.8)], baseline)), 1)
+        # Unrecorded cases and sizes fail the gate instead of passing unmeasured.
+        self.assertEqual(len(compare_to_baseline([result([1.0, 1.0])], {"cases": {}})), 1)
+        partial = results_to_json([result([1000.0, 1000.0])])
+        partial["cases"]["case"]["points"] = partial["cases"]["case"]["points"][:1]
+        self.assertEqual(len(compare_to_baseline([result([1000.0, 1000.0])], partial)), 1)
+
+    def test_run_case_and_cli_round_trip(self) -> None:
+        case = BenchCase("sum", "items", (100, 1000), lambda n: (lambda: sum(range(n))))
+        measured = run_case(case, repeats=2)
+        self.assertEqual([p.size for p in measured.points], [100, 1000])
+        self.assertGreater(measured.exponent, 0.3)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "baseline.json"
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                status = main(["--only", "detect_protein_patterns", "--repeats", "1", "--record", str(path)])
+            self.assertEqual(status, 0)
+            self.assertIn("detect_protein_patterns", json.loads(path.read_text())["cases"])
+        self.assertIn("detect_protein_patterns", output.getvalue())
+        self.assertIn(f"baseline written to {path}", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Round-trip and replay checks for binary simulation checkpoints."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules
+from simulation.checkpoint import (
+    FIRE,
+    PLACE,
+    CheckpointView,
+    InputLog,
+    SimulationState,
+    load_input_log,
+    replay,
+    write_checkpoint,
+)
+from simulation.enemy_pool import EnemyPool
+from simulation.protein_batch import ProteinFleetState
+from simulation.protein_tower import ProteinTowerState, TokenTowerState
+from simulation.thermal_batch import ThermalParamArrays, step_thermal_batch
+
+
+PARAMS = ThermalParamArrays.from_params(None, 200)
+DECAY = PARAMS.dissipation_rate * 0.05
+
+
+def make_state(seed: int = 1) -> SimulationState:
+    pool = EnemyPool(capacity=512)
+    pool.spawn(500, wave_index=4, rules=CoreRules())
+    return SimulationState(
+        tick=0,
+        thermal_heat=np.zeros(200),
+        thermal_overheated=np.zeros(200, dtype=bool),
+        protein=ProteinFleetState.from_states([ProteinTowerState(theta=0.4)] * 200),
+        tokens=[TokenTowerState(path_probability_bias=0.3, prediction_depth=2)] * 8,
+        enemies=pool,
+        rng=np.random.default_rng(seed),
+    )
+
+
+def step(state: SimulationState, events: np.ndarray) -> None:
+    fired = np.zeros(len(state.thermal_heat), dtype=bool)
+    fired[events["a"][events["kind"] == FIRE]] = True
+    step_thermal_batch(state.thermal_heat, state.thermal_overheated, fired, DECAY, PARAMS)
+    state.enemies.advance(0.05)
+    state.enemies.apply_damage(state.rng.uniform(0.0, 2.0, state.enemies.capacity))
+    state.enemies.collect_defeated(4, CoreRules())
+    jitter = state.rng.normal(0.0, 0.01, len(state.protein))
+    state.protein = ProteinFleetState(state.protein.theta + jitter, state.protein.heat, state.protein.collapsed)
+
+
+def record_log(seed: int, ticks: int) -> InputLog:
+    rng = np.random.default_rng(seed)
+    log = InputLog()
+    for tick in range(ticks):
+        for tower in np.flatnonzero(rng.random(200) < 0.3):
+            log.append(tick, FIRE, int(tower))
+        if tick % 50 == 0:
+            log.append(tick, PLACE, tick % 17, tick % 11)
+    return log
+
+
+def assert_states_equal(test: unittest.TestCase, a: SimulationState, b: SimulationState) -> None:
+    test.assertEqual(a.tick, b.tick)
+    for name, values in a.sections().items():
+        np.testing.assert_array_equal(values, b.sections()[name], err_msg=name)
+    test.assertEqual(a.rng.bit_generator.state, b.rng.bit_generator.state)
+
+
+class CheckpointTests(unittest.TestCase):
+    def test_resume_from_checkpoint_replays_identically(self) -> None:
+        log = record_log(seed=3, ticks=300)
+        straight = replay(make_state(), log, step, until_tick=300)
+
+        partial = replay(make_state(), log, step, until_tick=120)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tick120.ckpt"
+            path.write_bytes(partial.to_bytes(log))
+            view = CheckpointView.open(path)
+            resumed = SimulationState.from_view(view)
+            restored_log = load_input_log(view)
+            del view
+
+        np.testing.assert_array_equal(restored_log.events, log.events)
+        replay(resumed, restored_log, step, until_tick=300)
+        assert_states_equal(self, resumed, straight)
+
+    def test_sections_are_zero_copy_views_and_write_is_compact(self) -> None:
+        state = make_state()
+        blob = state.to_bytes()
+        view = CheckpointView(blob)
+        # One header, one directory entry per section, the JSON meta, then the raw
+        # arrays with at most 7 bytes of alignment padding each: nothing else is written.
+        sections = state.sections()
+        payload = sum(np.asarray(values).nbytes for values in sections.values())
+        overhead = 32 + 48 * len(sections) + len(json.dumps(view.meta, sort_keys=True).encode("utf-8"))
+        self.assertGreaterEqual(len(blob), payload + overhead)
+        self.assertLessEqual(len(blob), payload + overhead + 7 * (len(sections) + 1))
+
+        hp = view.section("enemy.hp")
+        self.assertFalse(hp.flags.writeable)
+        self.assertFalse(hp.flags.owndata)
+        self.assertEqual(view.meta["tick"], 0)
+
+    def test_rejects_bad_files_and_sections(self) -> None:
+        with self.assertRaises(ValueError):
+            CheckpointView(b"not a checkpoint" * 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                write_checkpoint(Path(tmp) / "bad.ckpt", {"grid": np.zeros((2, 2))}, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
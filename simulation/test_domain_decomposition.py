@@ -0,0 +1,161 @@
+"""Checks that banded multi-process map ticks equal the serial map tick."""
+
+import random
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+from unittest import mock
+
+import numpy as np
+
+from simulation.domain_decomposition import MapLayout, ParallelProteinMap, partition_bands, step_protein_map
+from simulation.protein_batch import ProteinFleetState, step_protein_fleet_from_fields
+from simulation.protein_tower import ProteinTowerConfig, ProteinTowerState, TowerPlacement, synthesize_protein_cluster
+
+
+ROWS, COLS = 60, 48
+CONFIG = ProteinTowerConfig(instability_threshold=6.0)
+
+
+def random_map(seed):
+    rng = random.Random(seed)
+    placements = list({TowerPlacement(rng.randrange(COLS), rng.randrange(ROWS)) for _ in range(260)})
+    placements += [TowerPlacement(0, 0), TowerPlacement(COLS - 1, ROWS - 1)]
+    states = [ProteinTowerState(theta=rng.uniform(0.1, 1.5), heat=rng.uniform(0.0, 4.0)) for _ in placements]
+    return placements, states
+
+
+def rasters(rng):
+    return (
+        rng.uniform(0.0, 2.0, (ROWS, COLS)),
+        rng.uniform(0.5, 1.5, (ROWS, COLS)),
+        (rng.random((ROWS, COLS)) < 0.2).astype(float),
+    )
+
+
+class DomainDecompositionTests(unittest.TestCase):
+    def test_serial_tick_matches_scalar_windows_and_coupling(self) -> None:
+        # step_protein_map is this module's reference; it is checked against
+        # a per-tower scalar definition, not against ProteinFieldFrame, whose
+        # prefix sums round differently (see the module docstring).
+        placements, states = random_map(1)
+        layout = MapLayout.build(placements, (ROWS, COLS))
+        density, speed, wall = rasters(np.random.default_rng(1))
+        fleet = ProteinFleetState.from_states(states)
+
+        tick = step_protein_map(fleet, density, speed, wall, layout, 4, 0.3, CONFIG)
+
+        size = CONFIG.local_sample_size
+        means, laplacians = [], []
+        for p in placements:
+            r0, r1 = max(0, p.y - size // 2), min(ROWS, p.y - size // 2 + size)
+            c0, c1 = max(0, p.x - size // 2), min(COLS, p.x - size // 2 + size)
+            sums = [0.0, 0.0, 0.0]
+            for r in range(r0, r1):
+                for c in range(c0, c1):
+                    for k, raster in enumerate((density, speed, wall)):
+                        sums[k] += float(raster[r, c])
+            means.append([total / max(1, (r1 - r0) * (c1 - c0)) for total in sums])
+            cy, cx = r0 + (r1 - r0) // 2, c0 + (c1 - c0) // 2
+            interior = r1 - r0 >= 3 and c1 - c0 >= 3 and 1 <= cy <= ROWS - 2 and 1 <= cx <= COLS - 2
+            d = density
+            laplacians.append(
+                float(d[cy - 1, cx] + d[cy + 1, cx] + d[cy, cx - 1] + d[cy, cx + 1] - 4.0 * d[cy, cx]) if interior else 0.0
+            )
+        columns = np.array(means).T
+        stepped = step_protein_fleet_from_fields(fleet, *columns, np.array(laplacians), 4, 0.3, CONFIG)
+        coupled = synthesize_protein_cluster(stepped.state.to_states(), placements)
+
+        self.assertEqual(tick.damage.tobytes(), stepped.damage.tobytes())
+        self.assertEqual(tick.state.theta.tolist(), [s.theta for s in coupled])
+        self.assertEqual(tick.state.heat.tolist(), [s.heat for s in coupled])
+        self.assertEqual(tick.state.collapsed.tolist(), [s.collapsed for s in coupled])
+
+    def test_bands_own_every_tower_once_with_local_halos(self) -> None:
+        placements, _ = random_map(2)
+        layout = MapLayout.build(placements, (ROWS, COLS))
+        bands = partition_bands(layout, 4, CONFIG.local_sample_size)
+        self.assertEqual(len(bands), 4)
+        self.assertEqual(sorted(np.concatenate([b.owned for b in bands]).tolist()), list(range(len(layout))))
+        for band in bands:
+            if len(band.halo):
+                gap = np.minimum(np.abs(layout.ys[band.halo] - band.row_start), np.abs(layout.ys[band.halo] - (band.row_stop - 1)))
+                self.assertLessEqual(gap.max(), layout.coupling_range_tiles)
+            self.assertLessEqual(band.raster_rows[0], band.row_start)
+            self.assertLessEqual(band.raster_rows[1] - band.raster_rows[0], band.row_stop - band.row_start + CONFIG.local_sample_size)
+
+    def test_parallel_ticks_are_identical_to_serial(self) -> None:
+        placements, states = random_map(3)
+        layout = MapLayout.build(placements, (ROWS, COLS))
+        rng = np.random.default_rng(3)
+        frames = [rasters(rng) for _ in range(4)]
+
+        serial = ProteinFleetState.from_states(states)
+        damages = []
+        for wave, frame in enumerate(frames, start=1):
+            tick = step_protein_map(serial, *frame, layout, wave, 0.1 * wave, CONFIG)
+            serial, damages = tick.state, damages + [tick.damage]
+
+        for workers in (1, 3, 5):
+            with ParallelProteinMap(layout, workers, states, CONFIG) as parallel:
+                for wave, (density, speed, wall) in enumerate(frames, start=1):
+                    parallel.creep_density[:] = density
+                    parallel.flow_speed[:] = speed
+                    parallel.wall_block[:] = wall
+                    parallel.tick(wave, 0.1 * wave)
+                    self.assertEqual(parallel.damage.tobytes(), damages[wave - 1].tobytes(), f"workers={workers}")
+                result = parallel.state()
+            self.assertEqual(result.theta.tobytes(), serial.theta.tobytes(), f"workers={workers}")
+            self.assertEqual(result.heat.tobytes(), serial.heat.tobytes())
+            self.assertEqual(result.collapsed.tolist(), serial.collapsed.tolist())
+
+    def test_spawned_workers_match_serial(self) -> None:
+        placements, states = random_map(4)
+        layout = MapLayout.build(placements, (ROWS, COLS))
+        density, speed, wall = rasters(np.random.default_rng(4))
+        serial = step_protein_map(ProteinFleetState.from_states(states), density, speed, wall, layout, 2, 0.2, CONFIG)
+
+        with ParallelProteinMap(layout, 2, states, CONFIG, start_method="spawn") as parallel:
+            parallel.creep_density[:] = density
+            parallel.flow_speed[:] = speed
+            parallel.wall_block[:] = wall
+            parallel.tick(2, 0.2)
+            self.assertEqual(parallel.damage.tobytes(), serial.damage.tobytes())
+            self.assertEqual(parallel.state().theta.tobytes(), serial.state.theta.tobytes())
+
+    def test_dead_worker_and_failed_startup_free_the_shared_block(self) -> None:
+        placements, states = random_map(5)
+        layout = MapLayout.build(placements, (ROWS, COLS))
+        created = []
+
+        class RecordingSharedMemory(SharedMemory):
+            def __init__(self, *args, **kwargs) -> None:
+                super().__init__(*args, **kwargs)
+                created.append(self.name)
+
+        with mock.patch("simulation.domain_decomposition.SharedMemory", RecordingSharedMemory):
+            parallel = ParallelProteinMap(layout, 3, states, CONFIG)
+            parallel._workers[1].kill()
+            parallel._workers[1].join()
+            with self.assertRaises(RuntimeError):
+                parallel.tick(1, 0.0)
+            with self.assertRaises(ValueError):
+                parallel.tick(1, 0.0)
+            with self.assertRaises(ValueError):
+                ParallelProteinMap(layout, 2, states, CONFIG, start_method="no-such-method")
+            # Wrong state counts are rejected before any shared block is allocated.
+            for wrong in (states[:1], [], states + states):
+                with self.assertRaises(ValueError):
+                    ParallelProteinMap(layout, 2, wrong, CONFIG)
+
+        self.assertEqual(len(created), 2)
+        for name in created:
+            with self.assertRaises(FileNotFoundError):
+                SharedMemory(name=name)
+
+    def test_rejects_off_map_placements(self) -> None:
+        with self.assertRaises(ValueError):
+            MapLayout.build([TowerPlacement(COLS, 0)], (ROWS, COLS))
+
+
+if __name__ == "__main__":
+    unittest.main()
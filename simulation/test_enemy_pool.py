@@ -0,0 +1,70 @@
+"""Parity and recycling checks for the array-backed enemy pool."""
+
+import unittest
+
+import numpy as np
+
+from simulation.basic_mechanics import (
+    CoreRules,
+    EnemySnapshot,
+    apply_damage,
+    enemy_hp_for_wave,
+    is_enemy_defeated,
+    reward_for_kill,
+    step_enemy,
+)
+from simulation.enemy_pool import EnemyPool
+
+
+class EnemyPoolTests(unittest.TestCase):
+    def test_advance_and_damage_match_snapshot_helpers(self) -> None:
+        rng = np.random.default_rng(2)
+        enemies = [
+            EnemySnapshot(hp=float(hp), progress_px=float(p), speed_px_s=float(s))
+            for hp, p, s in zip(rng.uniform(10, 200, 50), rng.uniform(0, 300, 50), rng.uniform(40, 120, 50))
+        ]
+        pool = EnemyPool.from_snapshots(enemies)
+
+        for _ in range(20):
+            damage = rng.uniform(0.0, 15.0, 50)
+            enemies = [apply_damage(step_enemy(e, 0.05), float(d)) for e, d in zip(enemies, damage)]
+            pool.advance(0.05)
+            pool.apply_damage(damage)
+
+        for slot, enemy in enumerate(enemies):
+            self.assertEqual(pool.snapshot(slot), enemy)
+            self.assertEqual(bool(pool.defeated()[slot]), is_enemy_defeated(enemy))
+
+    def test_kills_pay_wave_reward_and_recycle_slots(self) -> None:
+        rules = CoreRules()
+        pool = EnemyPool(capacity=8)
+        slots = pool.spawn(6, wave_index=3, rules=rules)
+        self.assertEqual(slots.tolist(), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(pool.hp[0], enemy_hp_for_wave(3, rules))
+
+        pool.apply_damage_at(np.array([1, 4, 4]), np.array([1e6, 1e6, 1.0]))
+        defeated = pool.defeated()
+        sweep = pool.collect_defeated(wave_index=3, rules=rules)
+        pool.collect_leaked(path_length_px=1e9)
+        self.assertEqual(np.flatnonzero(defeated).tolist(), [1, 4])
+        self.assertEqual(sweep.count, 2)
+        self.assertEqual(sweep.reward, 2 * reward_for_kill(3, rules))
+        self.assertEqual(len(pool), 4)
+
+        self.assertEqual(pool.spawn(3, wave_index=3, rules=rules).tolist(), [1, 4, 6])
+        self.assertEqual(pool.capacity, 8)
+
+    def test_leaks_and_growth(self) -> None:
+        rules = CoreRules()
+        pool = EnemyPool(capacity=2)
+        pool.spawn(5, wave_index=1, rules=rules)
+        self.assertGreaterEqual(pool.capacity, 5)
+        pool.progress[[0, 3]] = 500.0
+        self.assertEqual(pool.collect_leaked(path_length_px=400.0).count, 2)
+        self.assertFalse(pool.alive[0])
+        with self.assertRaises(ValueError):
+            pool.snapshot(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Incremental repair checks for the creep flow field."""
+
+import random
+import unittest
+from math import inf
+
+from simulation.flow_field import FlowField
+
+
+def random_walls(rng: random.Random, width: int, height: int) -> list[list[float]]:
+    return [
+        [1.0 if rng.random() < 0.12 else rng.choice((0.0, 0.0, 0.25, 0.5)) for _ in range(width)]
+        for _ in range(height)
+    ]
+
+
+def rebuilt(walls: list[list[float]], goals, towers) -> FlowField:
+    blocked = [list(row) for row in walls]
+    for x, y in towers:
+        blocked[y][x] = 1.0
+    return FlowField(blocked, goals)
+
+
+class FlowFieldTests(unittest.TestCase):
+    def test_incremental_repair_matches_full_recompute(self) -> None:
+        rng = random.Random(12)
+        width, height = 24, 18
+        walls = random_walls(rng, width, height)
+        goals = [(width - 1, height // 2), (width - 1, height // 2 + 1)]
+        for gx, gy in goals:
+            walls[gy][gx] = 0.0
+        field = FlowField(walls, goals)
+        towers: list[tuple[int, int]] = []
+
+        for _ in range(150):
+            if towers and rng.random() < 0.4:
+                tile = towers.pop(rng.randrange(len(towers)))
+                field.remove_tower(*tile)
+            else:
+                tile = (rng.randrange(width), rng.randrange(height))
+                if tile in goals or tile in towers or walls[tile[1]][tile[0]] >= 1.0:
+                    continue
+                towers.append(tile)
+                field.place_tower(*tile)
+            self.assertEqual(field.dist, rebuilt(walls, goals, towers).dist)
+
+    def test_what_if_matches_commit_and_leaves_field_untouched(self) -> None:
+        walls = [[0.0] * 9 for _ in range(5)]
+        field = FlowField(walls, goals=[(8, 2)])
+        before = list(field.dist)
+        candidates = [(4, 2), (4, 0), (0, 2)]
+
+        impacts = field.what_if(candidates, spawns=[(0, 2)])
+
+        self.assertEqual(field.dist, before)
+        self.assertGreater(impacts[0].distance_delta, 0.0)
+        self.assertEqual(impacts[1].distance_delta, 0.0)
+        self.assertFalse(impacts[1].blocked)
+        self.assertTrue(impacts[2].blocked)
+        field.place_tower(4, 2)
+        self.assertEqual(field.distance(0, 2), impacts[0].spawn_distance)
+        mixed = field.what_if([(8, 2), (4, 2), (9, 0), (-1, 0), (4, 0)], spawns=[(0, 2)])
+        self.assertEqual([impact.feasible for impact in mixed], [False, False, False, False, True])
+        for impact in mixed[:4]:
+            self.assertEqual((impact.distance_delta, impact.tiles_touched), (0.0, 0))
+            self.assertEqual(impact.spawn_distance, field.distance(0, 2))
+
+        for y in (0, 1, 3, 4):
+            field.place_tower(4, y)
+        cut_off = field.what_if([(2, 2)], spawns=[(0, 2)])[0]
+        self.assertTrue(cut_off.blocked)
+        self.assertEqual(cut_off.distance_delta, 0.0)
+
+    def test_full_wall_cuts_off_spawn_and_creeps_follow_descent(self) -> None:
+        walls = [[0.0] * 5 for _ in range(3)]
+        field = FlowField(walls, goals=[(4, 1)])
+        self.assertEqual(field.next_step(0, 1), (1, 1))
+        for y in range(3):
+            field.place_tower(2, y)
+        self.assertEqual(field.distance(0, 1), inf)
+        self.assertIsNone(field.next_step(0, 1))
+        field.remove_tower(2, 0)
+        self.assertEqual(field.distance(0, 1), rebuilt(walls, [(4, 1)], [(2, 1), (2, 2)]).distance(0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
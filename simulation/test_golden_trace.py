@@ -0,0 +1,88 @@
+"""Checks for the golden-trace writer and streaming comparator."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from simulation.golden_trace import GoldenTrace, TraceWriter, compare_traces, write_reference_trace
+from simulation.protein_tower import LocalFlowState, ProteinTowerState, step_protein_tower
+from simulation.thermal_reference import simulate_heat_curve
+
+
+def copy_trace(source: Path, target: Path) -> GoldenTrace:
+    shutil.copyfile(source, target)
+    return GoldenTrace(np.memmap(target, dtype=np.uint8, mode="r+"))
+
+
+class GoldenTraceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        rng = np.random.default_rng(3)
+        self.fires = rng.random((4, 300)) < 0.5
+        self.flows = [
+            LocalFlowState(
+                creep_density=rng.random((5, 5)).tolist(),
+                flow_speed=rng.random((5, 5)).tolist(),
+                wall_block=[[0.0] * 5 for _ in range(5)],
+            )
+            for _ in range(4)
+        ]
+        self.reference = write_reference_trace(self.tmp / "ref.trace", self.fires, self.flows, dt=0.1, chunk_ticks=64)
+
+    def test_reference_trace_matches_scalar_models(self) -> None:
+        trace = self.reference
+        self.assertEqual((trace.towers, trace.ticks, trace.dt), (4, 300, 0.1))
+        curve = simulate_heat_curve(self.fires[2].tolist(), 0.1)
+        self.assertEqual(trace.column("heat")[:, 2].tolist(), [s.heat for s in curve])
+        self.assertEqual(trace.column("overheated")[:, 2].tolist(), [s.overheated for s in curve])
+
+        state = ProteinTowerState()
+        for tick in range(5):
+            result = step_protein_tower(state, self.flows[1], 0, 0.0)
+            state = result.state
+            self.assertEqual(trace.column("theta")[tick, 1], state.theta)
+            self.assertEqual(trace.column("damage")[tick, 1], result.damage)
+
+    def test_comparator_reports_first_divergence_across_chunks(self) -> None:
+        identical = copy_trace(self.tmp / "ref.trace", self.tmp / "same.trace")
+        self.assertTrue(compare_traces(self.reference, identical, chunk_elements=28).matches)
+
+        actual = copy_trace(self.tmp / "ref.trace", self.tmp / "engine.trace")
+        actual.column("theta")[250, 3] += 1e-12
+        actual.column("damage")[201, 0] += 0.5
+        actual.column("overheated")[260, 1] ^= True
+
+        # Budgets below one tick, off a tick boundary, and past the whole trace.
+        for chunk in (1, 6, 30, 256, 4000):
+            result = compare_traces(self.reference, actual, chunk_elements=chunk)
+            self.assertEqual((result.first_divergence.tick, result.first_divergence.tower), (201, 0))
+            self.assertEqual(result.first_divergence.column, "damage")
+            stats = {c.name: c for c in result.columns}
+            self.assertEqual(stats["theta"].mismatches, 0)
+            self.assertAlmostEqual(stats["theta"].max_abs_error, 1e-12, delta=1e-14)
+            self.assertEqual((stats["damage"].mismatches, stats["damage"].worst_tick), (1, 201))
+            self.assertAlmostEqual(stats["damage"].max_abs_error, 0.5)
+            self.assertEqual(stats["overheated"].mismatches, 1)
+
+        strict = compare_traces(self.reference, actual, atol=0.0)
+        self.assertEqual({c.name: c.mismatches for c in strict.columns}["theta"], 1)
+
+    def test_writer_validates_shape_and_length(self) -> None:
+        writer = TraceWriter(self.tmp / "short.trace", towers=2, ticks=3, dt=0.1)
+        with self.assertRaises(ValueError):
+            writer.append(np.zeros(3), np.zeros(3, bool), np.zeros(3), np.zeros(3))
+        writer.append(np.zeros((2, 2)), np.zeros((2, 2), bool), np.zeros((2, 2)), np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            writer.append(np.zeros((2, 2)), np.zeros((2, 2), bool), np.zeros((2, 2)), np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            writer.close()
+        with self.assertRaises(ValueError):
+            GoldenTrace(np.zeros(16, dtype=np.uint8))
+
+
+if __name__ == "__main__":
+    unittest.main()
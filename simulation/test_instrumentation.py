@@ -0,0 +1,87 @@
+"""Checks for opt-in stage instrumentation of the simulation modules."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from simulation import protein_tower, thermal_reference
+from simulation.instrumentation import STAGES, Profiler, disable, enable, profiling
+
+
+def uniform_flow(value: float) -> protein_tower.LocalFlowState:
+    grid = [[value] * 8 for _ in range(8)]
+    return protein_tower.LocalFlowState(creep_density=grid, flow_speed=grid, wall_block=grid)
+
+
+class InstrumentationTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        disable()
+
+    def test_stages_are_counted_through_module_calls(self) -> None:
+        placements = [protein_tower.TowerPlacement(x, 0) for x in range(4)]
+        with profiling() as profiler:
+            for _ in range(3):
+                with profiler.tick():
+                    thermal_reference.simulate_heat_curve([True] * 10, dt=0.1)
+                    protein_tower.step_protein_tower(protein_tower.ProteinTowerState(), uniform_flow(0.5), 2, 0.1)
+                    protein_tower.synthesize_protein_cluster([protein_tower.ProteinTowerState()] * 4, placements)
+                    protein_tower.detect_protein_patterns(placements)
+
+        totals = profiler.stage_totals()
+        self.assertEqual(profiler.calls["thermal_reference.TowerThermalState.step"].calls, 30)
+        self.assertEqual(profiler.calls["protein_tower._center_laplacian"].calls, 3)
+        self.assertEqual(profiler.calls["protein_tower.ProteinNeighborIndex.build"].calls, 3)
+        self.assertEqual(totals["patterns"]["calls"], 3)
+        self.assertEqual(profiler.ticks, 3)
+        self.assertEqual(sum(profiler.tick_histogram.values()), 3)
+
+    def test_disable_restores_original_functions(self) -> None:
+        original_step = thermal_reference.TowerThermalState.__dict__["step"]
+        original_build = protein_tower.ProteinNeighborIndex.__dict__["build"]
+        original_detect = protein_tower.detect_protein_patterns
+
+        enable()
+        self.assertIsNot(protein_tower.detect_protein_patterns, original_detect)
+        with self.assertRaises(RuntimeError):
+            enable()
+        disable()
+
+        self.assertIs(protein_tower.detect_protein_patterns, original_detect)
+        self.assertIs(thermal_reference.TowerThermalState.__dict__["step"], original_step)
+        self.assertIs(protein_tower.ProteinNeighborIndex.__dict__["build"], original_build)
+
+    def test_failed_enable_rolls_back_installed_wrappers(self) -> None:
+        original_step = thermal_reference.TowerThermalState.__dict__["step"]
+        original_detect = protein_tower.detect_protein_patterns
+        broken = dict(STAGES, zz_missing=(("simulation.protein_tower", "no_such_function"),))
+
+        with mock.patch.dict(STAGES, broken, clear=True):
+            with self.assertRaises(AttributeError):
+                enable()
+
+        self.assertIs(protein_tower.detect_protein_patterns, original_detect)
+        self.assertIs(thermal_reference.TowerThermalState.__dict__["step"], original_step)
+        enable()
+        self.assertIsNot(protein_tower.detect_protein_patterns, original_detect)
+
+    def test_exports_json_and_chrome_trace(self) -> None:
+        profiler = Profiler()
+        with profiling(profiler):
+            with profiler.stage("custom"):
+                thermal_reference.simulate_heat_curve([True, False], dt=0.1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler.write_json(Path(tmp) / "stats.json")
+            profiler.write_chrome_trace(Path(tmp) / "trace.json")
+            stats = json.loads((Path(tmp) / "stats.json").read_text())
+            trace = json.loads((Path(tmp) / "trace.json").read_text())
+
+        self.assertIn("custom", stats["stages"])
+        self.assertTrue(all(event["ph"] == "X" for event in trace["traceEvents"]))
+        self.assertIn("thermal_reference.simulate_heat_curve", {event["name"] for event in trace["traceEvents"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
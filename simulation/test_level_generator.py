@@ -0,0 +1,110 @@
+"""Checks for the Python port of the seeded level generator."""
+
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from simulation.level_generator import (
+    BOARD_SIZE,
+    GodotRNG,
+    LevelCorpus,
+    decode_level,
+    encode_level,
+    generate_level,
+    hash_seed,
+    write_level_corpus,
+)
+
+
+class LevelGeneratorTests(unittest.TestCase):
+    def test_rng_and_seed_hash_follow_the_engine(self) -> None:
+        # Reference output of pcg32_srandom_r(42, 54) from the PCG demo program.
+        rng = GodotRNG(42, 54)
+        self.assertEqual([rng.rand() for _ in range(3)], [0xA15C02B7, 0x7B47F409, 0xBA1D3330])
+        self.assertEqual(hash_seed("abc"), (97 * 31 + 98) * 31 + 99)
+        self.assertEqual(hash_seed(""), 1)
+
+        rng = GodotRNG(7)
+        for _ in range(200):
+            self.assertTrue(-8.0 <= rng.randf_range(-8.0, 8.0) <= 8.0)
+            self.assertIn(rng.randi_range(-18, 26), range(-18, 27))
+            value = rng.randf()
+            self.assertEqual(value, float(np.float32(value)))
+
+    def test_levels_are_deterministic_and_well_formed(self) -> None:
+        for seed, level in (("XODEX", 0), (12345, 200), ("night-run", 1000)):
+            config = generate_level(seed, level)
+            self.assertEqual(config, generate_level(seed, level))
+            board = config.board
+            self.assertEqual(board.path_tiles[0], board.spawn_tile)
+            self.assertEqual(board.path_tiles[-1], board.exit_tile)
+            self.assertFalse(set(board.walls) & set(board.path_tiles))
+            self.assertTrue(0.15 <= board.wall_density <= 0.35)
+            occupied = set(board.walls) | set(board.path_tiles)
+            for cx, cy in board.tower_nodes:
+                footprint = {(int(cx) - 1 + dx, int(cy) - 1 + dy) for dx in (0, 1) for dy in (0, 1)}
+                self.assertFalse(footprint & occupied)
+            for a in board.tower_nodes:
+                for b in board.tower_nodes:
+                    if a != b:
+                        self.assertGreaterEqual((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2, 9)
+            self.assertEqual(board.wall_grid().sum(), len(board.walls))
+            self.assertEqual(board.wall_grid().shape, (BOARD_SIZE, BOARD_SIZE))
+            self.assertEqual(decode_level(encode_level(config)), config)
+        self.assertNotEqual(generate_level("XODEX", 1).board, generate_level("XODEX", 0).board)
+
+    def test_golden_board(self) -> None:
+        # Pinned from this port for seed label "XODEX", level 0, with the
+        # default shuffle RNG. It guards against drift in the draw order; no
+        # Godot build is available here, so it has not been checked against
+        # the engine. Replace it with an on-device capture of
+        # `get_level_config()` when one is available.
+        config = generate_level("XODEX", 0)
+        board = config.board
+        self.assertEqual(config.seed, 83690912)
+        self.assertEqual((config.wave_count, config.enemies_per_wave), (2, 9))
+        self.assertEqual(config.enemy_speed, 97.45039939880371)
+        self.assertEqual(board.wall_density, 0.1904466450214386)
+        self.assertEqual((board.spawn_tile, board.exit_tile), ((0, 70), (79, 7)))
+        self.assertEqual(board.path_tiles[:6], ((0, 70), (0, 69), (0, 68), (1, 68), (2, 68), (3, 68)))
+        self.assertEqual((len(board.path_tiles), len(board.walls), len(board.tower_nodes)), (147, 1214, 122))
+        self.assertEqual(board.tower_nodes[:3], ((34.0, 2.0), (12.0, 3.0), (26.0, 3.0)))
+        self.assertEqual(hashlib.sha256(board.wall_grid().tobytes()).hexdigest()[:16], "8041dee22e260386")
+
+    def test_corpus_lookup_is_independent_of_workers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seeds = ["alpha", "beta", 99, 4242]
+            inline, pooled = Path(tmp) / "inline.lvls", Path(tmp) / "pooled.lvls"
+            self.assertEqual(write_level_corpus(inline, seeds, (0, 5), max_workers=1), 8)
+            write_level_corpus(pooled, seeds, (0, 5), max_workers=2, chunk_size=3)
+            self.assertEqual(inline.read_bytes(), pooled.read_bytes())
+
+            corpus = LevelCorpus.open(inline)
+            self.assertEqual(len(corpus), 8)
+            self.assertEqual(corpus.get("beta", 5), generate_level("beta", 5))
+            self.assertEqual(corpus.get(99), generate_level(99, 0))
+            self.assertIn((hash_seed("alpha"), 0), corpus)
+            run_seeds = [hash_seed(s) if isinstance(s, str) else s for s in seeds]
+            self.assertEqual(sorted(corpus.keys()), sorted((s, level) for s in run_seeds for level in (0, 5)))
+            with self.assertRaises(KeyError):
+                corpus.get("gamma")
+            # Level indices clamp the way generate_level clamps them.
+            self.assertEqual(corpus.get(99, -1), generate_level(99, 0))
+            self.assertIn((99, -7), corpus)
+            self.assertEqual(generate_level(4242, 5000).level_index, 1000)
+            with self.assertRaises(ValueError):
+                corpus.get(1 << 32)
+            with self.assertRaises(ValueError):
+                corpus.get(-1)
+            self.assertNotIn((-1, 0), corpus)
+            with self.assertRaises(ValueError):
+                write_level_corpus(Path(tmp) / "wide.lvls", [1 << 40], max_workers=1)
+            with self.assertRaises(ValueError):
+                write_level_corpus(Path(tmp) / "dup.lvls", [1, 1], max_workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
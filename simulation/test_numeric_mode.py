@@ -0,0 +1,81 @@
+"""Checks for float32 and fixed-point modes of the batched engines."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from simulation.golden_trace import compare_traces, write_batched_trace, write_reference_trace
+from simulation.numeric_mode import FIXED, FLOAT32, FLOAT64, mode_of, numeric_mode
+from simulation.protein_batch import ProteinFleetState, step_protein_fleet
+from simulation.protein_tower import LocalFlowState, ProteinTowerState, TowerPlacement
+from simulation.thermal_batch import ThermalParamArrays, simulate_heat_curves
+from simulation.tower_fleet import TowerFleet
+
+
+class NumericModeTests(unittest.TestCase):
+    def test_encode_decode_and_lookup(self) -> None:
+        self.assertEqual(FIXED.encode(1.5).item(), 3 << 15)
+        self.assertEqual(FIXED.decode(FIXED.mul(FIXED.encode(2.5), FIXED.encode(-1.25))).item(), -3.125)
+        self.assertIs(numeric_mode("float32"), FLOAT32)
+        self.assertIs(mode_of(np.zeros(2, dtype=np.int32)), FIXED)
+        with self.assertRaises(ValueError):
+            numeric_mode("float16")
+        with self.assertRaises(ValueError):
+            mode_of(np.zeros(2, dtype=np.int8))
+
+    def test_thermal_modes_track_float64(self) -> None:
+        fires = np.random.default_rng(1).random((64, 400)) < 0.45
+        reference = simulate_heat_curves(fires, dt=0.1)
+        for mode, tolerance, min_agreement in ((FLOAT32, 1e-3, 0.999), (FIXED, 400 * 2.0**-17, 0.95)):
+            curves = simulate_heat_curves(fires, dt=0.1, mode=mode)
+            self.assertEqual(curves.heat.dtype, mode.dtype)
+            self.assertEqual(curves.heat.nbytes * 2, reference.heat.nbytes)
+            agree = curves.overheated == reference.overheated
+            error = np.abs(mode.decode(curves.heat) - reference.heat)
+            # Rounding can move a tower across a threshold; its curve then diverges for a while.
+            self.assertGreater(agree.mean(), min_agreement)
+            self.assertLess(np.median(error), tolerance)
+        self.assertEqual(ThermalParamArrays.from_params(None, 3, "fixed").mode, FIXED)
+
+    def test_protein_modes_track_float64(self) -> None:
+        rng = np.random.default_rng(2)
+        grids = rng.random((3, 50, 8, 8))
+        states = [ProteinTowerState(theta=rng.uniform(0.2, 1.0)) for _ in range(50)]
+        results = {}
+        for mode in (FLOAT64, FLOAT32, FIXED):
+            state = ProteinFleetState.from_states(states, mode)
+            for _ in range(5):
+                tick = step_protein_fleet(state, grids[0], grids[1], grids[2], 4, 0.3)
+                state = tick.state
+            self.assertEqual(state.theta.dtype, mode.dtype)
+            self.assertEqual(tick.damage.dtype, mode.dtype)
+            results[mode.name] = (mode.decode(state.theta), mode.decode(tick.damage))
+        for name, tolerance in (("float32", 1e-5), ("fixed", 1e-3)):
+            np.testing.assert_allclose(results[name][0], results["float64"][0], atol=tolerance)
+            np.testing.assert_allclose(results[name][1], results["float64"][1], atol=tolerance)
+
+    def test_fleet_and_traces_in_reduced_modes(self) -> None:
+        fleet = TowerFleet.from_towers([TowerPlacement(x, 0) for x in range(4)], mode="float32")
+        self.assertEqual(fleet.theta.dtype, np.float32)
+        fleet.couple(fleet.neighbor_index(1.0))
+        self.assertAlmostEqual(fleet.protein_state(1).heat, 0.3, places=6)
+        with self.assertRaises(ValueError):
+            fleet.step_thermal(np.ones(4, bool), 0.1, ThermalParamArrays.from_params(None, 4))
+
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        rng = np.random.default_rng(5)
+        fires = rng.random((3, 200)) < 0.5
+        flows = [LocalFlowState(g.tolist(), g.tolist(), (g * 0).tolist()) for g in rng.random((3, 5, 5))]
+        reference = write_reference_trace(tmp / "ref.trace", fires, flows, dt=0.1)
+        self.assertTrue(compare_traces(reference, write_batched_trace(tmp / "f64.trace", fires, flows, 0.1, FLOAT64)).matches)
+        drift = compare_traces(reference, write_batched_trace(tmp / "f32.trace", fires, flows, 0.1, FLOAT32))
+        self.assertIsNotNone(drift.first_divergence)
+        self.assertLess({c.name: c for c in drift.columns}["theta"].max_abs_error, 1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
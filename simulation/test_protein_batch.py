@@ -0,0 +1,60 @@
+"""Parity checks between the fleet Protein Tower step and the scalar reference."""
+
+import random
+import unittest
+
+import numpy as np
+
+from simulation.protein_batch import ProteinFleetState, step_protein_fleet
+from simulation.protein_tower import LocalFlowState, ProteinTowerConfig, ProteinTowerState, step_protein_tower
+
+
+class ProteinBatchTests(unittest.TestCase):
+    def test_fleet_step_matches_scalar_step(self) -> None:
+        rng = np.random.default_rng(4)
+        py_rng = random.Random(4)
+        config = ProteinTowerConfig(instability_threshold=3.0, heat_per_tick=1.1)
+        towers = 64
+        states = [
+            ProteinTowerState(
+                theta=py_rng.uniform(0.0, 2.0),
+                heat=py_rng.uniform(0.0, 4.0),
+                collapsed=py_rng.random() < 0.3,
+            )
+            for _ in range(towers)
+        ]
+        fleet = ProteinFleetState.from_states(states)
+        escape = rng.uniform(0.0, 1.0, towers)
+
+        for wave in (1, 4, 30):
+            density = rng.uniform(0.0, 2.0, (towers, 8, 8))
+            speed = rng.uniform(0.5, 1.5, (towers, 8, 8))
+            wall = rng.uniform(0.0, 1.0, (towers, 8, 8))
+
+            tick = step_protein_fleet(fleet, density, speed, wall, wave, escape, config)
+            for i, state in enumerate(states):
+                flow = LocalFlowState(density[i].tolist(), speed[i].tolist(), wall[i].tolist())
+                expected = step_protein_tower(state, flow, wave, float(escape[i]), config)
+                self.assertAlmostEqual(tick.state.theta[i], expected.state.theta, places=10)
+                self.assertAlmostEqual(tick.state.heat[i], expected.state.heat, places=10)
+                self.assertEqual(bool(tick.state.collapsed[i]), expected.state.collapsed)
+                self.assertAlmostEqual(tick.disruption_field[i], expected.disruption_field, places=10)
+                self.assertAlmostEqual(tick.curvature[i], expected.curvature, places=10)
+                self.assertAlmostEqual(tick.damage[i], expected.damage, places=10)
+
+            fleet = tick.state
+            states = fleet.to_states()
+
+    def test_small_windows_have_zero_curvature(self) -> None:
+        fleet = ProteinFleetState.from_states([ProteinTowerState()] * 2)
+        tick = step_protein_fleet(fleet, np.ones((2, 2, 2)), np.ones((2, 2, 2)), np.ones((2, 2, 2)), 1, 0.0)
+        self.assertEqual(tick.curvature.tolist(), [0.0, 0.0])
+
+    def test_rejects_misaligned_window_stack(self) -> None:
+        fleet = ProteinFleetState.from_states([ProteinTowerState()] * 3)
+        with self.assertRaises(ValueError):
+            step_protein_fleet(fleet, np.ones((2, 8, 8)), np.ones((3, 8, 8)), np.ones((3, 8, 8)), 1, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Parity checks for map-level Protein Tower field precomputation."""
+
+import random
+import unittest
+
+import numpy as np
+
+from simulation.protein_batch import ProteinFleetState
+from simulation.protein_field import ProteinFieldFrame, TowerWindows, step_protein_fleet_on_map
+from simulation.protein_tower import (
+    LocalFlowState,
+    ProteinTowerConfig,
+    ProteinTowerState,
+    TowerPlacement,
+    step_protein_tower,
+)
+
+
+def window(raster: np.ndarray, placement: TowerPlacement, size: int) -> list[list[float]]:
+    top = max(0, placement.y - size // 2)
+    left = max(0, placement.x - size // 2)
+    return raster[top : placement.y - size // 2 + size, left : placement.x - size // 2 + size].tolist()
+
+
+class ProteinFieldTests(unittest.TestCase):
+    def test_map_frame_matches_per_tower_windows(self) -> None:
+        rng = np.random.default_rng(9)
+        py_rng = random.Random(9)
+        config = ProteinTowerConfig(instability_threshold=4.0)
+        rows, cols = 40, 56
+        placements = [TowerPlacement(py_rng.randrange(cols), py_rng.randrange(rows)) for _ in range(80)]
+        placements += [TowerPlacement(0, 0), TowerPlacement(cols - 1, rows - 1), TowerPlacement(1, rows - 2)]
+        states = [ProteinTowerState(theta=py_rng.uniform(0.1, 1.5), heat=py_rng.uniform(0.0, 3.0)) for _ in placements]
+        fleet = ProteinFleetState.from_states(states)
+        windows = TowerWindows.centered(placements, (rows, cols), config.local_sample_size)
+
+        for wave in (2, 9):
+            density = rng.uniform(0.0, 2.0, (rows, cols))
+            speed = rng.uniform(0.5, 1.5, (rows, cols))
+            wall = (rng.random((rows, cols)) < 0.2).astype(float)
+            frame = ProteinFieldFrame.from_rasters(density, speed, wall)
+
+            tick = step_protein_fleet_on_map(fleet, frame, windows, wave, 0.3, config)
+            for i, (state, placement) in enumerate(zip(states, placements)):
+                size = config.local_sample_size
+                flow = LocalFlowState(
+                    window(density, placement, size), window(speed, placement, size), window(wall, placement, size)
+                )
+                expected = step_protein_tower(state, flow, wave, 0.3, config)
+                self.assertAlmostEqual(tick.curvature[i], expected.curvature, places=9)
+                self.assertAlmostEqual(tick.disruption_field[i], expected.disruption_field, places=9)
+                self.assertAlmostEqual(tick.damage[i], expected.damage, places=9)
+                self.assertAlmostEqual(tick.state.heat[i], expected.state.heat, places=9)
+                self.assertEqual(bool(tick.state.collapsed[i]), expected.state.collapsed)
+            fleet = tick.state
+            states = fleet.to_states()
+
+    def test_rejects_mismatched_rasters(self) -> None:
+        with self.assertRaises(ValueError):
+            ProteinFieldFrame.from_rasters(np.zeros((4, 4)), np.zeros((4, 5)), np.zeros((4, 4)))
+
+
+if __name__ == "__main__":
+    unittest.main()
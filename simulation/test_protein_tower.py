@@ -1,9 +1,14 @@
 """Regression checks for XODEX.PROTEIN_TOWER model behavior."""
 
+import random
 import unittest
+from math import dist
 
 from simulation.protein_tower import (
     LocalFlowState,
+    ProteinClusterTracker,
+    ProteinNeighborIndex,
+    ProteinPatternIndex,
     ProteinTowerConfig,
     ProteinTowerState,
     TokenTowerState,
@@ -24,6 +29,43 @@ def uniform_grid(value: float, size: int = 8) -> list[list[float]]:
     return [[value for _ in range(size)] for _ in range(size)]
 
 
+def pairwise_cluster(states, placements, eta, coupling_range, heat_gain):
+    """The original O(n^2) coupling loop, kept as the parity oracle."""
+
+    out = []
+    for i, state_i in enumerate(states):
+        blended, neighbors = state_i.theta, 0
+        for j, state_j in enumerate(states):
+            if i != j and dist((placements[i].x, placements[i].y), (placements[j].x, placements[j].y)) <= coupling_range:
+                blended += eta * (state_j.theta - state_i.theta)
+                neighbors += 1
+        out.append(ProteinTowerState(theta=max(0.0, blended), heat=state_i.heat + heat_gain * neighbors, collapsed=state_i.collapsed))
+    return out
+
+
+def coupled_components(placements, coupling_range):
+    """Connected components by flood fill over all pairs."""
+
+    remaining = set(placements)
+    components = []
+    while remaining:
+        frontier = [remaining.pop()]
+        component = set(frontier)
+        while frontier:
+            p = frontier.pop()
+            linked = {q for q in remaining if dist((p.x, p.y), (q.x, q.y)) <= coupling_range}
+            remaining -= linked
+            component |= linked
+            frontier.extend(linked)
+        components.append(frozenset(component))
+    return components
+
+
+def random_layout(rng: random.Random, count: int, span: int) -> list[TowerPlacement]:
+    tiles = rng.sample([(x, y) for x in range(span) for y in range(span)], count)
+    return [TowerPlacement(x, y) for x, y in tiles]
+
+
 class ProteinTowerTests(unittest.TestCase):
     def test_wave_alpha_scaling(self) -> None:
         config = ProteinTowerConfig(alpha_0=2.0)
@@ -117,6 +159,103 @@ class ProteinTowerTests(unittest.TestCase):
         self.assertLess(result[1].theta, states[1].theta)
         self.assertGreater(result[0].heat, states[0].heat)
 
+    def test_pattern_index_tracks_batch_detection_on_random_edits(self) -> None:
+        rng = random.Random(8)
+        for span in (6, 10, 16):
+            placed: list[TowerPlacement] = []
+            index = ProteinPatternIndex()
+            for _ in range(400):
+                if placed and rng.random() < 0.4:
+                    removed = placed.pop(rng.randrange(len(placed)))
+                    index.remove(removed)
+                else:
+                    # Occasional duplicates exercise the multiset counting.
+                    added = TowerPlacement(rng.randrange(span), rng.randrange(span))
+                    placed.append(added)
+                    index.add(added)
+                self.assertEqual(index.summary, detect_protein_patterns(placed))
+            self.assertEqual(ProteinPatternIndex(placed).summary, index.summary)
+            self.assertEqual(len(index), len(placed))
+
+    def test_pattern_index_rejects_unknown_removal(self) -> None:
+        index = ProteinPatternIndex([TowerPlacement(1, 1)])
+        self.assertIn(TowerPlacement(1, 1), index)
+        with self.assertRaises(ValueError):
+            index.remove(TowerPlacement(2, 2))
+
+    def test_neighbor_index_matches_pairwise_coupling(self) -> None:
+        rng = random.Random(3)
+        for coupling_range in (1.0, 1.5, 2.5, 3.0, 4.2):
+            placements = random_layout(rng, 150, 30)
+            states = [ProteinTowerState(theta=rng.uniform(0.0, 2.0), heat=rng.uniform(0.0, 5.0)) for _ in placements]
+            index = ProteinNeighborIndex.build(placements, coupling_range)
+
+            expected = pairwise_cluster(states, placements, 0.08, coupling_range, 0.15)
+            for _ in range(3):
+                result = synthesize_protein_cluster(
+                    states, placements, coupling_range_tiles=coupling_range, neighbor_index=index
+                )
+                self.assertEqual(result, expected)
+                states = result
+                expected = pairwise_cluster(states, placements, 0.08, coupling_range, 0.15)
+
+    def test_neighbor_index_rejects_mismatched_range(self) -> None:
+        placements = [TowerPlacement(0, 0), TowerPlacement(0, 2)]
+        index = ProteinNeighborIndex.build(placements, 3.0)
+        with self.assertRaises(ValueError):
+            synthesize_protein_cluster([ProteinTowerState()] * 2, placements, coupling_range_tiles=2.0, neighbor_index=index)
+
+    def test_neighbor_index_rejects_stale_layout_of_same_size(self) -> None:
+        index = ProteinNeighborIndex.build([TowerPlacement(0, 0), TowerPlacement(0, 2)], 3.0)
+        moved = [TowerPlacement(0, 0), TowerPlacement(9, 9)]
+        with self.assertRaises(ValueError):
+            synthesize_protein_cluster([ProteinTowerState()] * 2, moved, coupling_range_tiles=3.0, neighbor_index=index)
+
+    def test_cluster_tracker_matches_flood_fill_on_random_edits(self) -> None:
+        rng = random.Random(11)
+        for coupling_range in (1.0, 2.5):
+            tracker = ProteinClusterTracker(coupling_range_tiles=coupling_range)
+            theta: dict[TowerPlacement, float] = {}
+            for step in range(300):
+                free = [TowerPlacement(x, y) for x in range(14) for y in range(14) if TowerPlacement(x, y) not in theta]
+                if theta and rng.random() < 0.4:
+                    removed = rng.choice(sorted(theta, key=lambda p: (p.x, p.y)))
+                    del theta[removed]
+                    tracker.remove(removed)
+                else:
+                    added = rng.choice(free)
+                    theta[added] = rng.uniform(0.0, 1.0)
+                    tracker.add(added, theta[added])
+                if theta and step % 3 == 0:
+                    moved = rng.choice(list(theta))
+                    theta[moved] = rng.uniform(0.0, 1.0)
+                    tracker.set_theta(moved, theta[moved])
+
+                expected = coupled_components(list(theta), coupling_range)
+                self.assertEqual(set(tracker.clusters()), set(expected))
+                for component in expected:
+                    member = next(iter(component))
+                    states = [ProteinTowerState(theta=theta[p]) for p in component]
+                    self.assertAlmostEqual(tracker.cluster_theta(member), sum(s.theta for s in states), places=9)
+                    self.assertEqual(
+                        tracker.is_collapsed(member, 3.0), overcoupled_cluster_collapsed(states, theta_critical=3.0)
+                    )
+
+    def test_cluster_tracker_updates_and_rejects_unknown_towers(self) -> None:
+        placements = [TowerPlacement(0, 0), TowerPlacement(0, 2), TowerPlacement(9, 9)]
+        states = [ProteinTowerState(theta=2.0), ProteinTowerState(theta=2.2), ProteinTowerState(theta=1.0)]
+        tracker = ProteinClusterTracker(placements, states)
+        self.assertEqual(tracker.cluster_count, 2)
+        self.assertEqual(tracker.collapsed_clusters(4.0), [frozenset(placements[:2])])
+
+        tracker.update_states(placements, synthesize_protein_cluster(states, placements))
+        tracker.resync()
+        self.assertFalse(tracker.is_collapsed(placements[2], 4.0))
+        with self.assertRaises(ValueError):
+            tracker.add(placements[0])
+        with self.assertRaises(ValueError):
+            tracker.remove(TowerPlacement(5, 5))
+
     def test_pattern_multiplier_and_token_coupling_increase_field(self) -> None:
         summary = detect_protein_patterns([TowerPlacement(0, 0), TowerPlacement(1, 0), TowerPlacement(2, 0)])
         boosted = apply_pattern_field_multiplier(10.0, summary)
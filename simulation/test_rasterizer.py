@@ -0,0 +1,73 @@
+"""Checks for in-place enemy rasterization and zero-copy tower windows."""
+
+import tracemalloc
+import unittest
+from math import floor
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules
+from simulation.enemy_pool import EnemyPool
+from simulation.protein_field import TowerWindows
+from simulation.protein_tower import ProteinTowerState, TowerPlacement, step_protein_tower
+from simulation.rasterizer import FlowRasterizer
+from simulation.targeting import PathGeometry
+
+
+TILE_PX = 32.0
+
+
+class RasterizerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.path = PathGeometry.from_points([(16, 16), (16 + 32 * 20, 16), (16 + 32 * 20, 16 + 32 * 12), (16, 16 + 32 * 12)])
+        self.pool = EnemyPool(capacity=256)
+        rng = np.random.default_rng(1)
+        slots = self.pool.spawn(200, wave_index=2, rules=CoreRules())
+        self.pool.progress[slots] = rng.uniform(-50.0, self.path.length_px + 50.0, slots.size)
+        self.pool.speed[slots] = rng.uniform(40.0, 90.0, slots.size)
+        self.raster = FlowRasterizer(self.path, (14, 24), TILE_PX, capacity=256)
+
+    def expected(self) -> tuple[np.ndarray, np.ndarray]:
+        density = np.zeros((14, 24))
+        speed = np.zeros((14, 24))
+        for slot in np.flatnonzero(self.pool.alive):
+            progress = self.pool.progress[slot]
+            if not 0.0 <= progress < self.path.length_px:
+                continue
+            x, y = self.path.point_at(floor(progress / self.raster.bin_px) * self.raster.bin_px)
+            density[int(y // TILE_PX), int(x // TILE_PX)] += 1.0
+            speed[int(y // TILE_PX), int(x // TILE_PX)] += self.pool.speed[slot]
+        return density, np.divide(speed, density, out=np.zeros_like(speed), where=density > 0)
+
+    def test_rasterize_matches_per_enemy_binning(self) -> None:
+        self.raster.rasterize(self.pool)
+        density, speed = self.expected()
+        np.testing.assert_array_equal(self.raster.creep_density, density)
+        np.testing.assert_allclose(self.raster.flow_speed, speed)
+
+    def test_tower_windows_are_live_views(self) -> None:
+        windows = TowerWindows.centered([TowerPlacement(3, 0), TowerPlacement(20, 6)], (14, 24), 8)
+        flows = self.raster.bind_towers(windows)
+        self.assertTrue(np.shares_memory(flows[0].creep_density, self.raster.creep_density))
+
+        self.raster.rasterize(self.pool)
+        first = step_protein_tower(ProteinTowerState(), flows[1], 2, 0.1)
+        self.pool.advance(0.5)
+        self.raster.rasterize(self.pool)
+        second = step_protein_tower(ProteinTowerState(), flows[1], 2, 0.1)
+        self.assertNotEqual(first.disruption_field, second.disruption_field)
+
+    def test_steady_state_ticks_do_not_grow_memory(self) -> None:
+        self.raster.rasterize(self.pool)
+        tracemalloc.start()
+        baseline = tracemalloc.take_snapshot()
+        for _ in range(50):
+            self.pool.advance(0.05)
+            self.raster.rasterize(self.pool)
+        grown = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename"))
+        tracemalloc.stop()
+        self.assertLess(grown, 16_384)
+
+
+if __name__ == "__main__":
+    unittest.main()
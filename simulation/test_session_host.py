@@ -0,0 +1,244 @@
+"""Checks for batched lane sessions and the asyncio session host."""
+
+import asyncio
+import math
+import unittest
+from unittest import mock
+
+from simulation.protein_batch import step_protein_fleet
+from simulation.protein_tower import LocalFlowState, ProteinTowerState, step_protein_tower
+from simulation.session_host import LaneBatch, LaneConfig, SessionHost
+from simulation.thermal_batch import step_thermal_batch
+from simulation.thermal_reference import TowerThermalState
+from simulation.wave_tables import enemy_hp_at, enemy_speed_at, reward_at
+
+
+SMALL = LaneConfig(enemies_per_wave=12, waves=2, max_ticks_per_wave=500)
+
+
+def scalar_session(config, offsets, dt):
+    """One session stepped enemy by enemy and tower by tower."""
+
+    rules, stats, size = config.rules, config.tower, config.protein.local_sample_size
+    thermal = [TowerThermalState() for _ in offsets]
+    protein = [ProteinTowerState() for _ in offsets]
+    wave, kills, leaks, reward, escaped, ticks, first_overheat = 1, 0, 0, 0, 0.0, 0, None
+    heats = []
+    while wave <= config.waves:
+        speed = float(enemy_speed_at(wave, rules))
+        enemies = [[float(enemy_hp_at(wave, rules)), -float(delay) * speed, True] for delay in config.entry_delays()]
+        for _ in range(config.max_ticks_per_wave):
+            ticks += 1
+            for enemy in enemies:
+                if enemy[2]:
+                    enemy[1] += speed * dt
+            hits = []
+            for i, position in enumerate(offsets):
+                target, lead = None, -math.inf
+                counts, speeds = [0.0] * size, [0.0] * size
+                for j, (_, progress, alive) in enumerate(enemies):
+                    if not alive or progress < 0.0:
+                        continue
+                    if abs(progress - position) <= stats.range_px and progress > lead:
+                        target, lead = j, progress
+                    b = math.floor((progress - position) / config.tile_px + size / 2)
+                    if 0 <= b < size:
+                        counts[b] += 1
+                        speeds[b] += speed
+                empty = [0.0] * size
+                flow = LocalFlowState(
+                    creep_density=[empty, counts, empty],
+                    flow_speed=[empty, [s / max(c, 1) / rules.base_enemy_speed for s, c in zip(speeds, counts)], empty],
+                    wall_block=[empty, empty, empty],
+                )
+                tick = step_protein_tower(protein[i], flow, wave, escaped, config.protein)
+                protein[i] = tick.state
+                if target is not None:
+                    base = 0.0 if thermal[i].overheated else stats.damage * stats.fire_rate_per_second * dt
+                    hits.append((target, base + tick.damage))
+                thermal[i].step(dt=dt, fired=target is not None, params=config.thermal)
+            for j, damage in hits:
+                enemies[j][0] = max(0.0, enemies[j][0] - damage)
+            if first_overheat is None and any(t.overheated for t in thermal):
+                first_overheat = ticks
+            heats.append([t.heat for t in thermal])
+
+            escaped = 0.0
+            for enemy in enemies:
+                if enemy[2] and enemy[0] <= 0.0:
+                    enemy[2] = False
+                    kills += 1
+                    reward += int(reward_at(wave, rules))
+                elif enemy[2] and enemy[1] >= config.path_length_px:
+                    enemy[2] = False
+                    leaks += 1
+                    escaped += 1.0
+            if not any(enemy[2] for enemy in enemies):
+                break
+        leaks += sum(enemy[2] for enemy in enemies)
+        wave += 1
+    return {"kills": kills, "leaks": leaks, "reward": reward, "ticks": ticks, "first": first_overheat, "heats": heats}
+
+
+class LaneBatchTests(unittest.TestCase):
+    def test_rows_match_scalar_sessions(self) -> None:
+        layouts = [[300.0], [150.0, 400.0, 650.0], [], [500.0, 520.0, 540.0, 560.0, 580.0]]
+        batch = LaneBatch(SMALL, capacity=2)
+        for row, offsets in enumerate(layouts):
+            batch.reset(row, offsets)
+        heats = [[] for _ in layouts]
+        finished_at = {}
+        tick = 0
+        while batch.running[: batch.rows].any():
+            tick += 1
+            live = batch.running[: batch.rows].copy()
+            for row in batch.step(0, batch.rows, 0.05).tolist():
+                finished_at[row] = tick
+            for row, offsets in enumerate(layouts):
+                if live[row]:
+                    heats[row].append(batch.heat[row, : len(offsets)].tolist())
+
+        for row, offsets in enumerate(layouts):
+            expected = scalar_session(SMALL, offsets, 0.05)
+            summary = batch.summary(row, row)
+            self.assertTrue(summary.finished)
+            self.assertEqual(finished_at[row], expected["ticks"])
+            self.assertEqual(
+                (summary.kills, summary.leaks, summary.reward, summary.ticks, summary.first_overheat_tick),
+                (expected["kills"], expected["leaks"], expected["reward"], expected["ticks"], expected["first"]),
+                f"row {row}",
+            )
+            for got, want in zip(heats[row], expected["heats"]):
+                for a, b in zip(got, want):
+                    self.assertAlmostEqual(a, b, places=9)
+        self.assertGreater(batch.summary(3, 3).kills, batch.summary(0, 0).kills)
+
+    def test_placement_limits(self) -> None:
+        batch = LaneBatch(SMALL)
+        batch.reset(0)
+        for i in range(SMALL.rules.max_towers):
+            self.assertEqual(batch.place(0, 100.0 * i), i)
+        with self.assertRaises(ValueError):
+            batch.place(0, 10.0)
+        batch.reset(1)
+        with self.assertRaises(ValueError):
+            batch.place(1, SMALL.path_length_px + 1.0)
+
+
+class SessionHostTests(unittest.IsolatedAsyncioTestCase):
+    async def test_commands_apply_between_ticks(self) -> None:
+        host = SessionHost(SMALL, batch_size=2)
+        runner = asyncio.create_task(host.run())
+        ids = await asyncio.gather(*(host.open_session([200.0 * (i + 1)]) for i in range(5)))
+        self.assertEqual(sorted(ids), list(range(5)))
+        self.assertEqual(await host.place_tower(ids[0], 700.0), 1)
+        with self.assertRaises(ValueError):
+            await host.place_tower(99, 10.0)
+        with self.assertRaises(ValueError):
+            await host.open_session([-5.0])
+
+        summaries = await asyncio.wait_for(asyncio.gather(*(host.wait_finished(i) for i in ids)), timeout=30)
+        host.stop()
+        await runner
+
+        self.assertTrue(all(s.finished for s in summaries))
+        self.assertEqual([s.session_id for s in summaries], ids)
+        metrics = host.metrics(ids[0])
+        self.assertEqual(metrics.ticks, summaries[0].ticks)
+        self.assertEqual(metrics.commands, 2)
+        self.assertGreater(metrics.mean_tick_latency_s, 0.0)
+        self.assertGreaterEqual(metrics.max_tick_latency_s, metrics.mean_tick_latency_s)
+        self.assertEqual(host.session_ticks, sum(s.ticks for s in summaries))
+
+        closed = await asyncio.gather(host.close_session(ids[1]), host.run(1))
+        self.assertEqual(closed[0], summaries[1])
+        rows = host.lanes.rows
+        reopened, _ = await asyncio.gather(host.open_session(), host.run(1))
+        self.assertEqual(host.summary(reopened).wave, 1)
+        self.assertEqual(host.lanes.rows, rows)
+
+    async def test_bad_commands_fail_their_future_not_the_loop(self) -> None:
+        host = SessionHost(SMALL)
+        runner = asyncio.create_task(host.run())
+        session = await host.open_session()
+        with self.assertRaises(TypeError):
+            await host.place_tower(session, None)
+        with self.assertRaises(TypeError):
+            await host.place_tower("0", 10.0)
+        with self.assertRaises(ValueError):
+            await host.open_session(["ten"])
+        self.assertEqual(await host.place_tower(session, "10"), 0)
+
+        def broken(row, offset_px):
+            raise RuntimeError("lane storage unavailable")
+
+        host.lanes.place = broken
+        with self.assertRaises(RuntimeError):
+            await host.place_tower(session, 20.0)
+        del host.lanes.place
+        self.assertEqual(await host.place_tower(session, 20.0), 1)
+        self.assertFalse(runner.done())
+        host.stop()
+        await runner
+
+    async def test_failed_open_on_a_new_row_keeps_ticking(self) -> None:
+        host = SessionHost(SMALL)
+        runner = asyncio.create_task(host.run())
+        session = await host.open_session([100.0])
+        self.assertEqual(host.lanes.rows, 1)
+        # The first open to claim row 1 fails after the lane batch has grown to it.
+        with self.assertRaises(ValueError):
+            await host.open_session([-5.0])
+        self.assertEqual(host.lanes.rows, 2)
+        # Race the next command against the loop so a crashed loop fails instead of hanging.
+        place = asyncio.ensure_future(host.place_tower(session, 300.0))
+        await asyncio.wait({place, runner}, return_when=asyncio.FIRST_COMPLETED)
+        self.assertFalse(runner.done())
+        self.assertEqual(await place, 1)
+        second = await host.open_session([200.0])
+        self.assertEqual(await host.place_tower(second, 400.0), 1)
+        self.assertFalse(runner.done())
+        host.stop()
+        await runner
+
+    async def test_full_queue_blocks_producers(self) -> None:
+        host = SessionHost(SMALL, max_pending_commands=2)
+        opens = [asyncio.create_task(host.open_session()) for _ in range(3)]
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.assertEqual(host.pending_commands, 2)
+        self.assertFalse(any(task.done() for task in opens))
+
+        await host.run(1)
+        self.assertEqual(sum(task.done() for task in opens), 2)
+        await host.run(1)
+        self.assertEqual(sorted(await asyncio.gather(*opens)), [0, 1, 2])
+
+    async def test_tick_cost_is_a_fixed_number_of_batched_calls(self) -> None:
+        # Wall-clock throughput is tracked by the `lane_batch_step` benchmark;
+        # here the number of batched kernel calls per tick must not depend on
+        # how many sessions share a block.
+        calls = []
+        for sessions in (1, 64):
+            host = SessionHost(capacity=sessions, batch_size=64)
+            await asyncio.gather(*(host.open_session([300.0, 700.0]) for _ in range(sessions)), host.run(1))
+            with (
+                mock.patch("simulation.session_host.step_thermal_batch", wraps=step_thermal_batch) as thermal,
+                mock.patch("simulation.session_host.step_protein_fleet", wraps=step_protein_fleet) as protein,
+            ):
+                await host.run(20)
+            self.assertEqual(host.session_ticks, 21 * sessions)
+            calls.append((thermal.call_count, protein.call_count))
+        self.assertEqual(calls, [(20, 20), (20, 20)])
+
+    async def test_fixed_timestep_paces_ticks(self) -> None:
+        host = SessionHost(SMALL, tick_interval_s=0.01)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await host.run(10)
+        self.assertGreaterEqual(loop.time() - started, 0.09)
+        self.assertEqual(host.tick, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
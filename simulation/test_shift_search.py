@@ -0,0 +1,80 @@
+"""Checks that shift-factor bisection agrees with full heat-curve runs."""
+
+import random
+import unittest
+from itertools import cycle, islice
+
+from simulation.shift_search import find_shift_boundaries, find_shift_boundary, shift_outcome
+from simulation.thermal_reference import ThermalParams, apply_wasmutable_shift, simulate_heat_curve
+
+
+def full_outcome(timeline, dt, factor, criterion):
+    curve = simulate_heat_curve(timeline, dt, apply_wasmutable_shift(ThermalParams(), shift_factor=factor))
+    if criterion == "overheats":
+        return any(state.overheated for state in curve)
+    return curve[-1].overheated
+
+
+def cadence(on, off, ticks):
+    return list(islice(cycle([True] * on + [False] * off), ticks))
+
+
+class ShiftSearchTests(unittest.TestCase):
+    def test_probes_match_full_runs(self) -> None:
+        rng = random.Random(11)
+        for _ in range(40):
+            timeline = cadence(rng.randint(1, 6), rng.randint(0, 8), rng.randint(1, 400))
+            factor = rng.uniform(0.2, 4.0)
+            for criterion in ("overheats", "never_recovers"):
+                self.assertEqual(
+                    shift_outcome(timeline, 0.1, factor, criterion=criterion),
+                    full_outcome(timeline, 0.1, factor, criterion),
+                    f"{criterion} at {factor}",
+                )
+
+    def test_boundaries_bracket_the_full_run_flip(self) -> None:
+        dt = 0.1
+        timelines = [cadence(on, off, 600) for on, off in ((1, 1), (1, 3), (2, 5), (3, 2), (1, 9))]
+        timelines.append(cadence(4, 4, 300) + [True] * 300)
+        for criterion in ("overheats", "never_recovers"):
+            search = find_shift_boundaries(timelines, dt, criterion=criterion, tolerance=1e-4)
+            for timeline, boundary in zip(timelines, search.boundaries):
+                if boundary is None:
+                    self.assertEqual(full_outcome(timeline, dt, 0.1, criterion), full_outcome(timeline, dt, 10.0, criterion))
+                    continue
+                self.assertLessEqual(boundary.high - boundary.low, 1e-4)
+                self.assertEqual(full_outcome(timeline, dt, boundary.high, criterion), boundary.outcome_at_high)
+                self.assertNotEqual(full_outcome(timeline, dt, boundary.low, criterion), boundary.outcome_at_high)
+            self.assertTrue(any(b is not None for b in search.boundaries), criterion)
+
+    def test_single_search_needs_tens_of_simulations(self) -> None:
+        search = find_shift_boundaries([cadence(1, 2, 2000)], 0.1, tolerance=1e-4)
+        boundary = search.boundaries[0]
+        self.assertIsNotNone(boundary)
+        self.assertTrue(boundary.outcome_at_high)
+        self.assertLess(search.simulations, 30)
+        self.assertLess(search.ticks_simulated, 30 * 2000)
+        self.assertEqual(find_shift_boundary(cadence(1, 2, 2000), 0.1, tolerance=1e-4), boundary)
+        self.assertIsNone(find_shift_boundary([False] * 500, 0.1))
+
+    def test_shared_prefixes_are_not_resimulated(self) -> None:
+        rng = random.Random(4)
+        prefix = cadence(1, 2, 1500)
+        timelines = [prefix + [rng.random() < 0.1 for _ in range(100)] for _ in range(12)]
+
+        for criterion, speedup in (("overheats", 4), ("never_recovers", 1)):
+            grouped = find_shift_boundaries(timelines, 0.1, criterion=criterion, tolerance=1e-3)
+            separate = [find_shift_boundaries([t], 0.1, criterion=criterion, tolerance=1e-3) for t in timelines]
+
+            self.assertEqual(grouped.boundaries, [s.boundaries[0] for s in separate])
+            self.assertLess(grouped.ticks_simulated * speedup, sum(s.ticks_simulated for s in separate))
+
+    def test_rejects_bad_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            find_shift_boundaries([[True]], 0.1, criterion="melts")
+        with self.assertRaises(ValueError):
+            find_shift_boundaries([[True]], 0.1, low=2.0, high=1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Brute-force parity checks for path-interval tower targeting."""
+
+import unittest
+from math import dist
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules, TowerStats
+from simulation.enemy_pool import EnemyPool
+from simulation.targeting import PathCoverage, PathGeometry, TargetingFrame, enemies_in_range, select_targets
+
+
+class TargetingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(6)
+        self.path = PathGeometry.from_points([(0, 0), (400, 0), (400, 300), (80, 300), (80, 600), (700, 600)])
+        self.towers = [tuple(p) for p in rng.uniform(0, 700, (40, 2))]
+        self.coverage = PathCoverage.build(self.path, self.towers, TowerStats().range_px)
+
+        self.pool = EnemyPool(capacity=64)
+        slots = self.pool.spawn(300, wave_index=2, rules=CoreRules())
+        self.pool.progress[slots] = rng.uniform(0, self.path.length_px, slots.size)
+        self.pool.hp[slots] = rng.integers(1, 40, slots.size).astype(float)
+        # Retire a few so the frame has to skip dead slots.
+        self.pool.hp[slots[::7]] = 0.0
+        self.pool.collect_defeated(wave_index=2, rules=CoreRules())
+
+    def brute_force(self, tower: int) -> list[int]:
+        range_px = TowerStats().range_px
+        return [
+            slot
+            for slot in np.flatnonzero(self.pool.alive).tolist()
+            if dist(self.path.point_at(self.pool.progress[slot]), self.towers[tower]) <= range_px
+        ]
+
+    def test_range_queries_match_full_scan(self) -> None:
+        frame = TargetingFrame.from_pool(self.pool)
+        first = select_targets(self.coverage, frame, "first")
+        last = select_targets(self.coverage, frame, "last")
+        strongest = select_targets(self.coverage, frame, "strongest")
+
+        for tower in range(len(self.towers)):
+            expected = self.brute_force(tower)
+            self.assertEqual(sorted(enemies_in_range(self.coverage, frame, tower).tolist()), sorted(expected))
+            if not expected:
+                self.assertEqual((first[tower], last[tower], strongest[tower]), (-1, -1, -1))
+                continue
+            progress = self.pool.progress
+            self.assertEqual(progress[first[tower]], max(progress[s] for s in expected))
+            self.assertEqual(progress[last[tower]], min(progress[s] for s in expected))
+            self.assertEqual(
+                (self.pool.hp[strongest[tower]], progress[strongest[tower]]),
+                max((self.pool.hp[s], progress[s]) for s in expected),
+            )
+
+    def test_empty_frame_and_unknown_mode(self) -> None:
+        empty = TargetingFrame.from_pool(EnemyPool(capacity=4))
+        self.assertTrue((select_targets(self.coverage, empty, "strongest") == -1).all())
+        with self.assertRaises(ValueError):
+            select_targets(self.coverage, empty, "closest")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Parity checks between the batched thermal engine and the scalar reference."""
+
+import random
+import unittest
+
+import numpy as np
+
+from simulation.thermal_batch import ThermalParamArrays, simulate_heat_curves
+from simulation.thermal_reference import ThermalParams, apply_wasmutable_shift, simulate_heat_curve
+
+
+class ThermalBatchTests(unittest.TestCase):
+    def test_matches_scalar_reference_bit_for_bit(self) -> None:
+        rng = random.Random(11)
+        base = ThermalParams()
+        params = [
+            base,
+            apply_wasmutable_shift(base, shift_factor=1.35),
+            apply_wasmutable_shift(base, shift_factor=0.7),
+            ThermalParams(capacity=60.0, heat_per_shot=25.0, dissipation_rate=3.3, recovery_threshold_ratio=0.3),
+        ] * 6
+        timelines = [[rng.random() < rng.choice((0.2, 0.5, 0.9)) for _ in range(400)] for _ in params]
+
+        batch = simulate_heat_curves(timelines, dt=0.05, params=params)
+
+        for row, (timeline, tower_params) in enumerate(zip(timelines, params)):
+            curve = simulate_heat_curve(timeline, dt=0.05, params=tower_params)
+            self.assertEqual(batch.heat[row].tolist(), [s.heat for s in curve])
+            self.assertEqual(batch.overheated[row].tolist(), [s.overheated for s in curve])
+
+    def test_hysteresis_blocks_firing_until_recovery_threshold(self) -> None:
+        params = ThermalParams()
+        timeline = [True] * 60
+        batch = simulate_heat_curves([timeline], dt=0.2, params=params)
+        curve = simulate_heat_curve(timeline, dt=0.2, params=params)
+
+        self.assertTrue(batch.overheated[0].any())
+        self.assertTrue((~batch.overheated[0][10:]).any(), "tower should recover under sustained fire")
+        self.assertEqual(batch.overheated[0].tolist(), [s.overheated for s in curve])
+
+    def test_initial_state_and_shared_param_arrays(self) -> None:
+        arrays = ThermalParamArrays.from_params(ThermalParams(), 3)
+        batch = simulate_heat_curves(
+            np.zeros((3, 4), dtype=bool),
+            dt=0.5,
+            params=arrays,
+            initial_heat=[100.0, 50.0, 0.0],
+            initial_overheated=[True, False, False],
+        )
+        self.assertEqual(batch.heat[:, 0].tolist(), [93.0, 43.0, 0.0])
+        self.assertEqual(batch.overheated[:, -1].tolist(), [True, False, False])
+
+    def test_rejects_mismatched_params(self) -> None:
+        with self.assertRaises(ValueError):
+            simulate_heat_curves(np.zeros((2, 5), dtype=bool), dt=0.1, params=[ThermalParams()])
+        with self.assertRaises(ValueError):
+            simulate_heat_curves(np.zeros(5, dtype=bool), dt=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
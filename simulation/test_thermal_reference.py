@@ -1,11 +1,20 @@
 """Regression checks for BURZEN TD v0.00.1 thermal simulation behavior."""
 
+import random
 import unittest
+from array import array
+from itertools import cycle, islice
+from math import ulp
 
 from simulation.thermal_reference import (
     ThermalParams,
+    TowerThermalState,
     apply_wasmutable_shift,
+    iter_heat_curve,
+    iter_heat_curve_chunks,
     simulate_heat_curve,
+    simulate_heat_events,
+    write_heat_curve,
 )
 
 
@@ -28,6 +37,96 @@ class ThermalReferenceTests(unittest.TestCase):
         self.assertGreater(shifted.heat_per_shot, baseline.heat_per_shot)
         self.assertLess(shifted.dissipation_rate, baseline.dissipation_rate)
 
+    def test_event_driven_mode_matches_sampled_ticks(self) -> None:
+        rng = random.Random(5)
+        for params in (ThermalParams(), apply_wasmutable_shift(ThermalParams(), shift_factor=1.6)):
+            timeline = []
+            while len(timeline) < 3000:
+                burst = rng.random() < 0.5
+                timeline.extend([burst] * rng.randint(1, 60))
+            fire_ticks = [t for t, fired in enumerate(timeline) if fired]
+            sample_ticks = sorted(rng.sample(range(len(timeline)), 200))
+
+            dense = simulate_heat_curve(timeline, dt=0.05, params=params)
+            sparse = simulate_heat_events(fire_ticks, sample_ticks, dt=0.05, params=params)
+
+            self.assertEqual(len(sparse), len(sample_ticks))
+            for tick, state in zip(sample_ticks, sparse):
+                self.assertEqual(state.heat, dense[tick].heat, f"tick {tick}")
+                self.assertEqual(state.overheated, dense[tick].overheated, f"tick {tick}")
+
+    def test_advance_idle_recovers_and_clamps_at_zero(self) -> None:
+        params = ThermalParams()
+        state = TowerThermalState(heat=100.0, overheated=True)
+        state.advance_idle(10, dt=0.2, params=params)
+        self.assertTrue(state.overheated)
+        state.advance_idle(10_000_000, dt=0.2, params=params)
+        self.assertFalse(state.overheated)
+        self.assertEqual(state.heat, 0.0)
+
+    def test_advance_idle_matches_stepping_at_the_recovery_boundary(self) -> None:
+        params = ThermalParams(10.0, 3.0, 7.0, 0.1)
+        dense = simulate_heat_curve([True] * 7 + [False] * 14, dt=0.1, params=params)
+        sparse = simulate_heat_events(range(7), [20], dt=0.1, params=params)
+
+        self.assertEqual(dense[20].heat, 1.0000000000000018)
+        self.assertTrue(dense[20].overheated)
+        self.assertEqual((sparse[0].heat, sparse[0].overheated), (dense[20].heat, dense[20].overheated))
+
+    def test_idle_fast_forward_is_bit_identical_to_stepping(self) -> None:
+        rng = random.Random(12)
+        cases = [ThermalParams(capacity=100.0, dissipation_rate=4.5 * ulp(64.0))]  # decay is a rounding tie
+        for _ in range(40):
+            cases.append(ThermalParams(capacity=rng.uniform(1.0, 200.0), dissipation_rate=rng.uniform(1e-6, 4.0)))
+        for params in cases:
+            start = TowerThermalState(heat=rng.uniform(0.0, params.capacity * 1.5), overheated=rng.random() < 0.5)
+            ticks = rng.randint(1, 20_000)
+            stepped = TowerThermalState(start.heat, start.overheated)
+            for _ in range(ticks):
+                stepped.step(dt=1.0, fired=False, params=params)
+            skipped = TowerThermalState(start.heat, start.overheated)
+            skipped.advance_idle(ticks, dt=1.0, params=params)
+            self.assertEqual((skipped.heat, skipped.overheated), (stepped.heat, stepped.overheated), params)
+
+        # A trillion ticks of tiny decay would take hours one by one.
+        state = TowerThermalState(heat=100.0, overheated=True)
+        state.advance_idle(10**12, dt=0.1, params=ThermalParams(dissipation_rate=1e-8))
+        self.assertEqual((state.heat, state.overheated), (0.0, False))
+
+    def test_event_ticks_must_be_ascending(self) -> None:
+        with self.assertRaises(ValueError):
+            simulate_heat_events([5, 3], [10], dt=0.1)
+
+    def test_streaming_variants_match_materialized_curve(self) -> None:
+        pattern = [True] * 9 + [False] * 14
+        timeline = list(islice(cycle(pattern), 1000))
+        expected = [(s.heat, s.overheated) for s in simulate_heat_curve(timeline, dt=0.2)]
+
+        self.assertEqual(list(iter_heat_curve(iter(timeline), dt=0.2)), expected)
+
+        heat = array("d", bytes(8 * len(timeline)))
+        overheated = bytearray(len(timeline))
+        self.assertEqual(write_heat_curve(timeline, 0.2, heat, overheated), len(timeline))
+        self.assertEqual(list(zip(heat, map(bool, overheated))), expected)
+
+        streamed = []
+        for heat_chunk, overheated_chunk in iter_heat_curve_chunks(iter(timeline), dt=0.2, chunk_ticks=96):
+            self.assertLessEqual(len(heat_chunk), 96)
+            streamed.extend(zip(heat_chunk.tolist(), overheated_chunk.tolist()))
+        self.assertEqual(streamed, expected)
+
+    def test_write_heat_curve_resumes_into_memoryview(self) -> None:
+        fires = islice(cycle([True, True, False]), 50)
+        state = TowerThermalState()
+        heat = memoryview(array("d", bytes(8 * 20)))
+        overheated = memoryview(bytearray(20)).cast("?")
+
+        written = [write_heat_curve(fires, 0.1, heat, overheated, state=state) for _ in range(4)]
+
+        self.assertEqual(written, [20, 20, 10, 0])
+        expected = simulate_heat_curve(islice(cycle([True, True, False]), 50), dt=0.1)
+        self.assertEqual(state.heat, expected[-1].heat)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+"""Checks for the struct-of-arrays tower fleet and slotted state types."""
+
+import random
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from simulation.protein_batch import step_protein_fleet
+from simulation.protein_tower import (
+    LocalFlowState,
+    ProteinTowerState,
+    TokenTowerState,
+    TowerPlacement,
+    step_protein_tower,
+    synthesize_protein_cluster,
+)
+from simulation.thermal_batch import ThermalParamArrays
+from simulation.thermal_reference import ThermalParams, TowerThermalState
+from simulation.tower_fleet import TowerFleet
+
+
+class TowerFleetTests(unittest.TestCase):
+    def test_state_types_use_slots(self) -> None:
+        for instance in (ProteinTowerState(), TokenTowerState(), TowerPlacement(0, 0), TowerThermalState()):
+            self.assertFalse(hasattr(instance, "__dict__"), type(instance).__name__)
+
+    def test_bulk_updates_match_scalar_functions(self) -> None:
+        rng = random.Random(4)
+        tiles = rng.sample([(x, y) for x in range(30) for y in range(30)], 120)
+        placements = [TowerPlacement(x, y) for x, y in tiles]
+        states = [ProteinTowerState(theta=rng.uniform(0, 2), heat=rng.uniform(0, 3)) for _ in placements]
+        fleet = TowerFleet.from_towers(placements, states)
+
+        fleet.couple(fleet.neighbor_index(3.0))
+        expected = synthesize_protein_cluster(states, placements)
+        for row, state in enumerate(expected):
+            self.assertAlmostEqual(fleet.protein_state(row).theta, state.theta, places=12)
+            self.assertAlmostEqual(fleet.protein_state(row).heat, state.heat, places=12)
+
+        grid = np.full((len(fleet), 8, 8), 0.4)
+        fleet.apply_protein_tick(step_protein_fleet(fleet.protein, grid, grid, grid, 3, 0.1))
+        flow = LocalFlowState(grid[0].tolist(), grid[0].tolist(), grid[0].tolist())
+        self.assertAlmostEqual(fleet.theta[0], step_protein_tower(expected[0], flow, 3, 0.1).state.theta, places=12)
+
+        fired = np.ones(len(fleet), dtype=bool)
+        fleet.step_thermal(fired, 0.2, ThermalParamArrays.from_params(ThermalParams(), len(fleet)))
+        scalar = TowerThermalState()
+        scalar.step(0.2, True, ThermalParams())
+        self.assertEqual(fleet.thermal_state(5), scalar)
+
+    def test_add_remove_and_compat_views(self) -> None:
+        fleet = TowerFleet(capacity=1)
+        for x in range(5):
+            fleet.add(TowerPlacement(x, 2 * x), ProteinTowerState(theta=float(x)))
+        fleet.remove(1)
+        self.assertEqual(len(fleet), 4)
+        self.assertEqual(fleet.placement(1), TowerPlacement(4, 8))
+        self.assertEqual([s.theta for s in fleet.protein_states()], [0.0, 4.0, 2.0, 3.0])
+        with self.assertRaises(IndexError):
+            fleet.remove(9)
+
+        # Same tower count, different layout: a stale index must not couple the wrong rows.
+        stale = fleet.neighbor_index(3.0)
+        fleet.remove(0)
+        fleet.add(TowerPlacement(9, 9), ProteinTowerState())
+        with self.assertRaises(ValueError):
+            fleet.couple(stale)
+        fleet.couple(fleet.neighbor_index(3.0))
+
+    def test_fleet_memory_is_a_fraction_of_objects(self) -> None:
+        count = 10_000
+        tracemalloc.start()
+        objects = [
+            (TowerPlacement(i % 100, i // 100), ProteinTowerState(theta=i * 0.1), TowerThermalState(heat=i * 0.2))
+            for i in range(count)
+        ]
+        object_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        fleet = TowerFleet.from_towers([o[0] for o in objects], [o[1] for o in objects], [o[2] for o in objects])
+        self.assertLess(fleet.nbytes, object_bytes / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
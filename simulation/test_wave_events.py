@@ -0,0 +1,105 @@
+"""Checks for the batched WASMUTABLE wave-event engine."""
+
+import unittest
+
+import numpy as np
+
+from simulation.numeric_mode import FIXED, FLOAT32, FLOAT64
+from simulation.thermal_batch import ThermalParamArrays, step_thermal_batch
+from simulation.thermal_reference import ThermalParams, TowerThermalState
+from simulation.wave_events import (
+    WAVE_EVENTS,
+    WaveEventBatch,
+    sample_wave_events,
+    simulate_event_study,
+    spawn_progress,
+    tower_thermal_params,
+    update_wave_events,
+)
+
+
+class ScalarEventRules:
+    """Line-by-line port of `sample_wave_event` / `update_event` as the oracle."""
+
+    def __init__(self) -> None:
+        self.event = dict(name="", remaining=0.0, tower_heat_multiplier=1.0)
+
+    def sample(self, draw: float, pick: int, progress: float) -> None:
+        if self.event["remaining"] > 0.0:
+            return
+        if progress < 0.2 or draw > 0.015:
+            return
+        chosen = WAVE_EVENTS[pick + 1]
+        self.event = dict(name=chosen.name, remaining=chosen.duration_s, tower_heat_multiplier=chosen.tower_heat_multiplier)
+
+    def update(self, delta: float) -> None:
+        if self.event["remaining"] <= 0.0:
+            self.event = dict(name="", remaining=0.0, tower_heat_multiplier=1.0)
+            return
+        self.event["remaining"] = max(0.0, self.event["remaining"] - delta)
+        if self.event["remaining"] <= 0.0:
+            self.event["name"] = ""
+
+
+class WaveEventTests(unittest.TestCase):
+    def test_batched_state_machine_matches_scalar_rules(self) -> None:
+        runs, ticks, dt = 40, 3000, 0.05
+        rng = np.random.default_rng(9)
+        draws = rng.random((ticks, runs)) * 0.05
+        picks = rng.integers(0, 3, (ticks, runs))
+        progress = np.linspace(0.0, 1.0, ticks)
+
+        batch = WaveEventBatch.idle(runs)
+        scalars = [ScalarEventRules() for _ in range(runs)]
+        for t in range(ticks):
+            sample_wave_events(batch, progress[t], draws[t], picks[t])
+            update_wave_events(batch, dt)
+            for run, rules in enumerate(scalars):
+                rules.sample(draws[t, run], picks[t, run], progress[t])
+                rules.update(dt)
+            self.assertEqual(batch.remaining.tolist(), [r.event["remaining"] for r in scalars])
+            self.assertEqual(
+                batch.multiplier("tower_heat_multiplier").tolist(), [r.event["tower_heat_multiplier"] for r in scalars]
+            )
+        self.assertTrue((batch.kind > 0).any())
+
+    def test_heat_scale_matches_scaled_scalar_shot(self) -> None:
+        params = ThermalParams()
+        scale = np.array([1.0, 1.35, 0.85])
+        states = [TowerThermalState() for _ in range(3)]
+        for _ in range(12):
+            for state, factor in zip(states, scale):
+                state.step(0.1, True, ThermalParams(heat_per_shot=params.heat_per_shot * factor))
+        expected = [s.heat for s in states]
+
+        for mode, tolerance in ((FLOAT64, 0.0), (FLOAT32, 1e-4), (FIXED, 1e-3)):
+            arrays = ThermalParamArrays.from_params(params, 3, mode)
+            heat, overheated = mode.encode(np.zeros(3)), np.zeros(3, dtype=bool)
+            for _ in range(12):
+                step_thermal_batch(heat, overheated, np.ones(3, dtype=bool), arrays.decay(0.1), arrays, heat_scale=scale)
+            self.assertEqual(heat.dtype, mode.dtype)
+            np.testing.assert_allclose(mode.decode(heat), expected, rtol=0.0, atol=tolerance, err_msg=mode.name)
+        self.assertEqual(tower_thermal_params(params, 1.2).heat_per_shot, params.heat_per_shot * 1.2)
+
+    def test_event_study_scales_to_many_runs(self) -> None:
+        progress = spawn_progress(1200, 0.05, creep_count=120)
+        self.assertEqual((progress[0], progress[-1]), (0.0, 1.0))
+
+        study = simulate_event_study(20_000, progress, 0.05, fire_probability=0.5, seed=1)
+
+        self.assertTrue((study.event_ticks.sum(axis=1) <= study.ticks).all())
+        self.assertTrue((study.overlap_ticks <= study.event_ticks).all())
+        self.assertTrue((study.overlap_ticks.sum(axis=1) <= study.overheat_ticks).all())
+        rates = study.overlap_rates()
+        self.assertEqual(list(rates), ["Cost Inversion", "Overheat Spike", "Spawn Drift"])
+        # Overheat Spike heats towers harder than Cost Inversion, so it overlaps overheating more per active second.
+        per_tick = study.overlap_ticks.sum(axis=0) / study.event_ticks.sum(axis=0)
+        self.assertGreater(per_tick[1], per_tick[0])
+        self.assertEqual(
+            simulate_event_study(50, progress, 0.05, seed=4).overlap_ticks.tolist(),
+            simulate_event_study(50, progress, 0.05, seed=4).overlap_ticks.tolist(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Checks that cached wave tables reproduce the scalar scaling rules."""
+
+import unittest
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules, enemy_hp_for_wave, enemy_speed_for_wave, reward_for_kill
+from simulation.protein_tower import ProteinTowerConfig, adaptation_rate_for_wave, alpha_for_wave
+from simulation.wave_tables import (
+    MAX_TABLE_WAVES,
+    WAVE_TABLE_CACHE_SIZE,
+    adaptation_rate_at,
+    alpha_at,
+    clear_wave_tables,
+    core_wave_table,
+    enemy_hp_at,
+    enemy_speed_at,
+    reward_at,
+    wave_table_cache_sizes,
+)
+
+
+class WaveTableTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_wave_tables()
+
+    def test_lookups_match_scalar_rules_exactly(self) -> None:
+        rules = CoreRules(base_enemy_hp=77.0, enemy_hp_growth_per_wave=0.33, base_reward=7)
+        config = ProteinTowerConfig(alpha_0=1.3, adaptation_decay_per_wave=0.017)
+        for wave in (-3, 0, 1, 2, 17, 63, 64, 200):
+            self.assertEqual(enemy_hp_at(wave, rules), enemy_hp_for_wave(wave, rules))
+            self.assertEqual(enemy_speed_at(wave, rules), enemy_speed_for_wave(wave, rules))
+            self.assertEqual(reward_at(wave, rules), reward_for_kill(wave, rules))
+            self.assertEqual(alpha_at(wave, config), alpha_for_wave(wave, config))
+            self.assertEqual(adaptation_rate_at(wave, config), adaptation_rate_for_wave(wave, config))
+
+        waves = np.array([1, 5, 300, -1])
+        self.assertEqual(alpha_at(waves, config).tolist(), [alpha_for_wave(int(w), config) for w in waves])
+
+    def test_waves_past_the_cap_use_the_scalar_rule(self) -> None:
+        rules = CoreRules(base_enemy_hp=77.0, enemy_hp_growth_per_wave=0.33, base_reward=7)
+        config = ProteinTowerConfig(alpha_0=1.3, adaptation_decay_per_wave=0.017)
+        huge = 1_000_000
+        self.assertEqual(enemy_hp_at(huge, rules), enemy_hp_for_wave(huge, rules))
+        self.assertEqual(reward_at(huge, rules), reward_for_kill(huge, rules))
+        self.assertEqual(alpha_at(huge, config), alpha_for_wave(huge, config))
+
+        waves = np.array([3, huge, MAX_TABLE_WAVES + 1, huge, -2])
+        self.assertEqual(
+            enemy_speed_at(waves, rules).tolist(), [enemy_speed_for_wave(int(w), rules) for w in waves]
+        )
+        self.assertEqual(reward_at(waves, rules).dtype, np.int64)
+        # Only the capped table was built; asking for it again is a cache hit.
+        self.assertEqual(core_wave_table(rules, MAX_TABLE_WAVES).max_wave, MAX_TABLE_WAVES)
+        self.assertEqual(wave_table_cache_sizes(), (1, 1))
+
+    def test_tables_are_shared_read_only_and_bounded(self) -> None:
+        rules = CoreRules()
+        self.assertIs(core_wave_table(rules, 10), core_wave_table(CoreRules(), 40))
+        with self.assertRaises(ValueError):
+            core_wave_table(rules).enemy_hp[1] = 0.0
+
+        for hp in range(WAVE_TABLE_CACHE_SIZE + 50):
+            enemy_hp_at(3, CoreRules(base_enemy_hp=float(hp)))
+        self.assertEqual(wave_table_cache_sizes()[0], WAVE_TABLE_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""Batched thermal engine for BURZEN TD balance runs.
+
+Steps a whole fleet of towers per tick with NumPy while reproducing the
+arithmetic of `TowerThermalState.step` exactly, so batched curves can be
+compared to the scalar reference with `==` rather than a tolerance.
+
+Parameter and state arrays may also use the float32 or fixed-point modes
+from `simulation.numeric_mode`; `step_thermal_batch` only adds, subtracts
+and compares, so it runs unchanged on any of them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Sequence
+
+import numpy as np
+
+from simulation.numeric_mode import FLOAT64, NumericMode, mode_of, numeric_mode
+from simulation.thermal_reference import ThermalParams, simulate_heat_curve
+
+
+ParamsLike = ThermalParams | Sequence[ThermalParams] | None
+
+
+@dataclass(frozen=True)
+class ThermalParamArrays:
+    """Per-tower thermal parameters as columns of length N in one numeric mode."""
+
+    capacity: np.ndarray
+    heat_per_shot: np.ndarray
+    dissipation_rate: np.ndarray
+    recovery_threshold: np.ndarray
+
+    @classmethod
+    def from_params(
+        cls, params: ParamsLike, count: int, mode: NumericMode | str = FLOAT64
+    ) -> "ThermalParamArrays":
+        """Broadcast one `ThermalParams` or stack one per tower."""
+
+        if params is None:
+            params = ThermalParams()
+        if isinstance(params, ThermalParams):
+            params = [params] * count
+        if len(params) != count:
+            raise ValueError(f"expected {count} ThermalParams, got {len(params)}")
+        mode = numeric_mode(mode)
+        return cls(
+            capacity=mode.encode([p.capacity for p in params]),
+            heat_per_shot=mode.encode([p.heat_per_shot for p in params]),
+            dissipation_rate=mode.encode([p.dissipation_rate for p in params]),
+            # Read the property so the threshold is rounded exactly as the scalar path rounds it.
+            recovery_threshold=mode.encode([p.recovery_threshold for p in params]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.capacity)
+
+    @property
+    def mode(self) -> NumericMode:
+        return mode_of(self.capacity)
+
+    def decay(self, dt: float) -> np.ndarray:
+        """Per-tick cooling `dissipation_rate * dt` in this mode."""
+
+        mode = self.mode
+        if mode.is_fixed:
+            # Round the product once; encoding dt on its own would bias every tick.
+            return mode.encode(mode.decode(self.dissipation_rate) * dt)
+        return self.dissipation_rate * mode.const(dt)
+
+
+@dataclass(frozen=True)
+class HeatCurveBatch:
+    """Per-tower heat curves; both arrays are shaped (towers, ticks)."""
+
+    heat: np.ndarray
+    overheated: np.ndarray
+
+
+def step_thermal_batch(
+    heat: np.ndarray,
+    overheated: np.ndarray,
+    fired: np.ndarray,
+    decay: np.ndarray,
+    params: ThermalParamArrays,
+    heat_scale: np.ndarray | None = None,
+) -> None:
+    """Advance every tower one tick in place.
+
+    `decay` is `params.decay(dt)`, precomputed by the caller so a long run
+    does not recompute it every tick. All float arrays share the mode of
+    `params`. `heat_scale` multiplies this tick's `heat_per_shot` per tower,
+    as a wave event's `tower_heat_multiplier` does in `level_scene.gd`; it is
+    given as real factors and encoded into the mode of `params`.
+    """
+
+    mode = params.mode
+    shot = params.heat_per_shot if heat_scale is None else mode.mul(params.heat_per_shot, mode.encode(heat_scale))
+    np.subtract(heat, decay, out=heat)
+    np.maximum(heat, 0, out=heat)
+    np.add(heat, shot, out=heat, where=fired & ~overheated)
+
+    # Both branches test the pre-transition flag, matching the scalar if/elif.
+    tripped = ~overheated & (heat >= params.capacity)
+    recovered = overheated & (heat <= params.recovery_threshold)
+    overheated ^= tripped | recovered
+
+
+def simulate_heat_curves(
+    fire_matrix: np.ndarray | Sequence[Sequence[bool]],
+    dt: float,
+    params: ParamsLike = None,
+    *,
+    initial_heat: np.ndarray | None = None,
+    initial_overheated: np.ndarray | None = None,
+    mode: NumericMode | str = FLOAT64,
+) -> HeatCurveBatch:
+    """Batched `simulate_heat_curve` over an (N towers x T ticks) fire matrix.
+
+    `heat` comes back in the storage dtype of `mode` (or of `params` when
+    they are already `ThermalParamArrays`); use `mode.decode` for floats.
+    """
+
+    fires = np.asarray(fire_matrix, dtype=bool)
+    if fires.ndim != 2:
+        raise ValueError(f"fire_matrix must be 2-D (towers, ticks), got shape {fires.shape}")
+    towers, ticks = fires.shape
+    arrays = params if isinstance(params, ThermalParamArrays) else ThermalParamArrays.from_params(params, towers, mode)
+    if len(arrays) != towers:
+        raise ValueError(f"expected parameters for {towers} towers, got {len(arrays)}")
+
+    active_mode = arrays.mode
+    heat = np.zeros(towers, dtype=active_mode.dtype) if initial_heat is None else active_mode.encode(initial_heat).copy()
+    overheated = (
+        np.zeros(towers, dtype=bool) if initial_overheated is None else np.array(initial_overheated, dtype=bool)
+    )
+    decay = arrays.decay(dt)
+
+    # Tick-major buffers keep each per-tick read and write contiguous.
+    fires_by_tick = np.ascontiguousarray(fires.T)
+    heat_out = np.empty((ticks, towers), dtype=active_mode.dtype)
+    overheated_out = np.empty((ticks, towers), dtype=bool)
+    for t in range(ticks):
+        step_thermal_batch(heat, overheated, fires_by_tick[t], decay, arrays)
+        heat_out[t] = heat
+        overheated_out[t] = overheated
+
+    return HeatCurveBatch(heat=heat_out.T, overheated=overheated_out.T)
+
+
+def _demo() -> None:
+    rng = np.random.default_rng(7)
+    towers, ticks, dt = 2000, 2000, 0.05
+    fire_matrix = rng.random((towers, ticks)) < 0.3
+
+    start = perf_counter()
+    simulate_heat_curves(fire_matrix, dt)
+    batched = perf_counter() - start
+
+    sample = 50
+    start = perf_counter()
+    for row in fire_matrix[:sample].tolist():
+        simulate_heat_curve(row, dt)
+    scalar = (perf_counter() - start) * towers / sample
+
+    print(f"towers={towers} ticks={ticks}")
+    print(f"scalar  ~{scalar:>7.2f}s ({towers * ticks / scalar:>12.0f} tower-ticks/s, extrapolated)")
+    print(f"batched  {batched:>7.2f}s ({towers * ticks / batched:>12.0f} tower-ticks/s)")
+    print(f"speedup  {scalar / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    _demo()
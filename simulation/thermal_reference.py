@@ -6,8 +6,10 @@ and verify engine-side implementation.
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, replace
-from typing import Iterable, List
+from math import frexp, ldexp, ulp
+from typing import Iterable, Iterator, List, MutableSequence
 
 
 @dataclass(frozen=True)
@@ -22,7 +24,7 @@ class ThermalParams:
         return self.capacity * self.recovery_threshold_ratio
 
 
-@dataclass
+@dataclass(slots=True)
 class TowerThermalState:
     heat: float = 0.0
     overheated: bool = False
@@ -38,6 +40,71 @@ class TowerThermalState:
         elif self.overheated and self.heat <= params.recovery_threshold:
             self.overheated = False
 
+    def advance_idle(self, ticks: int, dt: float, params: ThermalParams) -> None:
+        """Fast-forward `ticks` non-firing steps, bit-identical to calling `step`.
+
+        Only the first idle tick can trip overheat (heat falls afterwards), so it
+        is stepped normally; the rest is `_idle_decay`, whose cost depends on
+        the binades heat falls through rather than on `ticks`.
+        """
+
+        if ticks <= 0:
+            return
+        self.step(dt=dt, fired=False, params=params)
+        decay = params.dissipation_rate * dt
+        if decay <= 0.0:
+            return
+        self.heat, self.overheated = _idle_decay(
+            self.heat, self.overheated, decay, params.recovery_threshold, ticks - 1
+        )
+
+
+def _idle_decay(heat: float, overheated: bool, decay: float, recovery: float, ticks: int) -> tuple[float, bool]:
+    """`ticks` repeats of `heat = max(0.0, heat - decay)` plus the recovery check.
+
+    Inside one binade `[low, 2 * low)` heat lies on the grid of `ulp(low)`, and
+    a rounded subtraction that stays in the binade moves it by a whole number
+    of grid steps. Once two consecutive results share a binade that number is
+    fixed (a tie can round differently only on the first step into a binade,
+    before the result's parity is even), so the remaining ticks down to just
+    above `low` are one closed-form jump in integer grid units. Heat only
+    falls, so recovery is crossed within a jump iff its last value is at or
+    below the threshold. Only the ticks around each binade boundary are
+    stepped one by one, so cost is O(binades crossed).
+    """
+
+    # The input to the last tick, kept only when that input was itself a tick
+    # result (the caller's heat may have come from a shot, not a decay).
+    previous: float | None = None
+    settled = False
+    while ticks and heat > 0.0:
+        if previous is not None:
+            low = ldexp(0.5, frexp(heat)[1])
+            if low <= previous < 2.0 * low:
+                unit = ulp(low)
+                step = int((previous - heat) / unit)
+                if step == 0:
+                    # heat - decay rounds back to heat: nothing changes again.
+                    break
+                grid, floor_grid = int(heat / unit), int(low / unit)
+                # Jump while every result stays at least one grid step above low.
+                jump = min(ticks, max(0, (grid - floor_grid - 1) // step))
+                if jump:
+                    previous = (grid - (jump - 1) * step) * unit
+                    heat = (grid - jump * step) * unit
+                    ticks -= jump
+                    # Heat only falls, so recovery was crossed iff the last value is below it.
+                    if overheated and heat <= recovery:
+                        overheated = False
+                    continue
+        previous = heat if settled else None
+        settled = True
+        heat = max(0.0, heat - decay)
+        ticks -= 1
+        if overheated and heat <= recovery:
+            overheated = False
+    return heat, overheated
+
 
 def simulate_heat_curve(
     fire_timeline: Iterable[bool], dt: float, params: ThermalParams | None = None
@@ -51,6 +118,129 @@ def simulate_heat_curve(
     return out
 
 
+def iter_heat_curve(
+    fire_timeline: Iterable[bool],
+    dt: float,
+    params: ThermalParams | None = None,
+    state: TowerThermalState | None = None,
+) -> Iterator[tuple[float, bool]]:
+    """Lazily yield `(heat, overheated)` per tick; accepts unbounded generators."""
+
+    active_params = params or ThermalParams()
+    active_state = state if state is not None else TowerThermalState()
+    for fired in fire_timeline:
+        active_state.step(dt=dt, fired=fired, params=active_params)
+        yield active_state.heat, active_state.overheated
+
+
+def write_heat_curve(
+    fire_timeline: Iterable[bool],
+    dt: float,
+    heat_out: MutableSequence[float],
+    overheated_out: MutableSequence[bool],
+    params: ThermalParams | None = None,
+    state: TowerThermalState | None = None,
+) -> int:
+    """Fill caller-owned buffers (`array('d')`, `bytearray`, memoryview) in place.
+
+    Stops when the timeline ends or the shorter buffer is full and returns the
+    number of ticks written. Pass an iterator and a shared `state` to resume
+    where the previous call stopped.
+    """
+
+    active_params = params or ThermalParams()
+    active_state = state if state is not None else TowerThermalState()
+    limit = min(len(heat_out), len(overheated_out))
+    if limit == 0:
+        return 0
+    count = 0
+    for fired in fire_timeline:
+        active_state.step(dt=dt, fired=fired, params=active_params)
+        heat_out[count] = active_state.heat
+        overheated_out[count] = active_state.overheated
+        count += 1
+        if count == limit:
+            break
+    return count
+
+
+def iter_heat_curve_chunks(
+    fire_timeline: Iterable[bool],
+    dt: float,
+    chunk_ticks: int = 4096,
+    params: ThermalParams | None = None,
+) -> Iterator[tuple[memoryview, memoryview]]:
+    """Stream a timeline through one reused pair of fixed-size buffers.
+
+    Yields `(heat, overheated)` memoryviews (formats `d` and `?`) over the
+    filled prefix of each chunk. The views are overwritten by the next chunk,
+    so copy them if they must outlive the iteration step.
+    """
+
+    if chunk_ticks <= 0:
+        raise ValueError(f"chunk_ticks must be positive, got {chunk_ticks}")
+    heat_buffer = array("d", bytes(8 * chunk_ticks))
+    overheated_buffer = memoryview(bytearray(chunk_ticks)).cast("?")
+    heat_view = memoryview(heat_buffer)
+    fires = iter(fire_timeline)
+    state = TowerThermalState()
+    while True:
+        count = write_heat_curve(fires, dt, heat_buffer, overheated_buffer, params, state)
+        if count == 0:
+            return
+        yield heat_view[:count], overheated_buffer[:count]
+        if count < chunk_ticks:
+            return
+
+
+def _ascending(ticks: Iterable[int], label: str) -> Iterator[int]:
+    previous = -1
+    for tick in ticks:
+        if tick <= previous:
+            raise ValueError(f"{label} must be strictly increasing non-negative ticks, got {tick} after {previous}")
+        previous = tick
+        yield tick
+
+
+def simulate_heat_events(
+    fire_ticks: Iterable[int],
+    sample_ticks: Iterable[int],
+    dt: float,
+    params: ThermalParams | None = None,
+) -> List[TowerThermalState]:
+    """Event-driven `simulate_heat_curve` for sparse fire timelines.
+
+    `fire_ticks` lists the tick indices where the tower fires and
+    `sample_ticks` the indices to report; both must be ascending. Each sample
+    is the state after stepping that tick, the same convention as
+    `simulate_heat_curve(...)[tick]`. Idle and overheated stretches are
+    skipped with `TowerThermalState.advance_idle`, so cost scales with the
+    number of fire and sample events rather than the timeline length.
+    """
+
+    active_params = params or ThermalParams()
+    state = TowerThermalState()
+    out: List[TowerThermalState] = []
+    fires = _ascending(fire_ticks, "fire_ticks")
+    samples = _ascending(sample_ticks, "sample_ticks")
+    next_fire = next(fires, None)
+    next_sample = next(samples, None)
+    current = -1
+
+    while next_sample is not None:
+        if next_fire is not None and next_fire <= next_sample:
+            state.advance_idle(next_fire - current - 1, dt, active_params)
+            state.step(dt=dt, fired=True, params=active_params)
+            current = next_fire
+            next_fire = next(fires, None)
+            continue
+        state.advance_idle(next_sample - current, dt, active_params)
+        current = next_sample
+        out.append(TowerThermalState(heat=state.heat, overheated=state.overheated))
+        next_sample = next(samples, None)
+    return out
+
+
 def apply_wasmutable_shift(params: ThermalParams, *, shift_factor: float) -> ThermalParams:
     """Return a mutated thermal profile for recursive refinement experiments.
 
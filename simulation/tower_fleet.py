@@ -0,0 +1,178 @@
+"""Struct-of-arrays storage for large tower fleets.
+
+`TowerFleet` keeps every per-tower field in one typed NumPy column instead of
+one dataclass instance per tower and per tick. Bulk updates (fleet Protein
+step, cluster coupling, thermal stepping) write the columns in place. The
+existing dataclasses remain available as on-demand views for code that
+expects them.
+
+Removal swaps the last tower into the freed row, so row indices are stable
+only between removals. The real-valued columns use the fleet's
+`simulation.numeric_mode` mode (float64 by default).
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from simulation.numeric_mode import FLOAT64, NumericMode, numeric_mode
+from simulation.protein_batch import ProteinFleetState, ProteinFleetTick
+from simulation.protein_tower import ProteinNeighborIndex, ProteinTowerState, TowerPlacement
+from simulation.thermal_batch import ThermalParamArrays, step_thermal_batch
+from simulation.thermal_reference import TowerThermalState
+
+
+_COLUMNS = {
+    "x": np.int32,
+    "y": np.int32,
+    "theta": None,
+    "heat": None,
+    "collapsed": np.bool_,
+    "thermal_heat": None,
+    "overheated": np.bool_,
+}
+
+
+class TowerFleet:
+    """Typed columns for position, Protein state and thermal state."""
+
+    def __init__(self, capacity: int = 64, mode: NumericMode | str = FLOAT64) -> None:
+        self.mode = numeric_mode(mode)
+        self._size = 0
+        self._columns = {
+            name: np.zeros(max(1, capacity), dtype=dtype or self.mode.dtype) for name, dtype in _COLUMNS.items()
+        }
+
+    @classmethod
+    def from_towers(
+        cls,
+        placements: Sequence[TowerPlacement],
+        states: Sequence[ProteinTowerState] | None = None,
+        thermal: Sequence[TowerThermalState] | None = None,
+        mode: NumericMode | str = FLOAT64,
+    ) -> "TowerFleet":
+        fleet = cls(capacity=len(placements), mode=mode)
+        for i, placement in enumerate(placements):
+            fleet.add(placement, states[i] if states else ProteinTowerState(), thermal[i] if thermal else None)
+        return fleet
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get("_columns")
+        if columns is None or name not in columns:
+            raise AttributeError(name)
+        return columns[name][: self._size]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns.values())
+
+    def add(
+        self,
+        placement: TowerPlacement,
+        state: ProteinTowerState = ProteinTowerState(),
+        thermal: TowerThermalState | None = None,
+    ) -> int:
+        """Append a tower and return its row."""
+
+        if self._size == len(self._columns["x"]):
+            for name, column in self._columns.items():
+                grown = np.zeros(2 * len(column), dtype=column.dtype)
+                grown[: len(column)] = column
+                self._columns[name] = grown
+        row = self._size
+        encode = self.mode.encode
+        values = {
+            "x": placement.x,
+            "y": placement.y,
+            "theta": encode(state.theta),
+            "heat": encode(state.heat),
+            "collapsed": state.collapsed,
+            "thermal_heat": encode(thermal.heat if thermal else 0.0),
+            "overheated": thermal.overheated if thermal else False,
+        }
+        for name, value in values.items():
+            self._columns[name][row] = value
+        self._size += 1
+        return row
+
+    def remove(self, row: int) -> None:
+        """Drop `row`, moving the last tower into its place."""
+
+        if not 0 <= row < self._size:
+            raise IndexError(f"tower row {row} out of range for fleet of {self._size}")
+        last = self._size - 1
+        for column in self._columns.values():
+            column[row] = column[last]
+        self._size = last
+
+    def placement(self, row: int) -> TowerPlacement:
+        return TowerPlacement(int(self._columns["x"][row]), int(self._columns["y"][row]))
+
+    def protein_state(self, row: int) -> ProteinTowerState:
+        c, decode = self._columns, self.mode.decode
+        return ProteinTowerState(
+            theta=float(decode(c["theta"][row])), heat=float(decode(c["heat"][row])), collapsed=bool(c["collapsed"][row])
+        )
+
+    def thermal_state(self, row: int) -> TowerThermalState:
+        c = self._columns
+        return TowerThermalState(heat=float(self.mode.decode(c["thermal_heat"][row])), overheated=bool(c["overheated"][row]))
+
+    def placements(self) -> list[TowerPlacement]:
+        return [TowerPlacement(x, y) for x, y in zip(self.x.tolist(), self.y.tolist())]
+
+    def protein_states(self) -> list[ProteinTowerState]:
+        return self.protein.to_states()
+
+    @property
+    def protein(self) -> ProteinFleetState:
+        """Zero-copy `ProteinFleetState` over the live rows."""
+
+        return ProteinFleetState(theta=self.theta, heat=self.heat, collapsed=self.collapsed)
+
+    def apply_protein_tick(self, tick: ProteinFleetTick) -> None:
+        np.copyto(self.theta, tick.state.theta)
+        np.copyto(self.heat, tick.state.heat)
+        np.copyto(self.collapsed, tick.state.collapsed)
+
+    def neighbor_index(self, coupling_range_tiles: float = 3.0) -> ProteinNeighborIndex:
+        return ProteinNeighborIndex.build(self.placements(), coupling_range_tiles)
+
+    def couple(
+        self,
+        neighbor_index: ProteinNeighborIndex,
+        coupling_eta: float = 0.08,
+        coupling_heat_gain: float = 0.15,
+    ) -> None:
+        """In-place `synthesize_protein_cluster` (equal up to float summation order)."""
+
+        if len(neighbor_index.neighbors) != self._size or neighbor_index.placements != tuple(self.placements()):
+            raise ValueError("neighbor_index was built for a different layout")
+        counts = np.fromiter((len(n) for n in neighbor_index.neighbors), dtype=np.int64, count=self._size)
+        flat = np.fromiter(_flatten(neighbor_index.neighbors), dtype=np.int64, count=int(counts.sum()))
+        owners = np.repeat(np.arange(self._size), counts)
+
+        mode, theta = self.mode, self.theta
+        # Fixed-point sums are integers well inside float64's exact range.
+        neighbor_sum = np.bincount(owners, weights=theta[flat], minlength=self._size).astype(mode.dtype)
+        spread = (neighbor_sum - counts * theta).astype(mode.dtype)
+        blended = theta + mode.mul(mode.const(coupling_eta), spread)
+        np.maximum(blended, 0, out=theta)
+        self.heat += (mode.const(coupling_heat_gain) * counts).astype(mode.dtype)
+
+    def step_thermal(self, fired: np.ndarray, dt: float, params: ThermalParamArrays) -> None:
+        """In-place `TowerThermalState.step` for every tower."""
+
+        if params.mode != self.mode:
+            raise ValueError(f"thermal params are {params.mode.name}, fleet is {self.mode.name}")
+        step_thermal_batch(self.thermal_heat, self.overheated, fired, params.decay(dt), params)
+
+
+def _flatten(groups: Iterable[Iterable[int]]) -> Iterable[int]:
+    for group in groups:
+        yield from group
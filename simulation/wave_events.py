@@ -0,0 +1,225 @@
+"""Batched Monte Carlo of WASMUTABLE wave events (`wasmutable_rules.gd`).
+
+The game runs one event state machine per level: each frame
+`sample_wave_event` may start an event once the wave is at least 20% spawned
+and no event is running, then `update_event` counts it down. This module
+runs that machine for N independent runs at once. Event state is two arrays
+(`kind`, `remaining`), draws are one vector per tick, and the event
+multipliers come from a table lookup, so they can be handed straight to
+`step_thermal_batch` as `heat_scale`.
+
+Like the GDScript, an event's multipliers still apply on the frame its
+`remaining` reaches zero; the next `update_event` clears them. Draws come
+from one NumPy generator for the whole batch, so individual runs follow the
+game's distribution rather than its exact `RandomNumberGenerator` stream.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from simulation.thermal_batch import ThermalParamArrays, step_thermal_batch
+from simulation.thermal_reference import ThermalParams, apply_wasmutable_shift
+
+
+EVENT_TRIGGER_PROBABILITY = 0.015
+EVENT_MIN_WAVE_PROGRESS = 0.2
+
+
+@dataclass(frozen=True)
+class WaveEvent:
+    name: str
+    duration_s: float
+    tower_heat_multiplier: float
+    tower_damage_multiplier: float
+    enemy_speed_multiplier: float
+    energy_tick_multiplier: float
+
+
+# Index 0 is "no event"; the rest are the `sample_wave_event` pool in order.
+WAVE_EVENTS: tuple[WaveEvent, ...] = (
+    WaveEvent("", 0.0, 1.0, 1.0, 1.0, 1.0),
+    WaveEvent("Cost Inversion", 8.0, 0.85, 0.9, 1.1, 1.25),
+    WaveEvent("Overheat Spike", 6.0, 1.35, 1.0, 1.0, 0.8),
+    WaveEvent("Spawn Drift", 10.0, 1.0, 0.8, 1.2, 1.1),
+)
+_DURATION = np.array([e.duration_s for e in WAVE_EVENTS])
+_MULTIPLIERS = {
+    name: np.array([getattr(e, name) for e in WAVE_EVENTS])
+    for name in ("tower_heat_multiplier", "tower_damage_multiplier", "enemy_speed_multiplier", "energy_tick_multiplier")
+}
+
+
+def tower_thermal_params(params: ThermalParams, heat_global_multiplier: float) -> ThermalParams:
+    """`build_tower_thermal_profile`: the map mutation's heat scaling.
+
+    It is the same transform as `apply_wasmutable_shift`; pass
+    `MapMutation.heat_global_multiplier` from `simulation.level_generator`.
+    """
+
+    return apply_wasmutable_shift(params, shift_factor=heat_global_multiplier)
+
+
+@dataclass
+class WaveEventBatch:
+    """Event state for N runs; `kind` indexes `WAVE_EVENTS`."""
+
+    kind: np.ndarray
+    remaining: np.ndarray
+
+    @classmethod
+    def idle(cls, runs: int) -> "WaveEventBatch":
+        return cls(kind=np.zeros(runs, dtype=np.int8), remaining=np.zeros(runs, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def multiplier(self, name: str) -> np.ndarray:
+        """Per-run `tower_heat_multiplier`, `tower_damage_multiplier`, ... for this tick."""
+
+        return np.take(_MULTIPLIERS[name], self.kind)
+
+
+def sample_wave_events(
+    state: WaveEventBatch,
+    wave_progress: float | np.ndarray,
+    trigger_draws: np.ndarray,
+    pick_draws: np.ndarray,
+) -> None:
+    """`sample_wave_event` for every run, in place.
+
+    `trigger_draws` are uniform in [0, 1) and `pick_draws` are integers in
+    [0, 3); both have one entry per run.
+    """
+
+    start = (state.remaining <= 0.0) & (np.asarray(wave_progress) >= EVENT_MIN_WAVE_PROGRESS)
+    start &= trigger_draws <= EVENT_TRIGGER_PROBABILITY
+    np.copyto(state.kind, pick_draws + 1, where=start, casting="unsafe")
+    np.copyto(state.remaining, _DURATION[state.kind], where=start)
+
+
+def update_wave_events(state: WaveEventBatch, dt: float) -> None:
+    """`update_event` for every run, in place."""
+
+    running = state.remaining > 0.0
+    np.multiply(state.kind, running, out=state.kind)
+    np.subtract(state.remaining, dt, out=state.remaining, where=running)
+    np.maximum(state.remaining, 0.0, out=state.remaining)
+
+
+def spawn_progress(
+    ticks: int,
+    dt: float,
+    creep_count: int,
+    spawn_batch: int = 3,
+    spawn_interval: float = 0.18,
+    first_spawn_s: float = 0.15,
+) -> np.ndarray:
+    """Per-tick wave progress (`spawned / creep_count`) from the spawn timer in `level_scene.gd`."""
+
+    progress = np.empty(ticks, dtype=np.float64)
+    timer, spawned = first_spawn_s, 0
+    for t in range(ticks):
+        progress[t] = spawned / max(1, creep_count)
+        timer -= dt
+        if timer <= 0.0 and spawned < creep_count:
+            spawned += min(spawn_batch, creep_count - spawned)
+            timer = spawn_interval
+    return progress
+
+
+@dataclass(frozen=True)
+class EventStudy:
+    """Per-run tick counts from `simulate_event_study`; columns follow `WAVE_EVENTS[1:]`."""
+
+    dt: float
+    ticks: int
+    events_started: np.ndarray
+    event_ticks: np.ndarray
+    overheat_ticks: np.ndarray
+    overlap_ticks: np.ndarray
+
+    def overlap_rates(self) -> dict[str, float]:
+        """Fraction of runs in which each event overlapped an overheated tower."""
+
+        rates = (self.overlap_ticks > 0).mean(axis=0)
+        return {event.name: float(rate) for event, rate in zip(WAVE_EVENTS[1:], rates)}
+
+    def mean_overlap_seconds(self) -> dict[str, float]:
+        means = self.overlap_ticks.mean(axis=0) * self.dt
+        return {event.name: float(mean) for event, mean in zip(WAVE_EVENTS[1:], means)}
+
+
+def simulate_event_study(
+    runs: int,
+    wave_progress: Sequence[float] | np.ndarray,
+    dt: float,
+    *,
+    towers_per_run: int = 1,
+    fire_probability: float = 0.6,
+    params: ThermalParams | None = None,
+    heat_global_multiplier: float = 1.0,
+    seed: int = 0,
+) -> EventStudy:
+    """Run the event machine and batched thermal towers for `runs` runs over one wave.
+
+    `wave_progress` gives the spawn progress for each tick (see
+    `spawn_progress`), so its length is the wave length in ticks. Each tower
+    fires with `fire_probability` per tick and its shot heat is scaled by
+    the run's active `tower_heat_multiplier`.
+
+    The event pick reuses the trigger draw: given a trigger, `draw / 0.015`
+    is uniform, which saves one random vector per tick.
+    """
+
+    progress = np.asarray(wave_progress, dtype=np.float64)
+    ticks = len(progress)
+    rng = np.random.default_rng(seed)
+    towers = runs * towers_per_run
+    thermal = ThermalParamArrays.from_params(
+        tower_thermal_params(params or ThermalParams(), heat_global_multiplier), towers
+    )
+    decay = thermal.decay(dt)
+    heat = np.zeros(towers, dtype=np.float64)
+    overheated = np.zeros(towers, dtype=bool)
+    events = WaveEventBatch.idle(runs)
+
+    kinds = len(WAVE_EVENTS) - 1
+    started = np.zeros((runs, kinds), dtype=np.int64)
+    event_ticks = np.zeros((runs, kinds), dtype=np.int64)
+    overheat_ticks = np.zeros(runs, dtype=np.int64)
+    overlap_ticks = np.zeros((runs, kinds), dtype=np.int64)
+    pick_scale = kinds / EVENT_TRIGGER_PROBABILITY
+
+    for t in range(ticks):
+        was_idle = events.remaining <= 0.0
+        draws = rng.random(runs)
+        picks = np.minimum(draws * pick_scale, kinds - 1).astype(np.int8)
+        sample_wave_events(events, progress[t], draws, picks)
+        new = was_idle & (events.remaining > 0.0)
+        update_wave_events(events, dt)
+
+        scale = events.multiplier("tower_heat_multiplier")
+        if towers_per_run > 1:
+            scale = np.repeat(scale, towers_per_run)
+        step_thermal_batch(heat, overheated, rng.random(towers) < fire_probability, decay, thermal, heat_scale=scale)
+
+        hot = overheated if towers_per_run == 1 else overheated.reshape(runs, towers_per_run).any(axis=1)
+        overheat_ticks += hot
+        for k in range(kinds):
+            is_kind = events.kind == k + 1
+            started[:, k] += new & is_kind
+            event_ticks[:, k] += is_kind
+            overlap_ticks[:, k] += is_kind & hot
+
+    return EventStudy(
+        dt=dt,
+        ticks=ticks,
+        events_started=started,
+        event_ticks=event_ticks,
+        overheat_ticks=overheat_ticks,
+        overlap_ticks=overlap_ticks,
+    )
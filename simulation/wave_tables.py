@@ -0,0 +1,160 @@
+"""Precomputed per-wave scaling tables behind a bounded LRU.
+
+The wave scaling rules depend only on the wave index and a frozen (hashable)
+config, so each config gets contiguous read-only arrays indexed directly by
+wave. Every entry is produced by the scalar rule itself, so a table lookup
+is bit-identical to calling the rule. Tables are cached with
+`functools.lru_cache`, bounded so sweeps over thousands of configs keep
+memory flat. The `*_at` lookups never grow a table past `MAX_TABLE_WAVES`;
+waves beyond it are evaluated with the scalar rule, once per distinct wave,
+so a stray huge wave index costs a few rule calls rather than a table build.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+
+from simulation.basic_mechanics import CoreRules, enemy_hp_for_wave, enemy_speed_for_wave, reward_for_kill
+from simulation.protein_tower import ProteinTowerConfig, adaptation_rate_for_wave, alpha_for_wave
+
+
+WAVE_TABLE_CACHE_SIZE = 256
+MIN_TABLE_WAVES = 64
+MAX_TABLE_WAVES = 4096
+
+
+def _readonly(values: list[float] | list[int], dtype: type) -> np.ndarray:
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+def _table_waves(max_wave: int) -> int:
+    """Round table length up to a power of two so nearby requests share an entry."""
+
+    size = MIN_TABLE_WAVES
+    while size < max_wave:
+        size *= 2
+    return size
+
+
+def _wave_indices(wave_index: int | np.ndarray) -> np.ndarray | int:
+    # Every rule clamps negative waves to its floor, which index 0 already stores.
+    if isinstance(wave_index, (int, np.integer)):
+        return max(0, int(wave_index))
+    return np.maximum(0, np.asarray(wave_index, dtype=np.int64))
+
+
+@dataclass(frozen=True)
+class CoreWaveTable:
+    """`CoreRules` scaling for waves 0..max_wave; index with the wave number."""
+
+    enemy_hp: np.ndarray
+    enemy_speed: np.ndarray
+    reward: np.ndarray
+
+    @property
+    def max_wave(self) -> int:
+        return len(self.enemy_hp) - 1
+
+
+@dataclass(frozen=True)
+class ProteinWaveTable:
+    """`ProteinTowerConfig` scaling for waves 0..max_wave."""
+
+    alpha: np.ndarray
+    adaptation_rate: np.ndarray
+
+    @property
+    def max_wave(self) -> int:
+        return len(self.alpha) - 1
+
+
+@lru_cache(maxsize=WAVE_TABLE_CACHE_SIZE)
+def _core_table(rules: CoreRules, waves: int) -> CoreWaveTable:
+    indices = range(waves + 1)
+    return CoreWaveTable(
+        enemy_hp=_readonly([enemy_hp_for_wave(w, rules) for w in indices], np.float64),
+        enemy_speed=_readonly([enemy_speed_for_wave(w, rules) for w in indices], np.float64),
+        reward=_readonly([reward_for_kill(w, rules) for w in indices], np.int64),
+    )
+
+
+@lru_cache(maxsize=WAVE_TABLE_CACHE_SIZE)
+def _protein_table(config: ProteinTowerConfig, waves: int) -> ProteinWaveTable:
+    indices = range(waves + 1)
+    return ProteinWaveTable(
+        alpha=_readonly([alpha_for_wave(w, config) for w in indices], np.float64),
+        adaptation_rate=_readonly([adaptation_rate_for_wave(w, config) for w in indices], np.float64),
+    )
+
+
+def core_wave_table(rules: CoreRules, max_wave: int = MIN_TABLE_WAVES) -> CoreWaveTable:
+    """Cached table covering at least waves 0..max_wave."""
+
+    return _core_table(rules, _table_waves(max_wave))
+
+
+def protein_wave_table(config: ProteinTowerConfig, max_wave: int = MIN_TABLE_WAVES) -> ProteinWaveTable:
+    """Cached table covering at least waves 0..max_wave."""
+
+    return _protein_table(config, _table_waves(max_wave))
+
+
+def _lookup(wave_index: int | np.ndarray) -> tuple[np.ndarray | int, int]:
+    indices = _wave_indices(wave_index)
+    highest = indices if isinstance(indices, int) else int(indices.max(initial=0))
+    return indices, min(highest, MAX_TABLE_WAVES)
+
+
+def _read(table: np.ndarray, indices: np.ndarray | int, rule: Callable, config: object) -> np.ndarray | float | int:
+    # Entries past the table come straight from the rule, cast to the table's dtype.
+    if isinstance(indices, int):
+        return table[indices] if indices < len(table) else table.dtype.type(rule(indices, config))
+    above = indices >= len(table)
+    if not above.any():
+        return table[indices]
+    values = np.array(table[np.minimum(indices, len(table) - 1)])
+    waves, inverse = np.unique(indices[above], return_inverse=True)
+    values[above] = np.array([rule(int(w), config) for w in waves], dtype=table.dtype)[inverse]
+    return values
+
+
+def enemy_hp_at(wave_index: int | np.ndarray, rules: CoreRules) -> np.ndarray | float:
+    indices, highest = _lookup(wave_index)
+    return _read(core_wave_table(rules, highest).enemy_hp, indices, enemy_hp_for_wave, rules)
+
+
+def enemy_speed_at(wave_index: int | np.ndarray, rules: CoreRules) -> np.ndarray | float:
+    indices, highest = _lookup(wave_index)
+    return _read(core_wave_table(rules, highest).enemy_speed, indices, enemy_speed_for_wave, rules)
+
+
+def reward_at(wave_index: int | np.ndarray, rules: CoreRules) -> np.ndarray | int:
+    indices, highest = _lookup(wave_index)
+    return _read(core_wave_table(rules, highest).reward, indices, reward_for_kill, rules)
+
+
+def alpha_at(wave_index: int | np.ndarray, config: ProteinTowerConfig) -> np.ndarray | float:
+    indices, highest = _lookup(wave_index)
+    return _read(protein_wave_table(config, highest).alpha, indices, alpha_for_wave, config)
+
+
+def adaptation_rate_at(wave_index: int | np.ndarray, config: ProteinTowerConfig) -> np.ndarray | float:
+    indices, highest = _lookup(wave_index)
+    return _read(protein_wave_table(config, highest).adaptation_rate, indices, adaptation_rate_for_wave, config)
+
+
+def clear_wave_tables() -> None:
+    _core_table.cache_clear()
+    _protein_table.cache_clear()
+
+
+def wave_table_cache_sizes() -> tuple[int, int]:
+    """Current number of cached (core, protein) tables."""
+
+    return _core_table.cache_info().currsize, _protein_table.cache_info().currsize